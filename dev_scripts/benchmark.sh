@@ -1,3 +1,6 @@
 # Benchmark the example with https://github.com/sharkdp/hyperfine
 
 hyperfine 'python examples/kitchen_sink.py --image'
+
+# Compare with rendering in a warm worker process
+hyperfine 'python -m neoscore.render examples/kitchen_sink.py --format png --out-dir /tmp --workers 1'
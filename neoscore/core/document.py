@@ -1,12 +1,20 @@
+from __future__ import annotations
+
 from collections.abc import Callable
-from typing import Optional
+from typing import TYPE_CHECKING, Iterable, Optional
 
+from neoscore.core import neoscore
 from neoscore.core.brush import Brush
 from neoscore.core.page_supplier import PageOverlayFunc, PageSupplier
 from neoscore.core.paper import Paper
 from neoscore.core.point import Point
+from neoscore.core.positioned_object import _rendering_region
+from neoscore.core.rect import Rect, RectDef
 from neoscore.core.units import ZERO, Mm
 
+if TYPE_CHECKING:
+    from neoscore.core.page import Page
+
 _PAGE_DISPLAY_GAP = Mm(50)
 
 
@@ -14,9 +22,10 @@ class Document:
 
     """The document root object.
 
-    This object should not be created directly by users - it is instantiated
-    by :obj:`.neoscore.setup`, which creates a global instance of this class which
-    can be then accessed as :obj:`.neoscore.document`.
+    :obj:`.neoscore.setup` creates the initial document, which can be accessed as
+    :obj:`.neoscore.document`. Further independent documents can be created directly
+    and made current with :obj:`.neoscore.set_document` or
+    :obj:`.neoscore.use_document`.
     """
 
     def __init__(self, paper: Paper, overlay_func: Optional[PageOverlayFunc] = None):
@@ -63,27 +72,85 @@ class Document:
         """
         return self._pages
 
-    def _run_on_all_descendants(self, func: Callable):
-        for page in self.pages:
+    def _run_on_all_descendants(self, func: Callable, pages: Iterable[Page]):
+        for page in pages:
             for obj in page.descendants:
                 func(obj)
 
-    def render(self, display_page_geometry: bool, background_brush: Brush):
+    def render(
+        self,
+        display_page_geometry: bool,
+        background_brush: Brush,
+        region: Optional[RectDef] = None,
+    ):
         """Render all items in the document.
 
+        Only objects changed since the previous render are re-rendered; everything
+        else is left in the scene as-is. Re-rendered graphics reuse the Qt objects of
+        equivalent graphics from the previous render where possible, only moving them
+        into place.
+
+        If a ``region`` is given, only objects appearing in it are drawn. Pages
+        outside the region are skipped entirely, unless they hold a flowable, in
+        which case only the flowable objects on lines in the region are drawn.
+        Skipped parts of objects stay pending, so later renders draw them.
+
         This should not be called directly.
 
         Args:
             display_page_geometry: Whether to include a preview of page geometry.
             background_brush: The brush used to draw the scene background.
+            region: The document-space area to limit rendering to, if any.
         """
-        self._run_on_all_descendants(lambda g: g.pre_render_hook())
+        if region is None:
+            pages = list(self.pages)
+        else:
+            region = Rect.from_def(region)
+            pages = [
+                page
+                for page in self.pages
+                if page.document_space_bounding_rect.intersects(region)
+                # Flowables can draw on every page
+                or any(
+                    page.descendants_with_attribute("_neoscore_flowable_type_marker")
+                )
+            ]
+        self._run_on_all_descendants(lambda g: g.pre_render_hook(), pages)
         if display_page_geometry:
-            for page in self.pages:
+            for page in pages:
                 page.create_geometry_preview(background_brush)
+        self._assign_stacking_ranks()
+        with _rendering_region(region):
+            for page in pages:
+                page._retire_dirty()
+            for page in pages:
+                page._render_dirty()
+        neoscore.app_interface.remove_retired_qt_objects()
+        self._run_on_all_descendants(lambda g: g.post_render_hook(), pages)
+
+    def _assign_stacking_ranks(self):
+        """Number every object in document order, for stacking their graphics.
+
+        Objects are numbered in the order a complete render draws them, so graphics
+        re-rendered on their own stack the same as in a complete render. Objects
+        whose number changed have their existing graphics moved to match.
+        """
+        rank = 0
         for page in self.pages:
-            page.render()
-        self._run_on_all_descendants(lambda g: g.post_render_hook())
+            stack = [page]
+            while stack:
+                obj = stack.pop()
+                rank += 1
+                if obj._stacking_rank != rank:
+                    obj._set_stacking_rank(rank)
+                stack.extend(reversed(obj.children))
+
+    def _has_pending_changes(self) -> bool:
+        """Whether any objects have changed since the last render."""
+        return any(
+            page._dirty or page._render_pending or page._dirty_descendants
+            for page in self.pages
+        )
 
     def page_origin(self, index: int) -> Point:
         """Find the origin point of a given page number.
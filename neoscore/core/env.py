@@ -6,6 +6,8 @@ truthy value will enable some debugging information like Qt bounding box outline
 """
 
 import os
+import pathlib
+from typing import Optional
 
 
 def _resolve_bool_env_variable(var):
@@ -25,3 +27,23 @@ DEBUG = _resolve_bool_env_variable("NEOSCORE_DEBUG")
 
 Set by the environment variable ``NEOSCORE_DEBUG``.
 """
+
+
+def _resolve_cache_dir_env_variable(var) -> Optional[pathlib.Path]:
+    value = os.environ.get(var)
+    if value is None:
+        base = os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home() / ".cache"
+        return pathlib.Path(base) / "neoscore"
+    if value == "" or value == "0" or value.lower() == "false":
+        return None
+    return pathlib.Path(value).expanduser()
+
+
+CACHE_DIR = _resolve_cache_dir_env_variable("NEOSCORE_CACHE_DIR")
+"""The directory persistent caches are kept in, or ``None`` to disable them.
+
+These caches hold data derived from resource files, like compiled font metadata,
+which is slow to work out from scratch but never changes for a given file. Set by the
+environment variable ``NEOSCORE_CACHE_DIR``, where an empty or falsy value disables
+the caches. Defaults to ``~/.cache/neoscore``.
+"""
@@ -0,0 +1,84 @@
+import os
+import pathlib
+import tempfile
+import threading
+from typing import Optional, Union
+
+
+class ExportCache:
+
+    """An on-disk least-recently-used cache of exported files.
+
+    Entries are keyed by a hash of everything affecting an export's output, so an
+    unchanged part of a document can be exported again by copying its cached
+    output instead of rasterizing it. Keys must be valid file names.
+
+    Use times are tracked with file modification times, so the cache directory
+    can be shared across runs and processes. When the total size of the cached
+    files exceeds ``max_size``, the least recently used entries are deleted.
+    """
+
+    def __init__(self, directory: Union[str, pathlib.Path], max_size: int):
+        """
+        Args:
+            directory: The directory to keep cached files in. It is created if
+                needed.
+            max_size: The maximum total size of the cached files in bytes.
+        """
+        self.directory = pathlib.Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get a cached file's contents, or ``None`` if it is not cached."""
+        path = self.directory / key
+        try:
+            data = path.read_bytes()
+            # Mark as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return data
+
+    def __contains__(self, key: str) -> bool:
+        return (self.directory / key).is_file()
+
+    def put(self, key: str, data: bytes):
+        """Cache a file's contents, evicting old entries if needed."""
+        with self._lock:
+            # Write to a temporary file first so readers never see partial files
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(temp_path, self.directory / key)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+            self._evict()
+
+    def clear(self):
+        """Delete all cached files."""
+        with self._lock:
+            for path in self.directory.iterdir():
+                if path.is_file():
+                    path.unlink()
+
+    def _evict(self):
+        entries = []
+        total_size = 0
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.startswith(".tmp"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self.max_size:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-from typing import Optional
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Dict, List, Optional, Tuple
 
 from sortedcontainers import SortedKeyList
 
-from neoscore.core import neoscore
 from neoscore.core.layout_controllers import MarginController, NewLine
 from neoscore.core.point import Point, PointDef
 from neoscore.core.positioned_object import PositionedObject
+from neoscore.core.rect import Rect
 from neoscore.core.units import ZERO, Mm, Unit
 
 
@@ -56,6 +58,7 @@ class Flowable(PositionedObject):
         self._y_padding = y_padding
         self._break_threshold = break_threshold
         self._lines = []
+        self._line_ends_cache: Optional[Tuple[List[NewLine], List[float]]] = None
         self._provided_controllers = Flowable._new_provided_controllers_list()
 
     @property
@@ -155,8 +158,9 @@ class Flowable(PositionedObject):
         The generated controllers are stored in ``self.layout_controllers``
         in sorted order by ascending x position
         """
-        live_page_width = neoscore.document.paper.live_width
-        live_page_height = neoscore.document.paper.live_height
+        document = self.first_ancestor_with_attr("_neoscore_page_type_marker").document
+        live_page_width = document.paper.live_width
+        live_page_height = document.paper.live_height
         break_opps = self._find_break_opportunities()
         for c in self.lines:
             c.remove()
@@ -181,7 +185,7 @@ class Flowable(PositionedObject):
                     new_line_y > live_page_height
                     or new_line_bottom_y > live_page_height
                 ):
-                    page = neoscore.document.pages[page.index + 1]
+                    page = document.pages[page.index + 1]
                     new_line_y = ZERO
             # Now determine this line's length
             max_length = live_page_width - new_line_x
@@ -258,26 +262,60 @@ class Flowable(PositionedObject):
         """
         # Note that this assumes that all layout controllers are line
         # breaks, and will not work if/when other types are added
-        remaining_x = flowable_x
-        for i, controller in enumerate(self.lines):
-            remaining_x -= controller.length
-            if remaining_x <= ZERO:
-                return i
-        else:
-            return len(self.lines) - 1
+        index = bisect_left(self._line_end_positions(), flowable_x.base_value)
+        return min(index, len(self.lines) - 1)
+
+    def _line_end_positions(self) -> List[float]:
+        """The flowable x base values where each line ends.
+
+        This is cached until the lines are regenerated.
+        """
+        lines = self._lines
+        cache = self._line_ends_cache
+        if cache is None or cache[0] is not lines or len(cache[1]) != len(lines):
+            ends = list(accumulate(line.length.base_value for line in lines))
+            cache = self._line_ends_cache = (lines, ends)
+        return cache[1]
+
+    def _line_bounds(self, line: NewLine) -> Rect:
+        """The approximate document-space area drawn in by objects in a line.
+
+        This is the line's area, padded above and below by the line height and the
+        gap between lines, leaving room for things drawn past the line's edges like
+        ledger lines and dynamics.
+        """
+        line_pos = line.canvas_pos()
+        padding = line.height + self.y_padding
+        return Rect(
+            line_pos.x,
+            line_pos.y - padding,
+            line.length,
+            line.height + (padding * 2),
+        )
 
     def render(self):
         super().render()
 
     def pre_render_hook(self):
         super().pre_render_hook()
+        previous_layout = self._layout_signature()
         self._generate_lines()
+        if self._layout_signature() != previous_layout:
+            # Everything in the flowable may have moved to different lines
+            self._mark_dirty()
 
     def post_render_hook(self):
         # Clear all auto-generated margin controllers
         super().post_render_hook()
         self._provided_controllers = Flowable._new_provided_controllers_list()
 
+    def _layout_signature(self) -> List[Tuple[int, Point, Unit, Unit]]:
+        """A comparable summary of the generated line layout."""
+        return [
+            (line.page.index, line.pos, line.flowable_x, line.length)
+            for line in self.lines
+        ]
+
     @staticmethod
     def _new_provided_controllers_list() -> SortedKeyList[MarginController]:
         return SortedKeyList(key=lambda c: c.flowable_x)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Optional, Union
+from typing import Any, Dict, Hashable, Optional, Tuple, Union
 
 from neoscore.core.rect import Rect
 from neoscore.core.units import Unit
@@ -8,13 +8,50 @@ from neoscore.interface.font_interface import FontInterface
 
 _BOUNDING_RECT_CACHE: Dict[Tuple[Font, str], Rect] = {}
 
+_FONT_REGISTRY: Dict[Tuple[type, Hashable], Font] = {}
+"""Every interned font, keyed by class and the arguments it was created with."""
 
-class Font:
+
+def _clear_font_registry():
+    """Forget all interned fonts.
+
+    This must be called whenever the application is torn down or fonts are
+    registered, since fonts hold Qt objects tied to the application and the fonts
+    available when they were created.
+    """
+    _FONT_REGISTRY.clear()
+
+
+class _InterningFontMeta(type):
+
+    """A metaclass which gives existing fonts when equivalent ones are requested.
+
+    Classes opt in by defining a static ``_intern_key`` method, which takes the same
+    arguments as the class's ``__init__`` and returns a hashable key. Creating an
+    object with arguments giving the same key as an existing one returns the
+    existing object.
+    """
+
+    def __call__(cls, *args, **kwargs):
+        if "_intern_key" not in vars(cls):
+            return super().__call__(*args, **kwargs)
+        key = (cls, cls._intern_key(*args, **kwargs))
+        font = _FONT_REGISTRY.get(key)
+        if font is None:
+            font = super().__call__(*args, **kwargs)
+            _FONT_REGISTRY[key] = font
+        return font
+
+
+class Font(metaclass=_InterningFontMeta):
 
     """A text font.
 
     All fonts are immutable. To get a modified version of a font, use
     :obj:`.Font.modified`
+
+    Fonts are interned, so creating a font equivalent to an existing one gives the
+    existing font, along with its underlying Qt objects.
     """
 
     def __init__(
@@ -41,6 +78,18 @@ class Font:
             self.family_name, self.size, self.weight, self.italic
         )
 
+    @staticmethod
+    def _intern_key(
+        family_name: str,
+        size: Union[Unit, float],
+        weight: Optional[int] = None,
+        italic: bool = False,
+    ) -> Hashable:
+        size_key: Any = (
+            (type(size), size.base_value) if isinstance(size, Unit) else (Unit, size)
+        )
+        return family_name, size_key, weight, italic
+
     @property
     def family_name(self) -> str:
         return self._family_name
@@ -89,6 +138,8 @@ class Font:
         return f"Font('{self.family_name}', {self.size}, {self.weight}, {self.italic})"
 
     def __eq__(self, other):
+        if self is other:
+            return True
         return (
             isinstance(other, Font)
             and self.family_name == other.family_name
@@ -0,0 +1,213 @@
+"""Columnar tables of SMuFL glyph metrics."""
+
+from __future__ import annotations
+
+import array
+import json
+import math
+import struct
+from collections.abc import Mapping
+from typing import Any, Dict, List, Optional, Tuple
+
+from neoscore.core import env
+from neoscore.core.metadata_index import (
+    MetadataIndex,
+    _map_index_file,
+    _write_index_file,
+)
+
+try:
+    import numpy  # type: ignore
+except ImportError:
+    numpy = None
+
+_MAGIC = b"NSGLYPH1"
+_HEADER_LENGTH = struct.Struct("<I")
+
+_TABLES: Dict[str, Tuple[Mapping, GlyphTable]] = {}
+"""Glyph tables by font family, along with the metadata they were built from."""
+
+
+class GlyphTable:
+
+    """SMuFL glyph metrics of a music font family, stored in columns.
+
+    Every glyph with a bounding box, advance width, or anchors in the font's metadata
+    is given an integer id, which indexes each metric column. Columns are NumPy
+    ``float64`` arrays if NumPy is installed, and ``array.array("d")`` arrays
+    otherwise, so layout code can look up metrics for many glyphs at once without
+    creating Python objects for each one.
+
+    All metrics are given in staff spaces in SMuFL's coordinate system, where y
+    increases upward. Missing values are NaN. To get neoscore units, multiply by a
+    :obj:`.MusicFont.unit`.
+
+    One table is shared by all fonts of a family; get it with :obj:`.for_family`
+    or :obj:`.MusicFont.glyph_table`.
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        columns: Dict[str, Any],
+        anchor_names: List[str],
+    ):
+        """
+        Args:
+            names: Glyph names in glyph id order.
+            columns: Metric columns by name. This must include ``bbox_sw_x``,
+                ``bbox_sw_y``, ``bbox_ne_x``, ``bbox_ne_y``, and ``advance_width``,
+                along with ``{anchor}_x`` and ``{anchor}_y`` for every anchor.
+            anchor_names: The names of every anchor in the table.
+        """
+        self.names = names
+        self._ids = {name: glyph_id for glyph_id, name in enumerate(names)}
+        self.columns = columns
+        self.anchor_names = anchor_names
+        self.bbox_sw_x = columns["bbox_sw_x"]
+        self.bbox_sw_y = columns["bbox_sw_y"]
+        self.bbox_ne_x = columns["bbox_ne_x"]
+        self.bbox_ne_y = columns["bbox_ne_y"]
+        self.advance_width = columns["advance_width"]
+
+    @classmethod
+    def for_family(cls, family_name: str, metadata: Mapping) -> GlyphTable:
+        """Get the shared table for a font family, building it if needed.
+
+        Args:
+            family_name: The font family name.
+            metadata: The family's SMuFL metadata.
+        """
+        entry = _TABLES.get(family_name)
+        if entry is not None and entry[0] is metadata:
+            return entry[1]
+        table = cls._load(metadata)
+        _TABLES[family_name] = (metadata, table)
+        return table
+
+    @classmethod
+    def from_metadata(cls, metadata: Mapping) -> GlyphTable:
+        """Build a table from SMuFL font metadata."""
+        bboxes = _as_dict(metadata.get("glyphBBoxes", {}))
+        advance_widths = _as_dict(metadata.get("glyphAdvanceWidths", {}))
+        anchors = _as_dict(metadata.get("glyphsWithAnchors", {}))
+        names = sorted(set(bboxes) | set(advance_widths) | set(anchors))
+        anchor_names = sorted({name for a in anchors.values() for name in a})
+        nan = math.nan
+        columns = {
+            "bbox_sw_x": [],
+            "bbox_sw_y": [],
+            "bbox_ne_x": [],
+            "bbox_ne_y": [],
+            "advance_width": [advance_widths.get(name, nan) for name in names],
+        }
+        for name in names:
+            bbox = bboxes.get(name)
+            sw = bbox["bBoxSW"] if bbox else (nan, nan)
+            ne = bbox["bBoxNE"] if bbox else (nan, nan)
+            columns["bbox_sw_x"].append(sw[0])
+            columns["bbox_sw_y"].append(sw[1])
+            columns["bbox_ne_x"].append(ne[0])
+            columns["bbox_ne_y"].append(ne[1])
+        ids = {name: glyph_id for glyph_id, name in enumerate(names)}
+        for anchor_name in anchor_names:
+            columns[f"{anchor_name}_x"] = [nan] * len(names)
+            columns[f"{anchor_name}_y"] = [nan] * len(names)
+        for name, glyph_anchors in anchors.items():
+            glyph_id = ids[name]
+            for anchor_name, (x, y) in glyph_anchors.items():
+                columns[f"{anchor_name}_x"][glyph_id] = x
+                columns[f"{anchor_name}_y"][glyph_id] = y
+        return cls(
+            names,
+            {key: _make_column(values) for key, values in columns.items()},
+            anchor_names,
+        )
+
+    @classmethod
+    def _load(cls, metadata: Mapping) -> GlyphTable:
+        """Load a table from :obj:`.env.CACHE_DIR`, or build and cache it."""
+        digest = getattr(metadata, "source_digest", None)
+        if env.CACHE_DIR is None or digest is None:
+            return cls.from_metadata(metadata)
+        path = env.CACHE_DIR / "glyph_tables" / f"{digest}.tbl"
+        buffer = _map_index_file(path, _MAGIC)
+        if buffer is not None:
+            try:
+                return cls.from_bytes(buffer)
+            finally:
+                buffer.close()
+        table = cls.from_metadata(metadata)
+        _write_index_file(path, table.to_bytes())
+        return table
+
+    def to_bytes(self) -> bytes:
+        """Serialize the table, to be restored with :obj:`.from_bytes`."""
+        header = json.dumps(
+            {
+                "names": self.names,
+                "columns": list(self.columns),
+                "anchor_names": self.anchor_names,
+            }
+        ).encode("utf-8")
+        parts = [_MAGIC, _HEADER_LENGTH.pack(len(header)), header]
+        for column in self.columns.values():
+            parts.append(array.array("d", column).tobytes())
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data) -> GlyphTable:
+        """Restore a table serialized with :obj:`.to_bytes`."""
+        offset = len(_MAGIC)
+        (header_length,) = _HEADER_LENGTH.unpack_from(data, offset)
+        offset += _HEADER_LENGTH.size
+        header = json.loads(data[offset : offset + header_length])
+        offset += header_length
+        column_size = len(header["names"]) * 8
+        columns = {}
+        for key in header["columns"]:
+            values = array.array("d")
+            values.frombytes(data[offset : offset + column_size])
+            columns[key] = _make_column(values)
+            offset += column_size
+        return cls(header["names"], columns, header["anchor_names"])
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def glyph_id(self, glyph_name: str) -> Optional[int]:
+        """Get a glyph's id, or ``None`` if the table has no metrics for it."""
+        return self._ids.get(glyph_name)
+
+    def bbox(self, glyph_id: int) -> Optional[Tuple[float, float, float, float]]:
+        """Get a glyph's ``(sw_x, sw_y, ne_x, ne_y)`` bounding box, if it has one."""
+        sw_x = self.bbox_sw_x[glyph_id]
+        if math.isnan(sw_x):
+            return None
+        return (
+            float(sw_x),
+            float(self.bbox_sw_y[glyph_id]),
+            float(self.bbox_ne_x[glyph_id]),
+            float(self.bbox_ne_y[glyph_id]),
+        )
+
+    def anchors(self, glyph_id: int) -> Optional[Dict[str, Tuple[float, float]]]:
+        """Get a glyph's anchor points by name, if it has any."""
+        result = {}
+        for name in self.anchor_names:
+            x = self.columns[name + "_x"][glyph_id]
+            if not math.isnan(x):
+                result[name] = (float(x), float(self.columns[name + "_y"][glyph_id]))
+        return result or None
+
+
+def _as_dict(mapping: Mapping) -> dict:
+    if isinstance(mapping, MetadataIndex):
+        return mapping.to_dict()
+    return mapping
+
+
+def _make_column(values):
+    if numpy is not None:
+        return numpy.array(values, dtype=numpy.float64)
+    return array.array("d", values)
@@ -54,6 +54,7 @@ class Image(PositionedObject):
         if isinstance(value, str):
             value = pathlib.Path(value)
         self._file_path = value
+        self._mark_dirty()
 
     @property
     def opacity(self) -> float:
@@ -63,6 +64,7 @@ class Image(PositionedObject):
     @opacity.setter
     def opacity(self, value: float):
         self._opacity = value
+        self._mark_dirty()
 
     @property
     def breakable_length(self) -> Unit:
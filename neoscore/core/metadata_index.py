@@ -0,0 +1,238 @@
+"""Compiled, lazily read indexes of JSON metadata files.
+
+Parsing large JSON files like SMuFL font metadata takes a significant part of
+neoscore's startup time, even though most programs only look up a few dozen glyphs.
+This compiles JSON objects into a binary index of sorted keys and separately encoded
+values, which is memory-mapped and searched on demand, so only the entries actually
+used are ever decoded.
+
+Compiled indexes are kept in :obj:`.env.CACHE_DIR`, named after a hash of their
+source file, so they are built once and automatically rebuilt when the source
+changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import pathlib
+import struct
+import tempfile
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional, Union
+
+from neoscore.core import env
+
+_MAGIC = b"NSMETA1\0"
+
+# Records are (key offset, key length, value offset, value length, value kind)
+_RECORD = struct.Struct("<IIIIB")
+_COUNT = struct.Struct("<I")
+
+# Value kinds
+_JSON_VALUE = 0
+_TABLE_VALUE = 1
+
+
+class MetadataIndex(Mapping):
+
+    """A read-only mapping view of a JSON object in a compiled index.
+
+    Values are decoded from the index whenever they are looked up, so every lookup
+    returns a fresh object which callers are free to modify. Nested objects which
+    were compiled into their own tables are given as further ``MetadataIndex``
+    views.
+    """
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap], offset: int = len(_MAGIC)):
+        """
+        Args:
+            buffer: A compiled index, as given by :obj:`.compile_index`.
+            offset: The position of the table to view in ``buffer``.
+        """
+        self._buffer = buffer
+        self._offset = offset + _COUNT.size
+        (self._count,) = _COUNT.unpack_from(buffer, offset)
+        self._tables: Dict[str, MetadataIndex] = {}
+        self.source_digest: Optional[str] = None
+        """A hash identifying the source file, if this was loaded from one."""
+
+    def _record(self, index: int):
+        return _RECORD.unpack_from(self._buffer, self._offset + index * _RECORD.size)
+
+    def _key(self, index: int) -> bytes:
+        key_offset, key_length, _, _, _ = self._record(index)
+        return self._buffer[key_offset : key_offset + key_length]
+
+    def _find(self, key: bytes) -> Optional[int]:
+        low = 0
+        high = self._count
+        while low < high:
+            mid = (low + high) // 2
+            if self._key(mid) < key:
+                low = mid + 1
+            else:
+                high = mid
+        if low < self._count and self._key(low) == key:
+            return low
+        return None
+
+    def __getitem__(self, key: str) -> Any:
+        table = self._tables.get(key)
+        if table is not None:
+            return table
+        index = self._find(key.encode("utf-8")) if isinstance(key, str) else None
+        if index is None:
+            raise KeyError(key)
+        _, _, value_offset, value_length, kind = self._record(index)
+        if kind == _TABLE_VALUE:
+            table = MetadataIndex(self._buffer, value_offset)
+            self._tables[key] = table
+            return table
+        return json.loads(self._buffer[value_offset : value_offset + value_length])
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._find(key.encode("utf-8")) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self._count):
+            yield self._key(index).decode("utf-8")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def to_dict(self) -> dict:
+        """Decode the whole object, including nested tables, into plain dicts."""
+        # Decoding every value in one go is much faster than one at a time
+        parts = []
+        tables = {}
+        for index in range(self._count):
+            key_offset, key_length, value_offset, value_length, kind = self._record(
+                index
+            )
+            key = self._buffer[key_offset : key_offset + key_length]
+            if kind == _TABLE_VALUE:
+                tables[key.decode("utf-8")] = MetadataIndex(self._buffer, value_offset)
+                continue
+            parts.append(json.dumps(key.decode("utf-8")).encode("utf-8") + b":")
+            parts.append(self._buffer[value_offset : value_offset + value_length])
+            parts.append(b",")
+        result = json.loads(b"{" + b"".join(parts[:-1]) + b"}")
+        for key, table in tables.items():
+            result[key] = table.to_dict()
+        return result
+
+    def __deepcopy__(self, memo) -> dict:
+        return self.to_dict()
+
+
+def compile_index(obj: dict, depth: int = 0) -> bytes:
+    """Compile a JSON object into an index readable by :obj:`.MetadataIndex`.
+
+    Args:
+        obj: The object to compile.
+        depth: How many levels of nested objects to compile into their own tables.
+            Deeper values are stored as JSON and decoded whole when looked up.
+    """
+    out = bytearray(_MAGIC)
+    _compile_table(obj, depth, out)
+    return bytes(out)
+
+
+def _compile_table(obj: dict, depth: int, out: bytearray) -> int:
+    table_offset = len(out)
+    # Keys are sorted by their encoded bytes, so lookups can bisect them directly
+    entries = sorted((key.encode("utf-8"), value) for key, value in obj.items())
+    out += _COUNT.pack(len(entries))
+    records_offset = len(out)
+    out += bytes(_RECORD.size * len(entries))
+    for index, (key, value) in enumerate(entries):
+        key_offset = len(out)
+        out += key
+        if depth > 0 and isinstance(value, dict):
+            value_offset = _compile_table(value, depth - 1, out)
+            value_length = 0
+            kind = _TABLE_VALUE
+        else:
+            encoded = json.dumps(value, separators=(",", ":")).encode("utf-8")
+            value_offset = len(out)
+            value_length = len(encoded)
+            kind = _JSON_VALUE
+            out += encoded
+        _RECORD.pack_into(
+            out,
+            records_offset + index * _RECORD.size,
+            key_offset,
+            len(key),
+            value_offset,
+            value_length,
+            kind,
+        )
+    return table_offset
+
+
+def load_json_index(
+    path: Union[str, pathlib.Path], depth: int = 0
+) -> MetadataIndex:
+    """Load a JSON object file as a compiled index.
+
+    The compiled index is read from :obj:`.env.CACHE_DIR` if it was built before,
+    and otherwise built and saved there. If the cache is disabled or can't be
+    written, the index is built in memory.
+
+    Args:
+        path: The JSON file, which must contain an object.
+        depth: How many levels of nested objects to index. See
+            :obj:`.compile_index`.
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist.
+        json.JSONDecodeError: If the file isn't valid JSON.
+    """
+    source = pathlib.Path(path).read_bytes()
+    cache_dir = env.CACHE_DIR
+    if cache_dir is None:
+        return MetadataIndex(compile_index(json.loads(source), depth))
+    digest = hashlib.sha256(source)
+    digest.update(_MAGIC + bytes([depth]))
+    source_digest = digest.hexdigest()
+    index_path = cache_dir / "metadata" / f"{source_digest}.idx"
+    buffer = _map_index_file(index_path, _MAGIC)
+    if buffer is None:
+        buffer = compile_index(json.loads(source), depth)
+        _write_index_file(index_path, buffer)
+    index = MetadataIndex(buffer)
+    index.source_digest = source_digest
+    return index
+
+
+def _map_index_file(path: pathlib.Path, magic: bytes) -> Optional[mmap.mmap]:
+    try:
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        # Missing or empty
+        return None
+    if buffer[: len(magic)] != magic:
+        buffer.close()
+        return None
+    return buffer
+
+
+def _write_index_file(path: pathlib.Path, data: bytes):
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so readers never see partial files
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except OSError:
+        # The cache is only an optimization
+        pass
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import copy
-from typing import Dict, Optional, Type, Union
+import math
+from types import MappingProxyType
+from typing import Any, Dict, Hashable, Mapping, Optional, Type, Union
 
 from neoscore.core import neoscore, smufl
 from neoscore.core.exceptions import (
@@ -10,6 +12,7 @@ from neoscore.core.exceptions import (
 )
 from neoscore.core.font import Font
 from neoscore.core.glyph_info import GlyphInfo
+from neoscore.core.glyph_table import GlyphTable
 from neoscore.core.point import Point
 from neoscore.core.rect import Rect
 from neoscore.core.units import Mm, Unit, convert_all_to_unit, make_unit_class
@@ -34,15 +37,25 @@ class MusicFont(Font):
             self.metadata = neoscore.registered_music_fonts[family_name]
         except KeyError:
             raise MusicFontMetadataNotFoundError
-        self._engraving_defaults = copy.deepcopy(self.metadata["engravingDefaults"])
+        engraving_defaults = copy.deepcopy(self.metadata["engravingDefaults"])
         # 1 SMuFL em is the height of a 5-line staff. See:
         # w3c.github.io/smufl/latest/specification/scoring-metrics-glyph-registration.html
         self._em_size = self.unit(4)
         self._glyph_info_cache = {}
+        self._glyph_table: Optional[GlyphTable] = None
         # engraving_defaults is small, so eagerly converting it to self.unit is ok
-        convert_all_to_unit(self._engraving_defaults, self.unit)
+        convert_all_to_unit(engraving_defaults, self.unit)
+        # Fonts are shared, so they must not be modifiable
+        self._engraving_defaults = MappingProxyType(engraving_defaults)
         super().__init__(family_name, self._em_size, 1, False)
 
+    @staticmethod
+    def _intern_key(family_name: str, size: Union[Unit, Type[Unit]]) -> Hashable:
+        if isinstance(size, Unit):
+            # Unit classes are reused, so this is the class `__init__` will use
+            size = make_unit_class("StaffUnit", size.base_value)
+        return family_name, size
+
     def __str__(self):
         unit_val_as_mm = Mm(self.unit(1)).display_value
         return f"MusicFont('{self.family_name}', <unit(1) = Mm({unit_val_as_mm})>)"
@@ -53,7 +66,20 @@ class MusicFont(Font):
         return self._unit
 
     @property
-    def engraving_defaults(self) -> Dict:
+    def glyph_table(self) -> GlyphTable:
+        """Columnar metrics for every glyph in this font's family.
+
+        The table is shared by all fonts of the family and gives metrics in staff
+        spaces, which can be scaled by :obj:`.unit`. This is useful for looking up
+        metrics of many glyphs at once; for single glyphs, :obj:`.glyph_info` is
+        usually more convenient.
+        """
+        if self._glyph_table is None:
+            self._glyph_table = GlyphTable.for_family(self.family_name, self.metadata)
+        return self._glyph_table
+
+    @property
+    def engraving_defaults(self) -> Mapping[str, Any]:
         """The SMuFL engraving defaults for this font.
 
         See `SMuFL's description of this data here
@@ -114,16 +140,18 @@ class MusicFont(Font):
         # if we have made it this far and populated
         # info with all other valid details
         advance_width = self.unit(0)
-        glyphAdvanceWidths = self.metadata.get("glyphAdvanceWidths")
-        if glyphAdvanceWidths:
-            raw_advance_width = glyphAdvanceWidths.get(glyph_name)
-            if raw_advance_width:
-                advance_width = self.unit(raw_advance_width)
-
-        bounding_rect = copy.deepcopy(self.metadata["glyphBBoxes"].get(glyph_name))
-        if bounding_rect:
-            convert_all_to_unit(bounding_rect, self.unit)
-            bounding_rect = self._convert_bbox_to_rect(bounding_rect)
+        bounding_rect = None
+        glyph_id = self.glyph_table.glyph_id(glyph_name)
+        if glyph_id is not None:
+            raw_advance_width = self.glyph_table.advance_width[glyph_id]
+            if raw_advance_width and not math.isnan(raw_advance_width):
+                advance_width = self.unit(float(raw_advance_width))
+            bbox = self.glyph_table.bbox(glyph_id)
+            if bbox:
+                sw_x, sw_y, ne_x, ne_y = (self.unit(value) for value in bbox)
+                bounding_rect = self._convert_bbox_to_rect(
+                    {"bBoxSW": (sw_x, sw_y), "bBoxNE": (ne_x, ne_y)}
+                )
 
         # get optional anchor metadata if available
         anchors = self._load_glyph_anchors(glyph_name)
@@ -209,12 +237,14 @@ class MusicFont(Font):
 
     def _load_glyph_anchors(self, glyph_name: str) -> Optional[Dict[str, Point]]:
         """Load any glyph anchors and convert coordinates to neoscore points."""
-        anchors = self.metadata["glyphsWithAnchors"].get(glyph_name)
+        glyph_id = self.glyph_table.glyph_id(glyph_name)
+        if glyph_id is None:
+            return None
+        anchors = self.glyph_table.anchors(glyph_id)
         if anchors is None:
             return None
-        anchors = copy.deepcopy(anchors)
-        for key, value in anchors.items():
-            # SMuFL coords have opposite Y axis as neoscore, so flip
-            # when wrapping in Point and Unit.
-            anchors[key] = Point(self.unit(value[0]), self.unit(-value[1]))
-        return anchors
+        # SMuFL coords have opposite Y axis as neoscore, so flip
+        # when wrapping in Point and Unit.
+        return {
+            key: Point(self.unit(x), self.unit(-y)) for key, (x, y) in anchors.items()
+        }
@@ -10,7 +10,10 @@ from neoscore.core.music_char import MusicChar, MusicCharDef
 from neoscore.core.music_font import MusicFont
 from neoscore.core.pen import PenDef
 from neoscore.core.point import ORIGIN, PointDef
-from neoscore.core.positioned_object import PositionedObject, render_cached_property
+from neoscore.core.positioned_object import (
+    PositionedObject,
+    persistent_cached_property,
+)
 from neoscore.core.rect import Rect
 from neoscore.core.text import Text
 from neoscore.core.text_alignment import AlignmentX, AlignmentY
@@ -123,6 +126,7 @@ class MusicText(Text, HasMusicFont):
     def music_chars(self, value: List[MusicChar]):
         self._music_chars = value
         self._text = MusicText._music_chars_to_str(value)
+        self._mark_dirty()
 
     @property
     def text(self) -> str:
@@ -137,6 +141,7 @@ class MusicText(Text, HasMusicFont):
         self._music_chars = MusicText._resolve_music_chars(self.music_font, value)
         resolved_str = MusicText._music_chars_to_str(self._music_chars)
         self._text = resolved_str
+        self._mark_dirty()
 
     @property
     def music_font(self) -> MusicFont:
@@ -149,13 +154,14 @@ class MusicText(Text, HasMusicFont):
     @music_font.setter
     def music_font(self, value: MusicFont):
         self._font = value
+        self._mark_dirty()
 
     @property
     def unit(self) -> Type[Unit]:
         """A unit type where ``unit(1)`` is a standard staff space in the font."""
         return self.music_font.unit
 
-    @render_cached_property
+    @persistent_cached_property
     def _raw_scaled_bounding_rect(self) -> Rect:
         key = _CachedTextGeometryKey(self.text, self.music_font, self.scale)
         cached_result = _GEOMETRY_CACHE.get(key)
@@ -3,29 +3,44 @@ from __future__ import annotations
 import json
 import os
 import pathlib
+from contextlib import contextmanager
 from dataclasses import dataclass
 from time import time
-from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 from warnings import warn
 
-import img2pdf  # type: ignore
 from typing_extensions import TypeAlias
 
 from neoscore.core.brush import Brush, BrushDef
 from neoscore.core.color import Color, ColorDef
 from neoscore.core.exceptions import InvalidImageFormatError
+from neoscore.core.export_cache import ExportCache
 from neoscore.core.key_event import KeyEvent
+from neoscore.core.metadata_index import MetadataIndex, load_json_index
 from neoscore.core.mouse_event import MouseEvent
 from neoscore.core.paper import A4, Paper
 from neoscore.core.pen import Pen
 from neoscore.core.point import Point, PointDef
 from neoscore.core.propagating_thread import PropagatingThread
-from neoscore.core.rect import RectDef
+from neoscore.core.rect import Rect, RectDef
 from neoscore.core.units import Unit
 from neoscore.interface.app_interface import AppInterface
 from neoscore.core.brush_pattern import BrushPattern
 
 if TYPE_CHECKING:
+    import numpy  # type: ignore
+
     from neoscore.core.document import Document
     from neoscore.core.font import Font
 
@@ -38,7 +53,7 @@ default_font: Font
 document: Document
 """The root document object."""
 
-registered_music_fonts: Dict[str, dict] = {}
+registered_music_fonts: Dict[str, MetadataIndex] = {}
 """A map from registered music font names to SMuFL metadata"""
 
 registered_font_family_names: Set[str] = set()
@@ -46,6 +61,7 @@ registered_font_family_names: Set[str] = set()
 
 # TODO this controls the background color of the scene
 background_brush = Brush("#B19CD9",BrushPattern.LINEAR_GRADIENT)
+_default_background_brush = background_brush
 """The brush used to draw the scene background.
 
 Defaults to solid white. Set this using :obj:`.set_background_brush`.
@@ -65,10 +81,40 @@ refresh functions.
 """
 
 _must_clear_scene_before_next_render: bool = False
-"""Whether the scene must be cleared before rendering.
+"""Whether every object must be rebuilt before rendering.
+
+This only applies when :obj:`.incremental_rendering` is disabled. When refresh
+functions indicate no re-render is required, that indication takes precedence over
+this flag.
+"""
+
+incremental_rendering: bool = True
+"""Whether renders only rebuild objects which changed since the previous render.
 
-When refresh functions indicate no re-render is required, that indication takes
-precedence over this flag.
+Objects track changes made through their properties, along with objects being added,
+moved, and removed. Changes neoscore can't see, such as mutating a :obj:`.Pen` or
+:obj:`.Brush` already assigned to an object, are not picked up. Set this to ``False``
+to rebuild every object on every render instead.
+"""
+
+_render_host_active: bool = False
+"""Whether neoscore is running scripts inside a long-lived render host.
+
+Hosts like :obj:`neoscore.render_server` set up the application once and then run
+many ordinary neoscore scripts in it. While this is set, :obj:`.setup` only replaces
+the document with a new one, and :obj:`.show` and :obj:`.shutdown` do nothing.
+"""
+
+_export_session_depth: int = 0
+"""The number of currently open :obj:`.export_session` contexts."""
+
+_export_session_rendered: bool = False
+"""Whether the document has been rendered in the current export session."""
+
+export_cache: Optional[ExportCache] = None
+"""An on-disk cache of exported images, or ``None`` if exports aren't cached.
+
+Set this using :obj:`.set_export_cache`.
 """
 
 _supported_image_extensions = {
@@ -106,7 +152,8 @@ def setup(paper: Paper = A4):
     AppInterface instance.
 
     This should be called once at the beginning of every script using ``neoscore``;
-    calling this multiple times in one script will cause unexpected behavior.
+    calling this multiple times in one script will cause unexpected behavior. To
+    start a new document in an already set up process, use :obj:`.reset`.
 
     Args:
         paper: The paper to use in the document.
@@ -117,7 +164,14 @@ def setup(paper: Paper = A4):
     global background_brush
     # Some things are imported here to work around cyclic import problems
     from neoscore.core.document import Document
-    from neoscore.core.font import Font
+    from neoscore.core.font import Font, _clear_font_registry
+
+    if _render_host_active:
+        reset(paper)
+        return
+
+    # Fonts from any previous application can't be reused
+    _clear_font_registry()
 
     document = Document(paper)
 
@@ -130,6 +184,89 @@ def setup(paper: Paper = A4):
     )
 
 
+def reset(paper: Paper = A4):
+    """Replace the document with a new empty one, keeping the application running.
+
+    The scene is cleared, any refresh function and input event handlers are removed,
+    and settings like the background brush, default color,
+    :obj:`.incremental_rendering`, and :obj:`.export_cache` are restored to their
+    defaults. Open :obj:`.export_session` contexts stop taking effect. The
+    application, registered fonts, and loaded font metadata are kept, so this is
+    much cheaper than :obj:`.shutdown` followed by :obj:`.setup`, and it can be
+    called any number of times in one process.
+
+    Objects created before this is called must not be used afterward.
+
+    Args:
+        paper: The paper to use in the new document.
+    """
+    global default_font
+    global document
+    global _display_page_geometry_in_refresh_func
+    global _must_clear_scene_before_next_render
+    global _export_session_rendered
+    global _export_session_depth
+    global incremental_rendering
+    global export_cache
+    # Some things are imported here to work around cyclic import problems
+    from neoscore.core.document import Document
+    from neoscore.core.font import Font
+
+    app_interface.clear_scene()
+    app_interface.clear_handlers()
+    document = Document(paper)
+    app_interface.document = document
+    set_default_color("#000000")
+    set_background_brush(_default_background_brush)
+    default_font = Font(
+        _DEFAULT_LORA_FONT_FAMILY_NAME, _DEFAULT_LORA_FONT_SIZE, 1, False
+    )
+    _display_page_geometry_in_refresh_func = False
+    _must_clear_scene_before_next_render = False
+    _export_session_rendered = False
+    _export_session_depth = 0
+    incremental_rendering = True
+    export_cache = None
+
+
+def set_document(doc: Document):
+    """Make a document the current one.
+
+    Any number of documents can exist at once, each created with
+    ``Document(paper)``. Objects created without a parent are placed in the current
+    document, and rendering, exporting, and :obj:`.show` act on it. Every document
+    keeps its own rendered scene, so switching between them is cheap.
+
+    Args:
+        doc: The document to make current.
+    """
+    global document
+    global _export_session_rendered
+    document = doc
+    app_interface.set_document(doc)
+    _export_session_rendered = False
+
+
+@contextmanager
+def use_document(doc: Document) -> Iterator[Document]:
+    """A context in which a document is the current one.
+
+    This is like :obj:`.set_document`, except the previously current document is
+    restored afterward. ::
+
+        score = Document(A4)
+        with neoscore.use_document(score):
+            Text(ORIGIN, None, "in a second document")
+            neoscore.render_pdf("score.pdf")
+    """
+    previous = document
+    set_document(doc)
+    try:
+        yield doc
+    finally:
+        set_document(previous)
+
+
 def set_default_color(color: ColorDef):
     """Set the default color used in unspecified pens and brushes.
 
@@ -152,6 +289,27 @@ def set_background_brush(brush: BrushDef):
     app_interface.background_brush = background_brush.interface
 
 
+def set_export_cache(
+    directory: Optional[str | pathlib.Path], max_size: int = 1024**3
+):
+    """Set a directory for caching exported images across renders and runs.
+
+    With a cache set, :obj:`.render_image`, :obj:`.render_images`, and raster
+    :obj:`.render_pdf` exports hash everything drawn in each exported region
+    along with the export settings. Regions whose hash matches an earlier export
+    are copied from the cache instead of being painted and encoded again, so
+    re-exporting a large score after a small edit only redraws the changed pages.
+
+    Args:
+        directory: The cache directory, or ``None`` to disable caching.
+            The directory is created if needed.
+        max_size: The maximum total size of cached files in bytes. When this is
+            exceeded, the least recently used files are deleted.
+    """
+    global export_cache
+    export_cache = None if directory is None else ExportCache(directory, max_size)
+
+
 def register_font(font_file_path: str | pathlib.Path) -> List[str]:
     """Register a font file with the application.
 
@@ -172,9 +330,14 @@ def register_font(font_file_path: str | pathlib.Path) -> List[str]:
     """
     global registered_font_family_names
     global app_interface
+    # Imported here to work around cyclic import problems
+    from neoscore.core.font import _clear_font_registry
+
     family_names = app_interface.register_font(font_file_path)
     for name in family_names:
         registered_font_family_names.add(name)
+    # Fonts created before may have resolved to a different font
+    _clear_font_registry()
     return family_names
 
 
@@ -200,8 +363,7 @@ def register_music_font(
     global registered_music_fonts
     family_names = register_font(font_file_path)
     try:
-        with open(metadata_path, "r") as metadata_file:
-            metadata = json.load(metadata_file)
+        metadata = load_json_index(metadata_path, depth=1)
     except FileNotFoundError:
         raise FileNotFoundError(
             "Music font metadata file {} could not be found".format(metadata_path)
@@ -276,6 +438,8 @@ def show(
     global app_interface
     global background_brush
     global _display_page_geometry_in_refresh_func
+    if _render_host_active:
+        return
     _display_page_geometry_in_refresh_func = display_page_geometry
     doc_background_brush = Brush("#FFFFFF")
 
@@ -286,8 +450,15 @@ def show(
     app_interface.show(min_window_size, max_window_size, fullscreen)
 
 
-def _render_document(display_page_geometry: bool, background_brush: Brush):
-    """Render the document, clearing the scene before if needed.
+def _render_document(
+    display_page_geometry: bool,
+    background_brush: Brush,
+    region: Optional[RectDef] = None,
+):
+    """Render the document, rebuilding every object before if needed.
+
+    If a ``region`` is given, only objects appearing in it are drawn. See
+    :obj:`.Document.render`.
 
     This should be used instead of using ``document.render`` directly.
     """
@@ -295,16 +466,10 @@ def _render_document(display_page_geometry: bool, background_brush: Brush):
     global app_interface
     global _must_clear_scene_before_next_render
 
-    if _must_clear_scene_before_next_render:
-        app_interface.clear_scene()
+    if _must_clear_scene_before_next_render and not incremental_rendering:
         for page in document.pages:
-            for obj in page.descendants:
-                interfaces = getattr(obj, "interfaces", None)
-                if interfaces:
-                    interfaces.clear()
-                if hasattr(obj, "_interface_for_children"):
-                    obj._interface_for_children = None
-    document.render(display_page_geometry, background_brush)
+            page._mark_dirty()
+    document.render(display_page_geometry, background_brush, region)
     _must_clear_scene_before_next_render = True
 
 
@@ -372,36 +537,57 @@ def get_viewport_rotation() -> float:
     return app_interface.viewport_rotation
 
 
-def render_pdf(pdf_path: str | pathlib.Path, dpi: int = 300):
+def render_pdf(
+    pdf_path: str | pathlib.Path,
+    dpi: int = 300,
+    vector: bool = True,
+    grayscale: bool = False,
+    jpeg_quality: Optional[int] = None,
+):
     """Render the score as a pdf.
 
+    By default, pages are drawn as vector graphics, giving small files which stay
+    sharp at any zoom level. Text is drawn as outlines, so no fonts are embedded.
+
+    Raster PDFs are streamed to the output file a page at a time as pages finish
+    rendering, so memory use doesn't grow with the length of the score.
+
     Args:
         pdf_path: The output pdf path
-        dpi: Resolution to render at
+        dpi: Resolution to render at. For vector PDFs, this only applies to raster
+            content like pixmap images.
+        vector: Whether to draw pages as vector graphics. If ``False``, each page
+            is rasterized and the PDF is assembled from the page images.
+        grayscale: Whether raster pages are stored in grayscale, which is a third
+            of the size of color pages. This suits monochrome scores.
+        jpeg_quality: If given, raster pages are JPEG compressed with this quality,
+            between ``0`` (most compressed) and ``100`` (least compressed).
+            Otherwise pages are losslessly compressed.
     """
     global app_interface
     global background_brush
-    _render_document(False, background_brush)
-    # Render all pages to temp files
-    page_imgs = []
-    render_threads = []
-    for page in document.pages:
-        img_buffer = bytearray()
-        page_imgs.append(img_buffer)
-        render_threads.append(
-            render_image(
-                page.document_space_bounding_rect,
-                img_buffer,
-                dpi,
-                preserve_alpha=False,
-                wait=False,
-            )
+    _render_document_for_export()
+    page_rects = (page.document_space_bounding_rect for page in document.pages)
+    if vector:
+        app_interface.render_pdf(
+            page_rects,
+            pdf_path,
+            dpi,
+            background_brush.color,
         )
-    for thread in render_threads:
-        thread.join()
-    # Assemble into PDF and write it to file path
-    with open(pdf_path, "wb") as f:
-        f.write(img2pdf.convert([bytes(buf) for buf in page_imgs]))
+        return
+    if jpeg_quality is not None and not 0 <= jpeg_quality <= 100:
+        warn("render_pdf jpeg_quality {} invalid; using 75.".format(jpeg_quality))
+        jpeg_quality = 75
+    app_interface.render_raster_pdf(
+        page_rects,
+        pdf_path,
+        dpi,
+        background_brush.color,
+        grayscale,
+        jpeg_quality,
+        cache=export_cache,
+    )
 
 
 def render_image(
@@ -412,6 +598,9 @@ def render_image(
     autocrop: bool = False,
     preserve_alpha: bool = True,
     wait: bool = True,
+    tile_height: Optional[int] = None,
+    bands: int = 1,
+    vector_autocrop: bool = False,
 ) -> PropagatingThread:
     """Render a section of the document to an image.
 
@@ -449,10 +638,29 @@ def render_image(
         preserve_alpha: Whether to preserve the alpha channel. This should be set ``false``
             for export formats that don't support alpha.
         wait: Whether to block until the image is fully exported.
+        tile_height: If given, the image is painted in horizontal strips of this
+            many pixels, each streamed into the output file as soon as it is
+            painted. This keeps memory use bounded for very large or high DPI
+            images, which could otherwise need gigabytes of memory. Only PNG output
+            is supported in this mode, and ``quality`` and ``autocrop`` (unless
+            ``vector_autocrop`` is used) can't be used.
+        bands: The number of horizontal bands to split the image into, which are
+            painted concurrently by a pool of threads and then stitched together.
+            This can speed up rendering dense pages at high resolutions. This does
+            not apply when ``tile_height`` is given.
+        vector_autocrop: If true, ``autocrop`` finds the content bounds from the
+            bounding rects of the objects in ``rect`` before anything is painted,
+            so only the cropped area is ever rendered. This is much faster than
+            scanning the rendered pixels, especially at high resolutions, but may
+            leave small margins where shapes don't fill their bounding rects.
+            This also allows ``autocrop`` with ``tile_height``.
 
     Raises:
         InvalidImageFormatError: If the given ``image_path`` does not have a
-            supported image format file extension.
+            supported image format file extension, or if it isn't a PNG when
+            ``tile_height`` is given.
+        ValueError: If ``tile_height`` is given with ``autocrop`` but without
+            ``vector_autocrop``.
         ImageExportError: If low level Qt image export fails for
             unknown reasons.
     """
@@ -472,20 +680,459 @@ def render_image(
             "image_path {} is not in a supported format.".format(dest)
         )
 
-    _render_document(False, background_brush)
+    if tile_height:
+        if autocrop and not vector_autocrop:
+            raise ValueError(
+                "autocrop is only supported with tiled rendering if vector_autocrop"
+                + " is used"
+            )
+        if not isinstance(dest, bytearray) and os.path.splitext(dest)[1] != ".png":
+            raise InvalidImageFormatError(
+                "image_path {} must be a PNG for tiled rendering.".format(dest)
+            )
 
-    thread = app_interface.render_image(
-        rect,
-        dest,
+    _render_document_for_export([rect])
+
+    cache = export_cache
+    cache_key = _export_cache_key(
+        rect, dest, dpi, quality, autocrop, preserve_alpha, vector_autocrop
+    )
+    cached = cache.get(cache_key) if cache and cache_key else None
+    if cached is not None:
+        thread = PropagatingThread(target=_write_export, args=(dest, cached))
+        thread.start()
+    else:
+        thread = app_interface.render_image(
+            rect,
+            dest,
+            dpi,
+            quality,
+            background_brush.color,
+            autocrop,
+            preserve_alpha,
+            tile_height,
+            bands,
+            vector_autocrop,
+        )
+        if cache and cache_key:
+            thread = PropagatingThread(
+                target=_cache_export, args=(cache, cache_key, dest, thread)
+            )
+            thread.start()
+    if wait:
+        thread.join()
+    return thread
+
+
+def render_svg(rect: Optional[RectDef], dest: str | pathlib.Path | bytearray):
+    """Render a section of the document to an SVG image.
+
+    Graphics are written directly as SVG elements, so output is exact at any zoom
+    level. Text is drawn as outlines, with each distinct glyph defined once and
+    referenced wherever it appears, keeping files small for large scores.
+
+    Rich text is not currently supported in SVG output and is skipped.
+
+    Args:
+        rect: The part of the document to render, in document coordinates.
+            If ``None``, the entire scene will be rendered.
+        dest: An output file path or a bytearray to save to.
+    """
+    global app_interface
+    global background_brush
+    _render_document_for_export([rect])
+    app_interface.render_svg(rect, dest, background_brush.color)
+
+
+def render_images(
+    jobs: Iterable[Tuple[Optional[RectDef], str | pathlib.Path | bytearray]],
+    dpi: int = 300,
+    quality: int = -1,
+    autocrop: bool = False,
+    preserve_alpha: bool = True,
+    processes: Optional[int] = None,
+    vector_autocrop: bool = False,
+):
+    """Render several sections of the document to images in parallel.
+
+    This works like calling :obj:`.render_image` for each ``(rect, dest)`` pair in
+    ``jobs``, except the document is only rendered once, and the images are painted
+    and encoded in worker processes forked from this one. This lets exports of many
+    pages scale with the number of CPU cores. ::
+
+        neoscore.render_images(
+            [(page.document_space_bounding_rect, f"page_{i}.png")
+             for i, page in enumerate(neoscore.document.pages)]
+        )
+
+    Worker processes are only forked on Linux, where forking a running Qt
+    application is safe. Elsewhere, images are rendered one at a time.
+
+    Args:
+        jobs: ``(rect, dest)`` pairs giving the part of the document to render and
+            where to save it, as in :obj:`.render_image`.
+        dpi: The pixels per inch of the rendered images.
+        quality: The quality of the output images for compressed image formats.
+            Must be either ``-1`` (default compression) or between ``0`` (most
+            compressed) and ``100`` (least compressed).
+        autocrop: Whether to crop each image to tightly fit its contents.
+        preserve_alpha: Whether to preserve the alpha channel.
+        processes: The number of worker processes to use. Defaults to the number
+            of CPUs.
+        vector_autocrop: Whether ``autocrop`` crops to object bounding rects before
+            painting, as in :obj:`.render_image`.
+
+    Raises:
+        InvalidImageFormatError: If any file destination does not have a
+            supported image format file extension.
+        ImageExportError: If low level Qt image export fails for
+            unknown reasons.
+    """
+    global app_interface
+    global background_brush
+
+    if not ((0 <= quality <= 100) or quality == -1):
+        warn("render_images quality {} invalid; using default.".format(quality))
+        quality = -1
+
+    jobs = list(jobs)
+    for _, dest in jobs:
+        if (
+            not isinstance(dest, bytearray)
+            and not os.path.splitext(dest)[1] in _supported_image_extensions
+        ):
+            raise InvalidImageFormatError(
+                "image_path {} is not in a supported format.".format(dest)
+            )
+
+    _render_document_for_export(rect for rect, _ in jobs)
+
+    cache = export_cache
+    uncached_jobs = []
+    cache_keys = []
+    for rect, dest in jobs:
+        cache_key = _export_cache_key(
+            rect, dest, dpi, quality, autocrop, preserve_alpha, vector_autocrop
+        )
+        cached = cache.get(cache_key) if cache and cache_key else None
+        if cached is not None:
+            _write_export(dest, cached)
+        else:
+            uncached_jobs.append((rect, dest))
+            cache_keys.append(cache_key)
+    if not uncached_jobs:
+        return
+
+    app_interface.render_images(
+        uncached_jobs,
         dpi,
         quality,
         background_brush.color,
         autocrop,
         preserve_alpha,
+        processes,
+        vector_autocrop,
     )
-    if wait:
-        thread.join()
-    return thread
+    if cache:
+        for cache_key, (_, dest) in zip(cache_keys, uncached_jobs):
+            if cache_key:
+                cache.put(cache_key, _read_export(dest))
+
+
+def _export_cache_key(
+    rect: Optional[RectDef], dest: str | pathlib.Path | bytearray, *params: Any
+) -> Optional[str]:
+    """Get the :obj:`.export_cache` key for an image export.
+
+    Returns ``None`` if there is no cache or the export can't be cached.
+    """
+    if export_cache is None:
+        return None
+    if isinstance(dest, bytearray):
+        extension = ".png"
+    else:
+        extension = os.path.splitext(dest)[1].lower()
+    return app_interface.content_hash(
+        rect, extension, repr(background_brush.color), *params
+    )
+
+
+def _read_export(dest: str | pathlib.Path | bytearray) -> bytes:
+    if isinstance(dest, bytearray):
+        return bytes(dest)
+    return pathlib.Path(dest).read_bytes()
+
+
+def _write_export(dest: str | pathlib.Path | bytearray, data: bytes):
+    if isinstance(dest, bytearray):
+        dest.clear()
+        dest.extend(data)
+    else:
+        pathlib.Path(dest).write_bytes(data)
+
+
+def _cache_export(
+    cache: ExportCache,
+    cache_key: str,
+    dest: str | pathlib.Path | bytearray,
+    render_thread: PropagatingThread,
+):
+    """Wait for an image export to finish, then store its output in ``cache``."""
+    render_thread.join()
+    cache.put(cache_key, _read_export(dest))
+
+
+def render_image_pyramid(
+    rect: Optional[RectDef],
+    levels: Iterable[Tuple[int, str | pathlib.Path | bytearray]],
+    quality: int = -1,
+    preserve_alpha: bool = True,
+):
+    """Render a section of the document to images at several resolutions.
+
+    This is much faster than calling :obj:`.render_image` for each resolution, since
+    the document is rendered and painted only once, at the highest resolution.
+    Lower resolutions are derived from that image by high quality downsampling on
+    worker threads. ::
+
+        neoscore.render_image_pyramid(
+            page.document_space_bounding_rect,
+            [(300, "page.png"), (150, "page_medium.png"), (30, "page_thumb.png")],
+        )
+
+    Args:
+        rect: The part of the document to render, in document coordinates.
+            If ``None``, the entire scene will be rendered.
+        levels: ``(dpi, dest)`` pairs giving the resolution of each image and where
+            to save it. As in :obj:`.render_image`, destinations may be file paths
+            or bytearrays, which are given PNG data.
+        quality: The quality of the output images for compressed image formats.
+            Must be either ``-1`` (default compression) or between ``0`` (most
+            compressed) and ``100`` (least compressed).
+        preserve_alpha: Whether to preserve the alpha channel.
+
+    Raises:
+        InvalidImageFormatError: If any file destination does not have a
+            supported image format file extension.
+        ImageExportError: If low level Qt image export fails for
+            unknown reasons.
+    """
+    global app_interface
+    global background_brush
+
+    if not ((0 <= quality <= 100) or quality == -1):
+        warn("render_image_pyramid quality {} invalid; using default.".format(quality))
+        quality = -1
+
+    levels = list(levels)
+    for _, dest in levels:
+        if (
+            not isinstance(dest, bytearray)
+            and not os.path.splitext(dest)[1] in _supported_image_extensions
+        ):
+            raise InvalidImageFormatError(
+                "image_path {} is not in a supported format.".format(dest)
+            )
+
+    _render_document_for_export([rect])
+
+    app_interface.render_image_pyramid(
+        rect, levels, quality, background_brush.color, preserve_alpha
+    )
+
+
+def render_deep_zoom(
+    rect: Optional[RectDef],
+    dest: str | pathlib.Path,
+    dpi: int = 300,
+    tile_size: int = 254,
+    overlap: int = 1,
+    tile_format: str = "png",
+    preserve_alpha: bool = True,
+):
+    """Render a section of the document to a Deep Zoom tile pyramid.
+
+    Deep Zoom images can be smoothly panned and zoomed in web viewers like
+    OpenSeadragon, which load only the tiles needed for the current view. This
+    writes a ``.dzi`` descriptor file at ``dest``, and the tile images for every
+    zoom level in a ``<name>_files`` directory next to it.
+
+    The document is painted only once, for the most detailed zoom level, and lower
+    levels are downsampled from it.
+
+    Args:
+        rect: The part of the document to render, in document coordinates.
+            If ``None``, the entire scene will be rendered.
+        dest: The path of the ``.dzi`` file to write.
+        dpi: The pixels per inch of the most detailed zoom level.
+        tile_size: The width and height of the tiles, not including overlap.
+        overlap: The number of pixels each tile overlaps its neighbors by.
+        tile_format: The image format of the tiles, given as a file extension
+            like ``"png"`` or ``"jpg"``.
+        preserve_alpha: Whether to preserve the alpha channel.
+
+    Raises:
+        InvalidImageFormatError: If ``tile_format`` is not a supported format.
+        ImageExportError: If low level Qt image export fails for
+            unknown reasons.
+    """
+    global app_interface
+    global background_brush
+
+    if "." + tile_format not in _supported_image_extensions:
+        raise InvalidImageFormatError(
+            "tile_format {} is not a supported format.".format(tile_format)
+        )
+
+    _render_document_for_export([rect])
+
+    app_interface.render_deep_zoom(
+        rect,
+        dest,
+        dpi,
+        background_brush.color,
+        preserve_alpha,
+        tile_size,
+        overlap,
+        tile_format,
+    )
+
+
+def render_to_buffers(
+    rects: Iterable[Optional[RectDef]], dpi: int = 300, grayscale: bool = False
+) -> List[memoryview]:
+    """Render sections of the document to raw pixel buffers in memory.
+
+    This avoids the cost of encoding and decoding images when rendered pixels are
+    processed directly. The document is rendered once for the whole batch, and
+    each section is painted straight into its returned buffer without copying.
+
+    Each buffer holds 8-bit pixels in rows from top to bottom, shaped
+    ``(height, width, 4)`` for RGBA pixels or ``(height, width)`` for grayscale
+    pixels. The background is filled with the background brush color.
+
+    Args:
+        rects: The parts of the document to render, in document coordinates.
+            ``None`` renders the entire scene.
+        dpi: The pixels per inch of the rendered images.
+        grayscale: Whether to render grayscale pixels instead of RGBA.
+
+    Raises:
+        ValueError: If a rect is too small to contain any pixels at this ``dpi``.
+    """
+    global app_interface
+    global background_brush
+    rects = list(rects)
+    _render_document_for_export(rects)
+    return [
+        app_interface.render_to_buffer(rect, dpi, background_brush.color, grayscale)
+        for rect in rects
+    ]
+
+
+def render_to_buffer(
+    rect: Optional[RectDef], dpi: int = 300, grayscale: bool = False
+) -> memoryview:
+    """Render a section of the document to a raw pixel buffer in memory.
+
+    This works like :obj:`.render_to_buffers` for a single rect.
+    """
+    return render_to_buffers([rect], dpi, grayscale)[0]
+
+
+def render_to_arrays(
+    rects: Iterable[Optional[RectDef]], dpi: int = 300, grayscale: bool = False
+) -> List[numpy.ndarray]:
+    """Render sections of the document to NumPy arrays.
+
+    This works like :obj:`.render_to_buffers`, but gives ``uint8`` NumPy arrays
+    sharing the buffers' memory. NumPy is an optional dependency, which can be
+    installed with ``pip install neoscore[numpy]``.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+    """
+    np = _import_numpy()
+    return [np.asarray(buffer) for buffer in render_to_buffers(rects, dpi, grayscale)]
+
+
+def render_to_array(
+    rect: Optional[RectDef], dpi: int = 300, grayscale: bool = False
+) -> numpy.ndarray:
+    """Render a section of the document to a NumPy array.
+
+    This works like :obj:`.render_to_arrays` for a single rect.
+    """
+    return render_to_arrays([rect], dpi, grayscale)[0]
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "NumPy is required for array rendering. "
+            + "Install it with `pip install neoscore[numpy]`."
+        ) from e
+    return numpy
+
+
+@contextmanager
+def export_session() -> Iterator[None]:
+    """A context in which any number of exports share a single document render.
+
+    Normally every export, like :obj:`.render_image` and :obj:`.render_pdf`, renders the
+    document first. Inside this context, the document is only rendered by the first
+    export, and later exports reuse the rendered scene as long as no objects are
+    changed in between. ::
+
+        with neoscore.export_session():
+            neoscore.render_image(page_1_rect, "page_1.png")
+            neoscore.render_image(page_1_rect, "page_1_large.png", dpi=1200)
+            neoscore.render_pdf("score.pdf")
+
+    Exports after tracked changes (see :obj:`.incremental_rendering`) render again.
+    Sessions may be nested, in which case the outermost one takes effect.
+    """
+    global _export_session_depth
+    global _export_session_rendered
+    _export_session_depth += 1
+    try:
+        yield
+    finally:
+        # The depth is zero here if `reset` was called within the session
+        _export_session_depth = max(_export_session_depth - 1, 0)
+        if not _export_session_depth:
+            _export_session_rendered = False
+
+
+def _render_document_for_export(
+    rects: Optional[Iterable[Optional[RectDef]]] = None,
+):
+    """Render the document for an export, unless an export session makes it moot.
+
+    Args:
+        rects: The parts of the document being exported, if known. Only objects
+            appearing in the area covering them are drawn, so exporting a small
+            part of a long document is fast. ``None`` rects cover everything.
+    """
+    global _export_session_rendered
+    if (
+        _export_session_depth
+        and _export_session_rendered
+        and not document._has_pending_changes()
+    ):
+        return
+    region = None
+    if rects is not None:
+        for rect in rects:
+            if rect is None:
+                region = None
+                break
+            rect = Rect.from_def(rect)
+            region = rect if region is None else region.merge(rect)
+    _render_document(False, background_brush, region)
+    _export_session_rendered = bool(_export_session_depth)
 
 
 def _repl_refresh_func(_: float) -> float:
@@ -573,4 +1220,10 @@ def shutdown():
     After running this, :obj:`.neoscore.setup` can be called again to start a new
     document.
     """
+    # Imported here to work around cyclic import problems
+    from neoscore.core.font import _clear_font_registry
+
+    if _render_host_active:
+        return
     app_interface.destroy()
+    _clear_font_registry()
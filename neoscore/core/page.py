@@ -62,6 +62,11 @@ class Page(PositionedObject):
         self.paper = paper
         self._geometry_preview_created = False
 
+    @property
+    def document(self) -> Document:
+        """The document this page belongs to."""
+        return self._document
+
     @property
     def index(self):
         """The index of this page in its managing :obj:`.PageSupplier`."""
@@ -224,3 +229,5 @@ class Page(PositionedObject):
         preview_objs_parent.children = (
             preview_objs_parent.children[-3:] + preview_objs_parent.children[:-3]
         )
+        # (Reassigning the children also flags the parent for a full re-render, so
+        # this ordering holds even if parts of the page were already rendered.)
@@ -76,7 +76,9 @@ class PageSupplier:
     def pop(self, index):
         if index < 0 or index >= len(self._page_list):
             raise IndexError("Index out of range.")
-        return self._page_list.pop(index)
+        page = self._page_list.pop(index)
+        page._unrender()
+        return page
 
     @property
     def document(self) -> Document:
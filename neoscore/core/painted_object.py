@@ -45,6 +45,7 @@ class PaintedObject(PositionedObject):
             self._pen = Pen.from_def(value)
         else:
             self._pen = Pen()
+        self._mark_dirty()
 
     @property
     def brush(self) -> Brush:
@@ -62,3 +63,4 @@ class PaintedObject(PositionedObject):
             self._brush = Brush.from_def(value)
         else:
             self._brush = Brush()
+        self._mark_dirty()
@@ -425,6 +425,7 @@ class Path(PaintedObject):
             self._background_brush = Brush.from_def(value)
         else:
             self._background_brush = None
+        self._mark_dirty()
 
     def line_to(self, x: Unit, y: Unit, parent: Optional[PositionedObject] = None):
         """Draw a path from the current position to a new point.
@@ -441,7 +442,7 @@ class Path(PaintedObject):
         """
         if not len(self.elements):
             self.move_to(ZERO, ZERO)
-        self.elements.append(LineTo(Point(x, y), parent or self))
+        self._append_element(LineTo(Point(x, y), parent or self))
 
     def move_to(self, x: Unit, y: Unit, parent: Optional[PositionedObject] = None):
         """Close the current sub-path and start a new one.
@@ -453,7 +454,7 @@ class Path(PaintedObject):
                 be relative to.
         """
         self._current_subpath_start = (Point(x, y), parent or self)
-        self.elements.append(MoveTo(Point(x, y), parent or self))
+        self._append_element(MoveTo(Point(x, y), parent or self))
 
     def close_subpath(self):
         """Close the current sub-path with a line.
@@ -511,7 +512,16 @@ class Path(PaintedObject):
         )
         if not len(self.elements):
             self.move_to(ZERO, ZERO)
-        self.elements.append(CurveTo(Point(end_x, end_y), end_parent or self, c1, c2))
+        c1._add_render_dependent(self)
+        c2._add_render_dependent(self)
+        self._append_element(CurveTo(Point(end_x, end_y), end_parent or self, c1, c2))
+
+    def _append_element(self, element: PathElement):
+        # Elements may be anchored anywhere in the document, so the path needs
+        # re-rendering whenever any of them move.
+        element._add_render_dependent(self)
+        self.elements.append(element)
+        self._mark_dirty()
 
     def _relative_element_pos(self, element: PositionedObject) -> Point:
         return self.map_to(element)
@@ -2,15 +2,33 @@ from __future__ import annotations
 
 import math
 from collections.abc import Iterator
-from typing import TYPE_CHECKING, Any, List, Optional, Set, Type, cast
+from contextlib import contextmanager
+from itertools import chain
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Hashable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    cast,
+)
 
 from backports.cached_property import cached_property
 
 from neoscore.core import neoscore
 from neoscore.core.point import ORIGIN, Point, PointDef
+from neoscore.core.rect import Rect
 from neoscore.core.units import ZERO, Unit
 from neoscore.interface.invisible_object_interface import InvisibleObjectInterface
-from neoscore.interface.positioned_object_interface import PositionedObjectInterface
+from neoscore.interface.positioned_object_interface import (
+    PositionedObjectInterface,
+    set_stacking_rank,
+)
 
 if TYPE_CHECKING:
     # Used in type annotations, imported here to avoid cyclic imports
@@ -18,6 +36,79 @@ if TYPE_CHECKING:
     from neoscore.core.layout_controllers import NewLine
 
 
+_render_owners: List[PositionedObject] = []
+"""A stack of the objects whose ``render`` calls are currently in progress.
+
+Objects rendered while this is non-empty are temporary helpers created by the object
+on top of the stack, whose graphics are owned by that object.
+"""
+
+
+_render_region: Optional[Rect] = None
+"""The document-space area the ongoing render is limited to, if any.
+
+See :obj:`._rendering_region`.
+"""
+
+
+@contextmanager
+def _rendering_region(region: Optional[Rect]) -> Iterator[None]:
+    """A context in which renders only draw objects appearing in ``region``.
+
+    Objects outside flowables are drawn if the page they belong to overlaps the
+    region. Objects in flowables only draw their parts on flowable lines overlapping
+    the region. Skipped parts stay pending, so later renders draw them without
+    redrawing the parts already rendered.
+    """
+    global _render_region
+    previous_region = _render_region
+    _render_region = region
+    try:
+        yield
+    finally:
+        _render_region = previous_region
+
+
+_index_keys_by_class: Dict[type, Tuple[Hashable, ...]] = {}
+"""A cache of the descendant index keys of each class.
+
+See :obj:`._descendant_index_keys`.
+"""
+
+
+def _is_type_marker(attribute: str) -> bool:
+    return attribute.startswith("_neoscore_") and attribute.endswith("_type_marker")
+
+
+def _descendant_index_keys(cls: type) -> Tuple[Hashable, ...]:
+    """Find the keys under which instances of a class are held in descendant indexes.
+
+    These are every class in ``cls``'s MRO along with the names of all
+    ``_neoscore_*_type_marker`` attributes defined on it.
+    """
+    keys = _index_keys_by_class.get(cls)
+    if keys is None:
+        keys = tuple(c for c in cls.__mro__ if c is not object) + tuple(
+            attr for attr in dir(cls) if _is_type_marker(attr)
+        )
+        _index_keys_by_class[cls] = keys
+    return keys
+
+
+class _RootSpacePos(NamedTuple):
+    """An object's cached position relative to the root of its tree."""
+
+    pos: Point
+    """The logical position relative to ``root``"""
+    root: Any
+    """The root of the tree, typically the global :obj:`.Document`"""
+    canvas_mapper: Optional[Any]
+    """The closest ancestor which maps its local points to canvas space, if any.
+
+    This is typically a :obj:`.Flowable`.
+    """
+
+
 class render_cached_property(cached_property):  # noqa
 
     """A property annotation for fields which can be cached at render time.
@@ -60,6 +151,65 @@ class render_cached_property(cached_property):  # noqa
         raise AttributeError(f"can't set attribute '{self.func.__name__}'")
 
 
+class persistent_cached_property(cached_property):  # noqa
+
+    """A property annotation for fields which can be cached until their inputs change.
+
+    You can annotate any ``PositionedObject`` property to get this behavior, including
+    on inheriting classes. ::
+
+        class Example(PositionedObject):
+            @persistent_cached_property
+            def some_expensive_computed_property(self):
+                ...
+
+    Unlike :obj:`.render_cached_property`, values are kept across renders. They are
+    cleared whenever the object is flagged as changed (see ``_mark_dirty``), and
+    whenever a descendant is added, removed, or moved. Properties should only use
+    this if they depend solely on such inputs, for instance an object's own text,
+    font, scale, and alignment, or the positions of its descendants.
+
+    Such properties cannot be set.
+    """
+
+    # Like `render_cached_property`, this extends `cached_property` as a hack to make
+    # Sphinx and other tools treat it like a property. Since it has no `__set__`,
+    # cached values in the instance dict are found without calling `__get__`.
+
+    def __init__(self, func):
+        """
+        :meta private:
+        """
+        self.func = func
+        self.attrname = None
+        self.__doc__ = func.__doc__
+
+    def __get__(self, obj, cls):  # noqa
+        if obj is None:
+            return self
+        value = obj.__dict__[self.func.__name__] = self.func(obj)
+        return value
+
+
+_persistent_cached_names_by_class: Dict[type, Tuple[str, ...]] = {}
+"""A cache of the names of every ``persistent_cached_property`` on each class."""
+
+
+def _persistent_cached_names(cls: type) -> Tuple[str, ...]:
+    names = _persistent_cached_names_by_class.get(cls)
+    if names is None:
+        names = tuple(
+            {
+                name
+                for c in cls.__mro__
+                for name, attr in vars(c).items()
+                if isinstance(attr, persistent_cached_property)
+            }
+        )
+        _persistent_cached_names_by_class[cls] = names
+    return names
+
+
 class PositionedObject:
     """An object positioned in the scene
 
@@ -91,10 +241,24 @@ class PositionedObject:
             pos: The position of the object relative to its parent
             parent: The parent object. Defaults to the document's first page.
         """
-        self.pos = pos
+        self._dirty = False
+        self._dirty_descendants = False
+        self._render_pending = False
+        self._pending_lines: Optional[Set[int]] = None
+        self._render_dependents: Dict[PositionedObject, None] = {}
+        self._render_dependencies: Dict[PositionedObject, None] = {}
+        self._render_helpers: List[PositionedObject] = []
+        self._render_owner: Optional[PositionedObject] = None
+        self._created_while_rendering = bool(_render_owners)
+        self._descendant_index: Optional[
+            Dict[Hashable, Dict[PositionedObject, None]]
+        ] = None
+        self._root_space_cache: Optional[_RootSpacePos] = None
+        self._stacking_rank = 0
         self._children: List[PositionedObject] = []
         self._parent = PositionedObject._resolve_parent(parent)
         self._set_parent_and_register_self(parent)
+        self.pos = pos
         self._render_cached_properties: Set[str] = set()
         self._currently_rendering = False
         self._interfaces = []
@@ -111,6 +275,9 @@ class PositionedObject:
     @pos.setter
     def pos(self, value: PointDef):
         self._pos = Point.from_def(value)
+        self._invalidate_root_space_cache()
+        self._clear_ancestor_persistent_caches()
+        self._mark_dirty()
 
     @property
     def scale(self) -> float:
@@ -126,6 +293,7 @@ class PositionedObject:
     @scale.setter
     def scale(self, value: float):
         self._scale = value
+        self._mark_dirty()
 
     @property
     def rotation(self) -> float:
@@ -141,6 +309,7 @@ class PositionedObject:
     @rotation.setter
     def rotation(self, value: float):
         self._rotation = value
+        self._mark_dirty()
 
     @property
     def transform_origin(self) -> Point:
@@ -150,6 +319,7 @@ class PositionedObject:
     @transform_origin.setter
     def transform_origin(self, value: PointDef):
         self._transform_origin = Point.from_def(value)
+        self._mark_dirty()
 
     @property
     def x(self) -> Unit:
@@ -202,21 +372,33 @@ class PositionedObject:
     @children.setter
     def children(self, value: List[PositionedObject]):
         self._children = value
+        for obj in chain((self,), self.ancestors):
+            if getattr(obj, "_descendant_index", None) is not None:
+                obj._descendant_index = None
+        self._mark_dirty()
 
     @property
     def descendants(self) -> Iterator[PositionedObject]:
         """All the objects in the children subtree.
 
-        This recursively searches all the object's children
-        (and their children, etc.) and provides an iterator over them.
+        This searches all the object's children (and their children, etc.) and
+        provides an iterator over them. Each object is given after all of its own
+        descendants.
 
-        The current implementation performs a simple recursive DFS over
-        the tree, and has the potential to be rather slow.
+        This walks the whole subtree, so prefer the indexed ``descendants_*``
+        query methods where possible.
         """
-        for child in self.children:
-            for subchild in child.descendants:
-                yield subchild
-            yield child
+        stack = [iter(self.children)]
+        parents: List[PositionedObject] = []
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                if parents:
+                    yield parents.pop()
+            else:
+                stack.append(iter(child.children))
+                parents.append(child)
 
     @render_cached_property
     def flowable(self) -> Optional[Flowable]:
@@ -252,15 +434,13 @@ class PositionedObject:
         self, graphic_object_class: Type[PositionedObject]
     ) -> Iterator[PositionedObject]:
         """Yield all child descendants with a given class or its subclasses."""
-        for descendant in self.descendants:
-            if isinstance(descendant, graphic_object_class):
-                yield descendant
+        yield from self._indexed_descendants(graphic_object_class)
 
     def descendants_of_exact_class(
         self, graphic_object_class: Type[PositionedObject]
     ) -> Iterator[PositionedObject]:
         """Yield all child descendants of a given class, excluding sublcasses"""
-        for descendant in self.descendants:
+        for descendant in self._indexed_descendants(graphic_object_class):
             if type(descendant) == graphic_object_class:
                 yield descendant
 
@@ -268,11 +448,54 @@ class PositionedObject:
         """Yield all child descendants which has a given attribute.
 
         This is useful for searching descendants for duck-typing matches.
+
+        Class-level ``_neoscore_*_type_marker`` attributes are indexed, making
+        searches for them much faster than for other attributes.
         """
+        if _is_type_marker(attribute):
+            yield from self._indexed_descendants(attribute)
+            return
         for descendant in self.descendants:
             if hasattr(descendant, attribute):
                 yield descendant
 
+    def _indexed_descendants(self, key: Hashable) -> Tuple[PositionedObject, ...]:
+        """Look up the descendants held under a key in this object's descendant index.
+
+        The index is built on first use and then kept up to date as objects are
+        added to and removed from the subtree.
+        """
+        if self._descendant_index is None:
+            index: Dict[Hashable, Dict[PositionedObject, None]] = {}
+            for descendant in self.descendants:
+                for index_key in _descendant_index_keys(type(descendant)):
+                    index.setdefault(index_key, {})[descendant] = None
+            self._descendant_index = index
+        # Copy matches so callers can safely modify the tree while iterating
+        return tuple(self._descendant_index.get(key, ()))
+
+    def _update_descendant_indexes(self, child: PositionedObject, add: bool):
+        """Add or remove a child's subtree in the indexes of this object and above."""
+        child._clear_ancestor_persistent_caches()
+        indexes = [
+            index
+            for index in (
+                getattr(obj, "_descendant_index", None)
+                for obj in chain((self,), self.ancestors)
+            )
+            if index is not None
+        ]
+        if not indexes:
+            return
+        for obj in chain((child,), child.descendants):
+            keys = _descendant_index_keys(type(obj))
+            for index in indexes:
+                for key in keys:
+                    if add:
+                        index.setdefault(key, {})[obj] = None
+                    else:
+                        index.get(key, {}).pop(obj, None)
+
     @property
     def ancestors(self) -> Iterator[PositionedObject]:
         """All ancestors of this object.
@@ -303,12 +526,9 @@ class PositionedObject:
             ValueError:
                 If ``descendant`` is not a descendant of this object.
         """
-        pos = descendant.pos
-        for parent in descendant.ancestors:
-            if parent == self:
-                return pos
-            pos += parent.pos
-        raise ValueError(f"{self} is not an ancestor of {descendant}")
+        if not any(parent is self for parent in descendant.ancestors):
+            raise ValueError(f"{self} is not an ancestor of {descendant}")
+        return descendant._root_space.pos - self._root_space.pos
 
     def descendant_pos_x(self, descendant: PositionedObject) -> Unit:
         """Find the x position of a descendant relative to this object.
@@ -319,12 +539,9 @@ class PositionedObject:
             ValueError:
                 If ``descendant`` is not a descendant of this object.
         """
-        pos_x = descendant.pos.x
-        for parent in descendant.ancestors:
-            if parent == self:
-                return pos_x
-            pos_x += parent.pos.x
-        raise ValueError(f"{self} is not an ancestor of {descendant}")
+        if not any(parent is self for parent in descendant.ancestors):
+            raise ValueError(f"{self} is not an ancestor of {descendant}")
+        return descendant._root_space.pos.x - self._root_space.pos.x
 
     def map_to(self, dst: PositionedObject) -> Point:
         """Find an object's logical position relative to this one
@@ -345,31 +562,14 @@ class PositionedObject:
             return dst.pos
         if self.parent == dst:
             return -self.pos
-        # Start by collecting all ancestor using IDs because they're hashable
-        self_ancestor_ids = set(id(obj) for obj in self.ancestors)
-        relative_dst_pos = dst.pos
-        for dst_ancestor in dst.ancestors:
-            if hasattr(dst_ancestor, "parent"):
-                relative_dst_pos += dst_ancestor.pos
-            if id(dst_ancestor) in self_ancestor_ids:
-                # Now find relative_self_pos and return relative_dst_pos - relative_self_pos
-                relative_self_pos = self.pos
-                for self_ancestor in self.ancestors:
-                    if hasattr(self_ancestor, "parent"):
-                        relative_self_pos += self_ancestor.pos
-                    if self_ancestor == dst_ancestor:
-                        return relative_dst_pos - relative_self_pos
-                # Since we've already determined there is a common
-                # ancestor, this should never happen
-                assert False, "Unreachable"
-        raise ValueError(f"{self} and {dst} have no common ancestor")
+        self_root_space = self._root_space
+        dst_root_space = dst._root_space
+        if self_root_space.root is not dst_root_space.root:
+            raise ValueError(f"{self} and {dst} have no common ancestor")
+        return dst_root_space.pos - self_root_space.pos
 
     def map_x_to(self, dst: PositionedObject) -> Unit:
         """Like :obj:`.map_to`, but only return the X distance from to ``dst``."""
-
-        # This implementation is copied from `map_to` and tweaked to only handle the X
-        # axis. This is a very common operation, so this optimization is useful.
-
         # Handle easy cases
         if self == dst:
             return ZERO
@@ -379,24 +579,62 @@ class PositionedObject:
             return dst.x
         if self.parent == dst:
             return -self.x
-        # Start by collecting all ancestor using IDs because they're hashable
-        self_ancestor_ids = set(id(obj) for obj in self.ancestors)
-        relative_dst_x = dst.x
-        for dst_ancestor in dst.ancestors:
-            if hasattr(dst_ancestor, "parent"):
-                relative_dst_x += dst_ancestor.x
-            if id(dst_ancestor) in self_ancestor_ids:
-                # Now find relative_self_x and return relative_dst_x - relative_self_x
-                relative_self_x = self.x
-                for self_ancestor in self.ancestors:
-                    if hasattr(self_ancestor, "parent"):
-                        relative_self_x += self_ancestor.x
-                    if self_ancestor == dst_ancestor:
-                        return relative_dst_x - relative_self_x
-                # Since we've already determined there is a common
-                # ancestor, this should never happen
-                assert False, "Unreachable"
-        raise ValueError(f"{self} and {dst} have no common ancestor")
+        self_root_space = self._root_space
+        dst_root_space = dst._root_space
+        if self_root_space.root is not dst_root_space.root:
+            raise ValueError(f"{self} and {dst} have no common ancestor")
+        return dst_root_space.pos.x - self_root_space.pos.x
+
+    @property
+    def _root_space(self) -> _RootSpacePos:
+        """This object's position relative to the root of its tree.
+
+        This is cached, and kept valid by clearing it throughout an object's subtree
+        whenever the object is moved or reparented.
+        """
+        cached = self._root_space_cache
+        if cached is not None:
+            return cached
+        # Find the closest ancestor with a cached value, then work back down
+        uncached: List[PositionedObject] = [self]
+        parent = self.parent
+        while (
+            hasattr(parent, "parent")
+            and getattr(parent, "_root_space_cache", None) is None
+        ):
+            uncached.append(parent)
+            parent = parent.parent
+        if hasattr(parent, "parent"):
+            parent_root_space = parent._root_space_cache
+        else:
+            # `parent` is the root
+            parent_root_space = None
+        for obj in reversed(uncached):
+            if parent_root_space is None:
+                root_space = _RootSpacePos(obj.pos, obj.parent, None)
+            else:
+                root_space = _RootSpacePos(
+                    obj.pos + parent_root_space.pos,
+                    parent_root_space.root,
+                    obj.parent
+                    if hasattr(obj.parent, "map_to_canvas")
+                    else parent_root_space.canvas_mapper,
+                )
+            obj._root_space_cache = root_space
+            parent_root_space = root_space
+        return cast(_RootSpacePos, parent_root_space)
+
+    def _invalidate_root_space_cache(self):
+        """Clear the cached root space positions of this object and its descendants."""
+        if self._root_space_cache is None:
+            # Descendants can only be cached if this is
+            return
+        stack = [self]
+        while stack:
+            obj = stack.pop()
+            if obj._root_space_cache is not None:
+                obj._root_space_cache = None
+                stack.extend(obj.children)
 
     def distance_to(self, obj: PositionedObject, offset: Point = ORIGIN) -> Unit:
         """Find the distance to a given object, with an optional extra offset.
@@ -418,21 +656,32 @@ class PositionedObject:
         For objects in :obj:`.Flowable`\ s, this should only be accessed at render time,
         when flowable layouts are available.
         """
-        pos = ORIGIN
-        current = self
-        while hasattr(current, "parent"):
-            pos += current.pos
-            current = current.parent
-            if hasattr(current, "map_to_canvas"):
-                # Parent appears to be a flowable,
-                # so let it decide where the point goes.
-                return cast(Any, current).map_to_canvas(pos)
-        return pos
+        root_space = self._root_space
+        mapper = root_space.canvas_mapper
+        if mapper is not None:
+            # An ancestor appears to be a flowable,
+            # so let it decide where the point goes.
+            return mapper.map_to_canvas(root_space.pos - mapper._root_space.pos)
+        return root_space.pos
 
     def remove(self):
-        """Remove this object from the document tree."""
+        """Remove this object from the document tree.
+
+        Any graphics already rendered for this object and its descendants are removed
+        from the scene.
+        """
+        if self._render_owner is None:
+            # Graphics of temporary render helpers belong to their owner,
+            # which clears them whenever it is itself re-rendered.
+            self._unrender()
+            for obj in chain((self,), self.descendants):
+                for dependent in list(obj._render_dependents):
+                    dependent._mark_dirty()
+                # Removed objects no longer need flagging when others change
+                for dependency in list(obj._render_dependencies):
+                    dependency._remove_render_dependent(obj)
         if self.parent:
-            self.parent.children.remove(self)
+            self.parent._unregister_child(self)
 
     def pre_render_hook(self):
         """Run code once just before document rendering begins.
@@ -456,31 +705,279 @@ class PositionedObject:
 
         This and other render methods should generally not be called directly.
         """
-        if self.flowable is not None:
-            self.render_in_flowable()
+        self._dirty = False
+        self._dirty_descendants = False
+        self._render_pending = False
+        self._pending_lines = None
+        if _render_owners:
+            # This is a temporary object rendered by another object's render methods
+            self._render_owner = _render_owners[-1]
+            self._render_owner._render_helpers.append(self)
         else:
-            self._interface_for_children = InvisibleObjectInterface(
-                self.pos,
-                # Hack because root document obj lacks this property
-                getattr(self.parent, "interface_for_children", None),
-                self.scale,
-                self.rotation,
-                self.transform_origin,
-            )
-            self._interface_for_children.render() # look at thos line
-            self.render_complete(self.pos) # look at this line
+            set_stacking_rank(self._stacking_rank)
+        _render_owners.append(self)
+        try:
+            if self.flowable is not None:
+                self.render_in_flowable()
+            else:
+                # Children may be in the render region even if this isn't, so
+                # they always get a parent interface.
+                self._interface_for_children = InvisibleObjectInterface(
+                    self.pos,
+                    # Hack because root document obj lacks this property
+                    getattr(self.parent, "interface_for_children", None),
+                    self.scale,
+                    self.rotation,
+                    self.transform_origin,
+                )
+                self._interface_for_children.render()
+                if self._page_in_render_region():
+                    self.render_complete(self.pos)
+                else:
+                    self._defer_render()
+        finally:
+            _render_owners.pop()
         for child in self.children:
             child.render()
 
+    def _page_in_render_region(self) -> bool:
+        """Whether this object's page is in the region the ongoing render is limited to.
+
+        Temporary objects rendered by other objects are always considered in the
+        region. See :obj:`._rendering_region`.
+        """
+        if _render_region is None or self._render_owner is not None:
+            return True
+        if hasattr(self, "_neoscore_page_type_marker"):
+            page = self
+        else:
+            page = self.first_ancestor_with_attr("_neoscore_page_type_marker")
+        if page is None:
+            return True
+        return cast(Any, page).document_space_bounding_rect.intersects(_render_region)
+
+    def _line_in_render_region(self, flowable: Flowable, line: NewLine) -> bool:
+        """Whether a line of this object's flowable is in the render region.
+
+        Temporary objects rendered by other objects are always considered in the
+        region. See :obj:`._rendering_region`.
+        """
+        if _render_region is None or self._render_owner is not None:
+            return True
+        return flowable._line_bounds(line).intersects(_render_region)
+
+    def _defer_render(self, lines: Optional[Set[int]] = None):
+        """Leave parts of this object skipped by a region-limited render pending.
+
+        The next render draws the pending parts, leaving the parts already rendered
+        in place. See :obj:`._render_pending_parts`.
+
+        Args:
+            lines: For objects in flowables, the indices of the skipped lines.
+                Otherwise, ``None`` to indicate ``render_complete`` was skipped.
+        """
+        self._render_pending = True
+        self._pending_lines = lines
+        self._flag_ancestors_dirty()
+
+    def _render_pending_parts(self):
+        """Render the parts of this object skipped by earlier region-limited renders.
+
+        Parts still outside the render region stay pending.
+        """
+        pending_lines = self._pending_lines
+        self._render_pending = False
+        self._pending_lines = None
+        # Stack the new graphics above those already rendered for this object
+        set_stacking_rank(
+            self._stacking_rank, sum(1 for _ in self._rendered_interfaces())
+        )
+        _render_owners.append(self)
+        try:
+            if pending_lines is not None:
+                self._render_flowable_lines(pending_lines)
+            elif self._page_in_render_region():
+                self.render_complete(self.pos)
+            else:
+                self._defer_render()
+        finally:
+            _render_owners.pop()
+
+    def _render_dirty(self):
+        """Re-render the parts of this subtree which changed since the last render.
+
+        Subtrees of dirty objects are cleared from the scene and fully re-rendered.
+        Parts of clean objects skipped by earlier region-limited renders are drawn.
+        Clean subtrees without dirty descendants are skipped entirely, leaving their
+        graphics in the scene untouched.
+        """
+        if self._dirty:
+            self._unrender(retire=True)
+            self.render()
+            return
+        if self._render_pending:
+            self._render_pending_parts()
+        if not self._dirty_descendants:
+            return
+        self._dirty_descendants = False
+        for child in self.children:
+            child._render_dirty()
+
+    def _retire_dirty(self):
+        """Retire the graphics of all dirty subtrees for reuse in the ongoing render.
+
+        Running this over the whole document before ``_render_dirty`` lets re-rendered
+        objects take over Qt objects from anywhere in the document, rather than only
+        from their own previous render.
+        """
+        if self._dirty:
+            self._unrender(retire=True)
+        elif self._dirty_descendants:
+            for child in self.children:
+                child._retire_dirty()
+
+    def _set_stacking_rank(self, rank: int):
+        """Set this object's position in the document's stacking order.
+
+        Graphics already rendered for this object are moved to the new position.
+        See :obj:`.Document._assign_stacking_ranks`.
+        """
+        rank_change = rank - self._stacking_rank
+        self._stacking_rank = rank
+        for interface in self._rendered_interfaces():
+            interface._restack_qt_object(rank_change)
+
+    def _rendered_interfaces(self) -> Iterator[PositionedObjectInterface]:
+        """All interfaces rendered for this object, including by its render helpers.
+
+        This doesn't include interfaces of descendants.
+        """
+        yield from self._interfaces
+        if self._interface_for_children is not None:
+            yield self._interface_for_children
+        for helper in self._render_helpers:
+            yield from helper._rendered_interfaces()
+
+    def _clear_persistent_caches(self):
+        """Clear all cached ``persistent_cached_property`` values on this object."""
+        names = _persistent_cached_names(type(self))
+        if names:
+            obj_dict = self.__dict__
+            for name in names:
+                obj_dict.pop(name, None)
+
+    def _clear_ancestor_persistent_caches(self):
+        """Clear the cached ``persistent_cached_property`` values of all ancestors.
+
+        This should be called when this object is moved, added, or removed, since
+        ancestors may cache values derived from their descendants. Temporary helpers
+        created while rendering don't affect them, so they are ignored.
+        """
+        if self._created_while_rendering:
+            return
+        for ancestor in self.ancestors:
+            if hasattr(ancestor, "_clear_persistent_caches"):
+                ancestor._clear_persistent_caches()
+
+    def _mark_dirty(self):
+        """Flag this object and its descendants for re-rendering.
+
+        Objects registered as render dependents of anything in this subtree are
+        flagged too. All ancestors are flagged as having dirty descendants so the next
+        render can find this object without walking the whole document.
+
+        This also clears the object's ``persistent_cached_property`` values.
+
+        Subclasses should call this whenever they change in a way which affects
+        their rendered appearance.
+        """
+        self._clear_persistent_caches()
+        if not self._dirty:
+            self._dirty = True
+            for obj in chain((self,), self.descendants):
+                for dependent in obj._render_dependents:
+                    dependent._mark_dirty()
+        if _render_owners and self._created_while_rendering:
+            # This is a temporary helper which is about to be rendered by its owner,
+            # so there's no need for the next render to look for it.
+            return
+        self._flag_ancestors_dirty()
+
+    def _flag_ancestors_dirty(self):
+        """Flag all ancestors as having dirty descendants."""
+        ancestor = self._parent
+        while getattr(ancestor, "_dirty_descendants", True) is False:
+            ancestor._dirty_descendants = True
+            ancestor = ancestor.parent
+
+    def _add_render_dependent(self, dependent: PositionedObject):
+        """Register an object whose appearance depends on this one's position.
+
+        Whenever this object or any of its ancestors is flagged for re-rendering,
+        ``dependent`` will be flagged as well. If this object is already flagged,
+        ``dependent`` is flagged immediately. Registering a dependent more than once
+        has no further effect.
+
+        The registration lasts until it is undone with
+        :obj:`._remove_render_dependent` or ``dependent`` is removed.
+        """
+        self._render_dependents[dependent] = None
+        dependent._render_dependencies[self] = None
+        if self._dirty:
+            dependent._mark_dirty()
+
+    def _remove_render_dependent(self, dependent: PositionedObject):
+        """Undo an :obj:`._add_render_dependent` registration.
+
+        This is a no-op if ``dependent`` isn't registered.
+        """
+        self._render_dependents.pop(dependent, None)
+        dependent._render_dependencies.pop(self, None)
+
+    def _unrender(self, retire: bool = False):
+        """Remove all rendered graphics of this object and its descendants.
+
+        Args:
+            retire: Whether to retire the graphics' Qt objects so equivalent graphics
+                created later in the ongoing render can reuse them, instead of
+                removing them immediately. This must only be used during rendering.
+        """
+        for obj in chain((self,), self.descendants):
+            interfaces = obj._interfaces
+            if obj._interface_for_children is not None:
+                interfaces = chain(interfaces, (obj._interface_for_children,))
+            for interface in interfaces:
+                if retire:
+                    interface._retire_qt_object()
+                else:
+                    interface._unregister_qt_object()
+            obj._interfaces.clear()
+            obj._interface_for_children = None
+            for helper in obj._render_helpers:
+                helper._unrender(retire)
+            obj._render_helpers.clear()
+
     def render_in_flowable(self):
         """Render the object to the scene, dispatching partial rendering calls
         when needed if an object flows across a break in the flowable.
 
         This and other render methods should generally not be called directly.
         """
+        self._render_flowable_lines(None)
+
+    def _render_flowable_lines(self, lines: Optional[Set[int]]):
+        """Render the parts of this object on some lines of its flowable.
+
+        Parts on lines outside the ongoing render's region are skipped and left
+        pending. See :obj:`._defer_render`.
+
+        Args:
+            lines: The indices of the lines to render, or ``None`` for all of them.
+        """
         # Calculate position within flowable
-        assert self.flowable is not None
-        pos_in_flowable = self.flowable.descendant_pos(self)
+        flowable = self.flowable
+        assert flowable is not None
+        pos_in_flowable = flowable.descendant_pos(self)
         first_line_i = self.flowable.last_break_index_at(pos_in_flowable.x)
         first_line = self.flowable.lines[first_line_i]
         first_line_length = (
@@ -488,7 +985,12 @@ class PositionedObject:
         )
         remaining_x = self.breakable_length - first_line_length
         if remaining_x <= ZERO:
-            self.render_complete(self.canvas_pos(), first_line, pos_in_flowable.x)
+            if lines is not None and first_line_i not in lines:
+                return
+            if self._line_in_render_region(flowable, first_line):
+                self.render_complete(self.canvas_pos(), first_line, pos_in_flowable.x)
+            else:
+                self._defer_render({first_line_i})
             return
 
         # Render before break
@@ -506,24 +1008,52 @@ class PositionedObject:
             line_pos.x + (pos_in_flowable.x - first_line.flowable_x),
             line_pos.y + pos_in_flowable.y,
         )
-        self.render_before_break(render_start_pos, first_line, pos_in_flowable.x)
+        # Parts on lines outside the render region are skipped
+        skipped_lines: Set[int] = set()
+        if lines is None or first_line_i in lines:
+            if self._line_in_render_region(flowable, first_line):
+                self.render_before_break(
+                    render_start_pos, first_line, pos_in_flowable.x
+                )
+            else:
+                skipped_lines.add(first_line_i)
 
         # Iterate through remaining length
         for current_line_i in range(first_line_i + 1, len(self.flowable.lines)):
             current_line = self.flowable.lines[current_line_i]
-            line_pos = current_line.canvas_pos()
-            render_start_pos = Point(line_pos.x, line_pos.y + pos_in_flowable.y)
+            if lines is not None and current_line_i not in lines:
+                # Already rendered
+                in_region = False
+            elif self._line_in_render_region(flowable, current_line):
+                in_region = True
+            else:
+                in_region = False
+                skipped_lines.add(current_line_i)
             local_object_x = self.breakable_length - remaining_x
             if remaining_x > current_line.length:
                 # Render spanning continuation
-                self.render_spanning_continuation(
-                    render_start_pos, current_line, local_object_x
-                )
+                if in_region:
+                    line_pos = current_line.canvas_pos()
+                    render_start_pos = Point(
+                        line_pos.x, line_pos.y + pos_in_flowable.y
+                    )
+                    self.render_spanning_continuation(
+                        render_start_pos, current_line, local_object_x
+                    )
                 remaining_x -= current_line.length
             else:
                 # Render end
-                self.render_after_break(render_start_pos, current_line, local_object_x)
+                if in_region:
+                    line_pos = current_line.canvas_pos()
+                    render_start_pos = Point(
+                        line_pos.x, line_pos.y + pos_in_flowable.y
+                    )
+                    self.render_after_break(
+                        render_start_pos, current_line, local_object_x
+                    )
                 break
+        if skipped_lines:
+            self._defer_render(skipped_lines)
 
     def render_complete(
         self,
@@ -634,11 +1164,15 @@ class PositionedObject:
         self._parent = value
         if hasattr(self._parent, "_register_child"):
             self._parent._register_child(self)
+        self._invalidate_root_space_cache()
+        self._mark_dirty()
 
     def _register_child(self, child: PositionedObject):
         """Add an object to ``self.children``."""
         self.children.append(child)
+        self._update_descendant_indexes(child, True)
 
     def _unregister_child(self, child: PositionedObject):
         """Remove an object from ``self.children``."""
         self.children.remove(child)
+        self._update_descendant_indexes(child, False)
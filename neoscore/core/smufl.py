@@ -1,12 +1,16 @@
-"""SMuFL spec metadata loaded into module constants."""
-import json
+"""SMuFL spec metadata loaded into module constants.
+
+The metadata is loaded lazily on first access, through compiled indexes which only
+decode the entries actually looked up. See :obj:`.metadata_index`.
+"""
 import pathlib
+from typing import Any, Dict
 
-# Load metadata into dictionaries
+from neoscore.core.metadata_index import MetadataIndex, load_json_index
 
 _SMUFL_DIR = pathlib.Path(__file__).parent / ".." / "resources" / "smufl"
 
-classes: dict
+classes: MetadataIndex
 """The raw SMuFL ``classes.json`` metadata.
 
 See https://w3c.github.io/smufl/latest/specification/classes.html
@@ -14,7 +18,7 @@ See https://w3c.github.io/smufl/latest/specification/classes.html
 :meta hide-value:
 """
 
-glyph_names: dict
+glyph_names: MetadataIndex
 """The raw SMuFL ``glyphnames.json`` metadata.
 
 See https://w3c.github.io/smufl/latest/specification/glyphnames.html
@@ -22,7 +26,7 @@ See https://w3c.github.io/smufl/latest/specification/glyphnames.html
 :meta hide-value:
 """
 
-ranges: dict
+ranges: MetadataIndex
 """The raw SMuFL ``ranges.json`` metadata.
 
 See https://w3c.github.io/smufl/latest/specification/ranges.html
@@ -30,11 +34,17 @@ See https://w3c.github.io/smufl/latest/specification/ranges.html
 :meta hide-value:
 """
 
-with open(_SMUFL_DIR / "classes.json", "r") as classes_file:
-    classes = json.load(classes_file)
+_METADATA_FILES: Dict[str, str] = {
+    "classes": "classes.json",
+    "glyph_names": "glyphnames.json",
+    "ranges": "ranges.json",
+}
 
-with open(_SMUFL_DIR / "glyphnames.json", "r") as glyphnames_file:
-    glyph_names = json.load(glyphnames_file)
 
-with open(_SMUFL_DIR / "ranges.json", "r") as ranges_file:
-    ranges = json.load(ranges_file)
+def __getattr__(name: str) -> Any:
+    file_name = _METADATA_FILES.get(name)
+    if file_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = load_json_index(_SMUFL_DIR / file_name)
+    globals()[name] = value
+    return value
@@ -37,6 +37,8 @@ class Spanner:
         """
         self._end_x = end_x
         self._end_parent = end_parent
+        if end_parent is not self:
+            end_parent._add_render_dependent(cast(PositionedObject, self))
 
     @property
     def end_x(self) -> Unit:
@@ -46,6 +48,7 @@ class Spanner:
     @end_x.setter
     def end_x(self, value: Unit):
         self._end_x = value
+        cast(PositionedObject, self)._mark_dirty()
 
     @render_cached_property
     def end_y(self) -> Unit:
@@ -67,7 +70,12 @@ class Spanner:
 
     @end_parent.setter
     def end_parent(self, value: PositionedObject):
+        if self._end_parent is not self:
+            self._end_parent._remove_render_dependent(cast(PositionedObject, self))
         self._end_parent = value
+        if value is not self:
+            value._add_render_dependent(cast(PositionedObject, self))
+        cast(PositionedObject, self)._mark_dirty()
 
     @render_cached_property
     def spanner_x_length(self) -> Unit:
@@ -32,6 +32,7 @@ class Spanner2D(Spanner):
     @end_y.setter
     def end_y(self, value: Unit):
         self._end_y = value
+        cast(PositionedObject, self)._mark_dirty()
 
     @property
     def end_pos(self) -> Point:
@@ -42,6 +43,7 @@ class Spanner2D(Spanner):
         value = Point.from_def(value)
         self._end_x = value.x
         self._end_y = value.y
+        cast(PositionedObject, self)._mark_dirty()
 
     @render_cached_property
     def spanner_2d_length(self) -> Unit:
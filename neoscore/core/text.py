@@ -9,7 +9,10 @@ from neoscore.core.layout_controllers import NewLine
 from neoscore.core.painted_object import PaintedObject
 from neoscore.core.pen import Pen, PenDef
 from neoscore.core.point import ORIGIN, Point, PointDef
-from neoscore.core.positioned_object import PositionedObject, render_cached_property
+from neoscore.core.positioned_object import (
+    PositionedObject,
+    persistent_cached_property,
+)
 from neoscore.core.rect import Rect
 from neoscore.core.text_alignment import AlignmentX, AlignmentY
 from neoscore.core.units import ZERO, Unit
@@ -91,6 +94,7 @@ class Text(PaintedObject):
     @text.setter
     def text(self, value: str):
         self._text = value
+        self._mark_dirty()
 
     @property
     def font(self) -> Font:
@@ -99,6 +103,7 @@ class Text(PaintedObject):
     @font.setter
     def font(self, value: Font):
         self._font = value
+        self._mark_dirty()
 
     @property
     def background_brush(self) -> Optional[Brush]:
@@ -111,6 +116,7 @@ class Text(PaintedObject):
             self._background_brush = Brush.from_def(value)
         else:
             self._background_brush = None
+        self._mark_dirty()
 
     @property
     def breakable(self) -> bool:
@@ -120,6 +126,7 @@ class Text(PaintedObject):
     @breakable.setter
     def breakable(self, value: bool):
         self._breakable = value
+        self._mark_dirty()
 
     @property
     def alignment_x(self) -> AlignmentX:
@@ -133,6 +140,7 @@ class Text(PaintedObject):
     @alignment_x.setter
     def alignment_x(self, value: AlignmentX):
         self._alignment_x = value
+        self._mark_dirty()
 
     @property
     def alignment_y(self) -> AlignmentY:
@@ -142,8 +150,9 @@ class Text(PaintedObject):
     @alignment_y.setter
     def alignment_y(self, value: AlignmentY):
         self._alignment_y = value
+        self._mark_dirty()
 
-    @render_cached_property
+    @persistent_cached_property
     def _alignment_offset(self) -> Point:
         if (
             self.alignment_x == AlignmentX.LEFT
@@ -161,12 +170,12 @@ class Text(PaintedObject):
             y = (bounding_rect.height / -2) - bounding_rect.y
         return Point(x, y)
 
-    @render_cached_property
+    @persistent_cached_property
     def _raw_scaled_bounding_rect(self) -> Rect:
         """The text bounding rect without centering adjustment"""
         return self.font.bounding_rect_of(self.text) * self.scale
 
-    @render_cached_property
+    @persistent_cached_property
     def bounding_rect(self) -> Rect:
         """The bounding rect for this text positioned relative to ``pos``.
 
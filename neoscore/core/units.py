@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import decimal
-from typing import Any, Optional, Type, TypeVar, Union, cast
+from typing import Any, Dict, Optional, Tuple, Type, TypeVar, Union, cast
 
 TUnit = TypeVar("TUnit", bound="Unit")
 
@@ -157,16 +157,28 @@ ZERO = Unit(0)
 """Shorthand for a zero unit"""
 
 
+_UNIT_CLASSES: Dict[Tuple[str, float], Type[Unit]] = {}
+
+
 def make_unit_class(name: str, conversion_rate: float) -> Type[Unit]:
-    """Create a ``Unit`` subclass with a name and base unit conversion rate"""
-    return cast(
-        Type[Unit],
-        type(
-            name,
-            (Unit,),
-            {"CONVERSION_RATE": conversion_rate},
-        ),
-    )
+    """Create a ``Unit`` subclass with a name and base unit conversion rate
+
+    Classes are reused, so requesting the same name and rate again gives the same
+    class. This lets objects keyed by unit classes, like music fonts, be shared.
+    """
+    key = (name, conversion_rate)
+    unit_class = _UNIT_CLASSES.get(key)
+    if unit_class is None:
+        unit_class = cast(
+            Type[Unit],
+            type(
+                name,
+                (Unit,),
+                {"CONVERSION_RATE": conversion_rate},
+            ),
+        )
+        _UNIT_CLASSES[key] = unit_class
+    return unit_class
 
 
 def _convert_all_to_unit_out_of_place(
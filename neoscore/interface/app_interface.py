@@ -1,34 +1,82 @@
 from __future__ import annotations
 
+import ctypes
+import hashlib
+import math
 import multiprocessing
 import pathlib
+import queue
+import struct
+import sys
 import threading
-from typing import TYPE_CHECKING, Callable, List, Optional, Tuple
+import weakref
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
-from PyQt5 import QtGui, QtCore
-from PyQt5.QtCore import QBuffer, QByteArray, QIODevice, QPoint, QRectF
+from PyQt5 import QtGui, QtCore, sip
+from PyQt5.QtCore import (
+    QBuffer,
+    QByteArray,
+    QDataStream,
+    QIODevice,
+    QMarginsF,
+    QPoint,
+    QRect,
+    QRectF,
+    QSizeF,
+)
 from PyQt5.QtGui import (
     QBitmap,
     QColor,
     QFontDatabase,
     QImage,
+    QPageSize,
     QPainter,
+    QPdfWriter,
     QPixmapCache,
     QRegion,
+    QTransform,
+)
+from PyQt5.QtSvg import QGraphicsSvgItem
+from PyQt5.QtWidgets import (
+    QApplication,
+    QGraphicsItem,
+    QGraphicsPathItem,
+    QGraphicsPixmapItem,
+    QGraphicsScene,
+    QGraphicsSimpleTextItem,
+    QGraphicsTextItem,
+    QStyleOptionGraphicsItem,
 )
-from PyQt5.QtWidgets import QApplication, QGraphicsScene, QGraphicsItem
 
 
 from neoscore.core import env, math_helpers
 from neoscore.core.color import Color
 from neoscore.core.exceptions import FontRegistrationError, ImageExportError
+from neoscore.core.export_cache import ExportCache
 from neoscore.core.key_event import KeyEvent
 from neoscore.core.mouse_event import MouseEvent
 from neoscore.core.point import Point
 from neoscore.core.propagating_thread import PropagatingThread
 from neoscore.core.rect import Rect, RectDef
 from neoscore.core.units import Inch, Mm
+from neoscore.interface import text_metrics_cache
 from neoscore.interface.brush_interface import BrushInterface
+from neoscore.interface.png_writer import PngWriter
 from neoscore.interface.qt import file_paths
 from neoscore.interface.qt.converters import (
     color_to_q_color,
@@ -36,16 +84,39 @@ from neoscore.interface.qt.converters import (
     rect_to_qt_rect_f,
 )
 from neoscore.interface.qt.main_window import MainWindow
+from neoscore.interface.qt.q_clipping_path import QClippingPath
 from neoscore.interface.qt.viewport import Viewport
+from neoscore.interface.raster_pdf_writer import RasterPdfWriter
 from neoscore.interface.repl import running_in_ipython_gui_repl
+from neoscore.interface.svg_writer import SvgWriter
 
 if TYPE_CHECKING:
     from neoscore.core.document import Document
+    from neoscore.interface.positioned_object_interface import (
+        PositionedObjectInterface,
+    )
 
 _RENDER_IMAGE_THREAD_MAX = multiprocessing.cpu_count()
 _INCHES_PER_METER: float = Inch(1) / Mm(1000)
 _QT_PIXMAP_CACHE_LIMIT_KB = 200_000
 
+_THREAD_SAFE_ITEM_TYPES = (QGraphicsPathItem, QGraphicsPixmapItem)
+"""Item types which can be painted from multiple threads at once."""
+
+_CAN_FORK_RENDER_WORKERS = sys.platform.startswith("linux")
+"""Whether render worker processes can be forked from this one.
+
+Forking a process with a running Qt application is only safe on Linux. Elsewhere,
+like on macOS where system frameworks don't survive forking, it can crash or hang.
+"""
+
+_forked_render_job: Optional[Callable[[int], Any]] = None
+"""The job run by forked render worker processes, set while they run."""
+
+
+def _run_forked_render_job(index: int) -> Any:
+    return _forked_render_job(index)
+
 
 class AppInterface:
     """The primary interface to the application state.
@@ -78,9 +149,37 @@ class AppInterface:
         self.render_image_thread_semaphore = threading.Semaphore(
             _RENDER_IMAGE_THREAD_MAX
         )
+        self._render_image_threads: weakref.WeakSet[
+            PropagatingThread
+        ] = weakref.WeakSet()
         self._viewport_rotation = 0
-    
- 
+        self._retired_qt_objects: Dict[
+            Hashable, List[Tuple[PositionedObjectInterface, QGraphicsItem]]
+        ] = {}
+        # The scenes and retired objects of documents other than the current one
+        self._inactive_document_scenes: weakref.WeakKeyDictionary[
+            Document, Tuple[QGraphicsScene, Dict]
+        ] = weakref.WeakKeyDictionary()
+
+    def set_document(self, document: Document):
+        """Make a document the one rendered, exported, and shown.
+
+        Every document has its own scene, which is kept while other documents are
+        current, so switching back and forth doesn't require rebuilding anything.
+        """
+        if document is self.document:
+            return
+        self._inactive_document_scenes[self.document] = (
+            self.scene,
+            self._retired_qt_objects,
+        )
+        scene_state = self._inactive_document_scenes.pop(document, None)
+        if scene_state is None:
+            scene_state = (QGraphicsScene(), {})
+        self.document = document
+        self.scene, self._retired_qt_objects = scene_state
+        self.scene.setBackgroundBrush(self._background_brush.qt_object)
+        self.view.setScene(self.scene)
 
     def set_refresh_func(self, refresh_func: Callable[[float], float]):
         """Set a function to run automatically on a timer in the main window."""
@@ -94,6 +193,12 @@ class AppInterface:
         """Set a function to run on keyboard input events."""
         self.main_window.graphicsView.key_event_handler = handler
 
+    def clear_handlers(self):
+        """Remove any refresh function and input event handlers."""
+        self.main_window.refresh_func = None
+        self.main_window.graphicsView.mouse_event_handler = None
+        self.main_window.graphicsView.key_event_handler = None
+
     def show(
         self,
         min_size: Optional[Tuple[int, int]] = None,
@@ -127,6 +232,9 @@ class AppInterface:
         bg_color: Color,
         autocrop: bool,
         preserve_alpha: bool,
+        tile_height: Optional[int] = None,
+        bands: int = 1,
+        vector_autocrop: bool = False,
     ) -> PropagatingThread:
         """Render the scene, or part of it, to a saved image.
 
@@ -151,17 +259,273 @@ class AppInterface:
                 ``bg_color``.
             preserve_alpha: Whether to preserve the alpha channel. If false,
                 some non-transparent ``bg_color`` should be provided.
+            tile_height: If given, the image is painted in strips of this many
+                pixel rows, which are streamed into a PNG encoder as they are
+                painted. This bounds memory use by the strip size rather than the
+                image size. The output format must be PNG, and ``autocrop`` and
+                ``quality`` are not supported.
+            bands: The number of horizontal bands to split the image into, which
+                are painted concurrently on separate threads. This does not apply
+                when ``tile_height`` is given.
+            vector_autocrop: If true, ``autocrop`` crops to the bounding rects
+                of the items in ``rect`` before painting, instead of scanning the
+                painted image. This is much faster, especially at high resolutions,
+                but may leave small margins around item shapes which don't fill
+                their bounding rects.
 
         Raises:
             ImageExportError: If Qt image export fails for unknown reasons.
 
+        """
+        q_bg_color = color_to_q_color(bg_color)
+        crop_to_contents = autocrop and vector_autocrop
+        if crop_to_contents:
+            autocrop = False
+        if tile_height:
+            return self._render_image_tiled(
+                rect,
+                dest,
+                dpi,
+                q_bg_color,
+                preserve_alpha,
+                tile_height,
+                crop_to_contents,
+            )
+        q_image = self._paint_image(
+            rect, dpi, q_bg_color, preserve_alpha, bands, crop_to_contents
+        )
+
+        def finalize():
+            with self.render_image_thread_semaphore:
+                AppInterface._save_image(q_image, dest, quality, q_bg_color, autocrop)
+
+        thread = PropagatingThread(target=finalize)
+        thread.start()
+        self._render_image_threads.add(thread)
+        return thread
+
+    def _render_image_tiled(
+        self,
+        rect: Optional[RectDef],
+        dest: str | pathlib.Path | bytearray,
+        dpi: int,
+        q_bg_color: QColor,
+        preserve_alpha: bool,
+        tile_height: int,
+        crop_to_contents: bool,
+    ) -> PropagatingThread:
+        """Render an image in strips, streaming them to a PNG on a spawned thread.
+
+        Strips are handed to the encoding thread through a small queue, so at most
+        a few strips are held in memory at once.
         """
         dpm = AppInterface._dpi_to_dpm(dpi)
         scale = dpm / Mm(1000).base_value
+        source_rect = self._source_rect(rect, crop_to_contents)
+        pix_width = int(source_rect.width() * scale)
+        pix_height = int(source_rect.height() * scale)
+        if preserve_alpha:
+            q_image_format = QImage.Format_RGBA8888
+        else:
+            q_image_format = QImage.Format_RGB888
+        strips: queue.Queue[Optional[bytes]] = queue.Queue(maxsize=2)
+
+        def write_strips(write: Callable[[bytes], Any]):
+            writer = PngWriter(write, pix_width, pix_height, preserve_alpha, dpm)
+            for rows in iter(strips.get, None):
+                writer.write_rows(rows)
+            writer.close()
+
+        def finalize():
+            with self.render_image_thread_semaphore:
+                try:
+                    if isinstance(dest, bytearray):
+                        dest.clear()
+                        write_strips(dest.extend)
+                    else:
+                        with open(file_paths.resolve_qt_path(dest), "wb") as f:
+                            write_strips(f.write)
+                except Exception:
+                    # Keep consuming so the painting thread isn't blocked forever
+                    for _ in iter(strips.get, None):
+                        pass
+                    raise
+
+        thread = PropagatingThread(target=finalize)
+        thread.start()
+        self._render_image_threads.add(thread)
+        # Item caches hold whole items at device resolution, which would defeat
+        # the memory bound, and cached items can shift between strips.
+        with self._items_uncached():
+            for strip_y in range(0, pix_height, tile_height):
+                q_image = self._paint_strip(
+                    source_rect,
+                    scale,
+                    pix_width,
+                    strip_y,
+                    min(tile_height, pix_height - strip_y),
+                    q_image_format,
+                    dpm,
+                    q_bg_color,
+                )
+                strips.put(AppInterface._png_rows(q_image))
+        strips.put(None)
+        return thread
+
+    @staticmethod
+    def _png_rows(q_image: QImage) -> bytes:
+        """Get an RGB888 or RGBA8888 image's pixels as unfiltered PNG rows."""
+        bits = q_image.constBits()
+        bits.setsize(q_image.sizeInBytes())
+        data = bytes(bits)
+        bytes_per_line = q_image.bytesPerLine()
+        row_length = q_image.width() * (q_image.depth() // 8)
+        return b"".join(
+            b"\x00" + data[start : start + row_length]
+            for start in range(0, bytes_per_line * q_image.height(), bytes_per_line)
+        )
+
+    def render_images(
+        self,
+        jobs: List[Tuple[Optional[RectDef], str | pathlib.Path | bytearray]],
+        dpi: int,
+        quality: int,
+        bg_color: Color,
+        autocrop: bool,
+        preserve_alpha: bool,
+        processes: Optional[int] = None,
+        vector_autocrop: bool = False,
+    ):
+        """Render several parts of the scene to images in parallel processes.
+
+        Worker processes are forked from this one, so each inherits the rendered
+        scene copy-on-write, and the jobs are split between them. Each worker
+        paints and encodes its own images. Images saved to files are written by
+        the workers, while bytearray destinations are filled in this process.
+
+        Forking is only done on Linux. Elsewhere, or where only one process would
+        be used, the images are rendered one at a time in this process.
+
+        Args:
+            jobs: ``(rect, dest)`` pairs, with each argument working like the
+                corresponding ``render_image`` argument.
+            dpi: The pixels per inch of the rendered images.
+            quality: The quality of the output images for compressed image formats.
+            bg_color: The background color for the images.
+            autocrop: Whether to crop each image to tightly fit its contents.
+            preserve_alpha: Whether to preserve the alpha channel.
+            processes: The number of worker processes to use. Defaults to the
+                number of CPUs.
+            vector_autocrop: Whether ``autocrop`` crops to item bounding rects
+                before painting, as in ``render_image``.
+
+        Raises:
+            ImageExportError: If Qt image export fails for unknown reasons.
+        """
+        q_bg_color = color_to_q_color(bg_color)
+        crop_to_contents = autocrop and vector_autocrop
+        if crop_to_contents:
+            autocrop = False
+
+        def render_job(index: int) -> Optional[bytes]:
+            rect, dest = jobs[index]
+            q_image = self._paint_image(
+                rect, dpi, q_bg_color, preserve_alpha, crop_to_contents=crop_to_contents
+            )
+            if isinstance(dest, bytearray):
+                output = bytearray()
+                AppInterface._save_image(
+                    q_image, output, quality, q_bg_color, autocrop
+                )
+                return bytes(output)
+            AppInterface._save_image(q_image, dest, quality, q_bg_color, autocrop)
+            return None
+
+        results = self._map_in_forked_processes(
+            render_job, range(len(jobs)), processes
+        )
+        for (_, dest), result in zip(jobs, results):
+            if isinstance(dest, bytearray):
+                dest.clear()
+                dest.extend(result)
+
+    def _map_in_forked_processes(
+        self,
+        job: Callable[[int], Any],
+        indices: Sequence[int],
+        processes: Optional[int],
+    ) -> Iterator[Any]:
+        """Run ``job`` on each index in worker processes, yielding results in order.
+
+        Workers are forked from this process, so they inherit the rendered scene
+        copy-on-write. Results are yielded as soon as they are ready, so callers
+        can consume them without holding every result in memory. Where forking
+        isn't safe (see ``_CAN_FORK_RENDER_WORKERS``) or only one process would be
+        used, jobs are run one at a time in this process as results are requested.
+        """
+        global _forked_render_job
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        processes = min(processes, len(indices))
+        if processes <= 1 or not _CAN_FORK_RENDER_WORKERS:
+            for index in indices:
+                yield job(index)
+            return
+        # Threads saving earlier images may hold locks, which forked workers would
+        # inherit in their locked state. Their errors are left to their callers.
+        for thread in list(self._render_image_threads):
+            threading.Thread.join(thread)
+        # Workers find the job through this global, which they inherit on fork
+        _forked_render_job = job
+        try:
+            with multiprocessing.get_context("fork").Pool(processes) as pool:
+                yield from pool.imap(_run_forked_render_job, indices)
+        finally:
+            _forked_render_job = None
+
+    def _source_rect(
+        self, rect: Optional[RectDef], crop_to_contents: bool = False
+    ) -> QRectF:
+        """Get the scene area covered by a render of ``rect``.
+
+        A ``rect`` of ``None`` covers the whole scene.
+
+        If ``crop_to_contents`` is true, the area is shrunk to the bounding rect of
+        the visible items in it. If there are none, the area is not shrunk.
+        """
         if rect:
             source_rect = rect_to_qt_rect_f(Rect.from_def(rect))
         else:
             source_rect = self.scene.sceneRect()
+        if not crop_to_contents:
+            return source_rect
+        contents_rect = QRectF()
+        for item in self.scene.items(source_rect, QtCore.Qt.IntersectsItemBoundingRect):
+            if item.isVisible():
+                contents_rect |= item.sceneBoundingRect()
+        contents_rect &= source_rect
+        return contents_rect if contents_rect.isValid() else source_rect
+
+    def _paint_image(
+        self,
+        rect: Optional[RectDef],
+        dpi: int,
+        q_bg_color: QColor,
+        preserve_alpha: bool,
+        bands: int = 1,
+        crop_to_contents: bool = False,
+    ) -> QImage:
+        """Paint the scene, or part of it, to a new image.
+
+        If ``bands`` is more than 1, the image is split into that many horizontal
+        bands which are painted concurrently and then stitched together.
+
+        If ``crop_to_contents`` is true, only the part of ``rect`` covered by
+        items is painted. See ``_source_rect``.
+        """
+        dpm = AppInterface._dpi_to_dpm(dpi)
+        scale = dpm / Mm(1000).base_value
+        source_rect = self._source_rect(rect, crop_to_contents)
         pix_width = int(source_rect.width() * scale)
         pix_height = int(source_rect.height() * scale)
 
@@ -170,12 +534,27 @@ class AppInterface:
         else:
             q_image_format = QImage.Format_RGB32
 
+        if bands > 1 and pix_height > 1:
+            return self._paint_image_in_bands(
+                source_rect,
+                scale,
+                pix_width,
+                pix_height,
+                q_image_format,
+                dpm,
+                q_bg_color,
+                bands,
+            )
+
         q_image = QImage(pix_width, pix_height, q_image_format)
         q_image.setDotsPerMeterX(dpm)
         q_image.setDotsPerMeterY(dpm)
-        q_bg_color = color_to_q_color(bg_color)
         q_image.fill(q_bg_color)
+        self._render_scene_to_image(q_image, source_rect)
+        return q_image
 
+    def _render_scene_to_image(self, q_image: QImage, source_rect: QRectF):
+        """Paint part of the scene over the whole of an existing image."""
         painter = QPainter()
         painter.begin(q_image)
         painter.setRenderHint(QPainter.Antialiasing)
@@ -185,41 +564,723 @@ class AppInterface:
         self.scene.render(painter, target=target_rect, source=source_rect)
         painter.end()
 
-        def finalize():
-            with self.render_image_thread_semaphore:
-                final_image = (
-                    AppInterface._autocrop(q_image, q_bg_color) if autocrop else q_image
+    def render_image_pyramid(
+        self,
+        rect: Optional[RectDef],
+        levels: List[Tuple[int, str | pathlib.Path | bytearray]],
+        quality: int,
+        bg_color: Color,
+        preserve_alpha: bool,
+    ):
+        """Render the scene, or part of it, to images at several resolutions.
+
+        The scene is painted once, at the highest requested resolution, and each
+        lower resolution is derived from that by downsampling. Downsampling and
+        saving run on a thread pool.
+
+        Args:
+            rect: The part of the document to render, in document coordinates.
+                If ``None``, the entire scene will be rendered.
+            levels: ``(dpi, dest)`` pairs giving each image's resolution and where
+                to save it, as in ``render_image``.
+            quality: The quality of the output images for compressed image formats.
+            bg_color: The background color for the images.
+            preserve_alpha: Whether to preserve the alpha channel.
+
+        Raises:
+            ImageExportError: If Qt image export fails for unknown reasons.
+        """
+        if not levels:
+            return
+        q_bg_color = color_to_q_color(bg_color)
+        source_rect = self._source_rect(rect)
+        max_dpi = max(dpi for dpi, _ in levels)
+        q_image = self._paint_image(rect, max_dpi, q_bg_color, preserve_alpha)
+
+        def save_level(level: Tuple[int, str | pathlib.Path | bytearray]):
+            dpi, dest = level
+            if dpi == max_dpi:
+                level_image = q_image
+            else:
+                dpm = AppInterface._dpi_to_dpm(dpi)
+                scale = dpm / Mm(1000).base_value
+                level_image = AppInterface._downsample(
+                    q_image,
+                    int(source_rect.width() * scale),
+                    int(source_rect.height() * scale),
                 )
-                if isinstance(dest, bytearray):
-                    output_array = QByteArray()
-                    qbuf = QBuffer(output_array)
-                    qbuf.open(QIODevice.OpenModeFlag.WriteOnly)
-                    success = final_image.save(qbuf, quality=quality, format="PNG")
-                    qbuf.close()
-                    dest.clear()
-                    dest.extend(output_array)
-                else:
-                    success = final_image.save(
-                        file_paths.resolve_qt_path(dest), quality=quality
-                    )
-                if not success:
-                    dest_description = (
-                        "bytearray" if isinstance(dest, bytearray) else dest
+                level_image.setDotsPerMeterX(dpm)
+                level_image.setDotsPerMeterY(dpm)
+            AppInterface._save_image(level_image, dest, quality, q_bg_color, False)
+
+        with ThreadPoolExecutor(_RENDER_IMAGE_THREAD_MAX) as executor:
+            # Consume results to propagate exceptions
+            list(executor.map(save_level, levels))
+
+    def render_deep_zoom(
+        self,
+        rect: Optional[RectDef],
+        dest: str | pathlib.Path,
+        dpi: int,
+        bg_color: Color,
+        preserve_alpha: bool,
+        tile_size: int,
+        overlap: int,
+        tile_format: str,
+    ):
+        """Render the scene, or part of it, to a Deep Zoom image tile pyramid.
+
+        This writes a ``.dzi`` descriptor to ``dest``, and the tiles of every level
+        in a ``<name>_files`` directory next to it, as used by web viewers like
+        OpenSeadragon. Level ``n`` has a size of ``ceil(full_size / 2 ** (max_level
+        - n))``, and its tiles are saved as ``<name>_files/<n>/<column>_<row>``.
+
+        The scene is painted once at ``dpi`` for the most detailed level, and each
+        other level is downsampled from the one above it. Tiles are cut and saved
+        on a thread pool.
+
+        Args:
+            rect: The part of the document to render, in document coordinates.
+                If ``None``, the entire scene will be rendered.
+            dest: The path of the ``.dzi`` file to write.
+            dpi: The pixels per inch of the most detailed level.
+            bg_color: The background color for the tiles.
+            preserve_alpha: Whether to preserve the alpha channel.
+            tile_size: The width and height of tiles, not including overlap.
+            overlap: The number of pixels tiles overlap their neighbors by.
+            tile_format: The image file extension to save tiles in, like ``"png"``.
+
+        Raises:
+            ImageExportError: If Qt image export fails for unknown reasons.
+        """
+        dest = pathlib.Path(dest)
+        tiles_dir = dest.with_name(dest.stem + "_files")
+        q_bg_color = color_to_q_color(bg_color)
+        q_image = self._paint_image(rect, dpi, q_bg_color, preserve_alpha)
+        width = q_image.width()
+        height = q_image.height()
+        max_level = math.ceil(math.log2(max(width, height, 1)))
+        dest.write_text(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            + '<Image xmlns="http://schemas.microsoft.com/deepzoom/2008"'
+            + f' Format="{tile_format}" Overlap="{overlap}" TileSize="{tile_size}">\n'
+            + f'  <Size Width="{width}" Height="{height}"/>\n'
+            + "</Image>\n"
+        )
+
+        def save_tile(level_image: QImage, path: pathlib.Path, tile_rect: QRect):
+            AppInterface._save_image(
+                level_image.copy(tile_rect), path, -1, q_bg_color, False
+            )
+
+        with ThreadPoolExecutor(_RENDER_IMAGE_THREAD_MAX) as executor:
+            futures = []
+            level_image = q_image
+            for level in range(max_level, -1, -1):
+                if level != max_level:
+                    level_image = AppInterface._downsample(
+                        level_image,
+                        math.ceil(level_image.width() / 2),
+                        math.ceil(level_image.height() / 2),
                     )
+                level_dir = tiles_dir / str(level)
+                level_dir.mkdir(parents=True, exist_ok=True)
+                columns = math.ceil(level_image.width() / tile_size)
+                rows = math.ceil(level_image.height() / tile_size)
+                for column in range(columns):
+                    for row in range(rows):
+                        x = column * tile_size - (overlap if column else 0)
+                        y = row * tile_size - (overlap if row else 0)
+                        tile_rect = QRect(
+                            x,
+                            y,
+                            tile_size + (overlap if column else 0) + overlap,
+                            tile_size + (overlap if row else 0) + overlap,
+                        ).intersected(level_image.rect())
+                        futures.append(
+                            executor.submit(
+                                save_tile,
+                                level_image,
+                                level_dir / f"{column}_{row}.{tile_format}",
+                                tile_rect,
+                            )
+                        )
+            for future in futures:
+                # Propagate exceptions
+                future.result()
+
+    @staticmethod
+    def _downsample(q_image: QImage, width: int, height: int) -> QImage:
+        """Smoothly scale an image down to a given size.
+
+        Large reductions are made in steps of halving the image size, which avoids
+        the aliasing of a single bilinear scale.
+        """
+        while q_image.width() >= width * 2 and q_image.height() >= height * 2:
+            q_image = q_image.scaled(
+                q_image.width() // 2,
+                q_image.height() // 2,
+                QtCore.Qt.IgnoreAspectRatio,
+                QtCore.Qt.SmoothTransformation,
+            )
+        return q_image.scaled(
+            width,
+            height,
+            QtCore.Qt.IgnoreAspectRatio,
+            QtCore.Qt.SmoothTransformation,
+        )
+
+    def content_hash(self, rect: Optional[RectDef], *params: Any) -> Optional[str]:
+        """Compute a stable hash of everything painted in part of the scene.
+
+        The hash covers the scene background and every visible item in ``rect``,
+        including item transforms, paths, pens, brushes, clipping, and images, as
+        well as the Qt version. Renders of equal hashes paint identical images, even
+        across runs, so the hash is suitable as a persistent cache key.
+
+        Args:
+            rect: The part of the document to hash, in document coordinates.
+                If ``None``, the entire scene is hashed.
+            *params: Any other values affecting the output, like resolutions or
+                formats. These must have stable ``repr`` strings.
+
+        Returns:
+            A hex digest, or ``None`` if the region has items which can't be
+            hashed.
+        """
+        source_rect = self._source_rect(rect)
+        digest = hashlib.sha256()
+        digest.update(
+            repr(
+                (
+                    QtCore.QT_VERSION_STR,
+                    source_rect.getRect(),
+                )
+                + params
+            ).encode("utf-8")
+        )
+        data = QByteArray()
+        stream = QDataStream(data, QIODevice.WriteOnly)
+        stream << self.scene.backgroundBrush()
+        for item in self.scene.items(
+            source_rect,
+            QtCore.Qt.IntersectsItemBoundingRect,
+            QtCore.Qt.AscendingOrder,
+        ):
+            if not item.isVisible():
+                continue
+            stream.writeQString(type(item).__name__)
+            stream << item.sceneTransform()
+            stream.writeDouble(item.effectiveOpacity())
+            if isinstance(item, QClippingPath):
+                stream << item.path() << item.pen() << item.brush()
+                stream.writeDouble(item.clip_start_x)
+                stream.writeDouble(-1 if item.clip_width is None else item.clip_width)
+                if item.background_brush:
+                    stream << item.background_brush
+            elif isinstance(item, QGraphicsPixmapItem):
+                q_image = item.pixmap().toImage()
+                bits = q_image.constBits()
+                bits.setsize(q_image.sizeInBytes())
+                stream.writeQString(f"{q_image.width()}x{q_image.height()}")
+                digest.update(bytes(bits))
+            elif isinstance(item, QGraphicsSvgItem):
+                source_path = getattr(item, "source_path", None)
+                if source_path is None:
+                    return None
+                digest.update(pathlib.Path(source_path).read_bytes())
+            elif isinstance(item, QGraphicsTextItem):
+                stream.writeQString(item.toHtml())
+                stream << item.font()
+                stream.writeDouble(item.textWidth())
+            elif isinstance(item, QGraphicsSimpleTextItem) and not item.text():
+                # Invisible objects
+                pass
+            else:
+                return None
+        digest.update(bytes(data))
+        return digest.hexdigest()
+
+    def render_to_buffer(
+        self,
+        rect: Optional[RectDef],
+        dpi: int,
+        bg_color: Color,
+        grayscale: bool,
+    ) -> memoryview:
+        """Render the scene, or part of it, to raw pixels in memory.
+
+        The scene is painted directly into the returned buffer, with no encoding or
+        copying. Pixels are in rows from top to bottom, and the buffer is shaped
+        ``(height, width, 4)`` for 8-bit RGBA pixels, or ``(height, width)`` for
+        8-bit grayscale pixels.
+
+        Args:
+            rect: The part of the document to render, in document coordinates.
+                If ``None``, the entire scene will be rendered.
+            dpi: The pixels per inch of the rendered image.
+            bg_color: The background color for the image.
+            grayscale: Whether to render grayscale pixels instead of RGBA.
+
+        Raises:
+            ValueError: If the rendered image would have no pixels.
+        """
+        dpm = AppInterface._dpi_to_dpm(dpi)
+        scale = dpm / Mm(1000).base_value
+        source_rect = self._source_rect(rect)
+        pix_width = int(source_rect.width() * scale)
+        pix_height = int(source_rect.height() * scale)
+        if pix_width <= 0 or pix_height <= 0:
+            raise ValueError(f"Rendering {rect} at {dpi} dpi gives an empty image")
+        if grayscale:
+            channels = 1
+            q_image_format = QImage.Format_Grayscale8
+        else:
+            channels = 4
+            q_image_format = QImage.Format_RGBA8888
+        buffer = bytearray(pix_width * pix_height * channels)
+        # Wrapping a raw address makes Qt paint into the buffer, where wrapping the
+        # buffer object itself would make Qt copy it on the first write.
+        address = ctypes.addressof(ctypes.c_char.from_buffer(buffer))
+        q_image = QImage(
+            sip.voidptr(address),
+            pix_width,
+            pix_height,
+            pix_width * channels,
+            q_image_format,
+        )
+        q_image.fill(color_to_q_color(bg_color))
+        self._render_scene_to_image(q_image, source_rect)
+        shape = (pix_height, pix_width, 4) if channels == 4 else (pix_height, pix_width)
+        return memoryview(buffer).cast("B", shape)
+
+    def _paint_image_in_bands(
+        self,
+        source_rect: QRectF,
+        scale: float,
+        pix_width: int,
+        pix_height: int,
+        q_image_format: QImage.Format,
+        dpm: int,
+        q_bg_color: QColor,
+        bands: int,
+    ) -> QImage:
+        """Paint an image in horizontal bands on a thread pool and stitch them.
+
+        ``QGraphicsScene.render`` can't run on several threads at once, since its
+        item index queries share state, so the items in each band are found here
+        and the threads paint them directly.
+        """
+        band_height = math.ceil(pix_height / bands)
+        band_ys = range(0, pix_height, band_height)
+        band_heights = [min(band_height, pix_height - band_y) for band_y in band_ys]
+        band_source_rects = [
+            QRectF(
+                source_rect.x(),
+                source_rect.y() + (band_y / scale),
+                pix_width / scale,
+                height / scale,
+            )
+            for band_y, height in zip(band_ys, band_heights)
+        ]
+        band_items = [
+            self.scene.items(
+                band_source_rect,
+                QtCore.Qt.IntersectsItemBoundingRect,
+                QtCore.Qt.AscendingOrder,
+            )
+            for band_source_rect in band_source_rects
+        ]
+        AppInterface._prepare_paths_for_threads(set().union(*band_items))
+        background_brush = self.scene.backgroundBrush()
+        other_items_lock = threading.Lock()
+
+        def paint_band(band: int) -> QImage:
+            band_source_rect = band_source_rects[band]
+            band_image = QImage(pix_width, band_heights[band], q_image_format)
+            band_image.fill(q_bg_color)
+            band_transform = QTransform.fromScale(scale, scale).translate(
+                -band_source_rect.x(), -band_source_rect.y()
+            )
+            painter = QPainter()
+            painter.begin(band_image)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setTransform(band_transform)
+            if background_brush.style() != QtCore.Qt.NoBrush:
+                painter.fillRect(band_source_rect, background_brush)
+            option = QStyleOptionGraphicsItem()
+            for item in band_items[band]:
+                if not item.isVisible():
+                    continue
+                painter.save()
+                painter.setTransform(item.sceneTransform() * band_transform)
+                painter.setOpacity(item.effectiveOpacity())
+                option.exposedRect = item.boundingRect()
+                if isinstance(item, _THREAD_SAFE_ITEM_TYPES):
+                    item.paint(painter, option, None)
+                else:
+                    with other_items_lock:
+                        item.paint(painter, option, None)
+                painter.restore()
+            painter.end()
+            return band_image
+
+        # Item caches are pixmaps, which can only be used on the main thread
+        with self._items_uncached():
+            with ThreadPoolExecutor(bands) as executor:
+                band_images = list(executor.map(paint_band, range(len(band_ys))))
+        q_image = QImage(pix_width, pix_height, q_image_format)
+        q_image.setDotsPerMeterX(dpm)
+        q_image.setDotsPerMeterY(dpm)
+        painter = QPainter()
+        painter.begin(q_image)
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        for band_y, band_image in zip(band_ys, band_images):
+            painter.drawImage(0, band_y, band_image)
+        painter.end()
+        return q_image
+
+    @staticmethod
+    def _prepare_paths_for_threads(items: Iterable[QGraphicsItem]):
+        """Make painting items' shared paths safe from multiple threads.
+
+        Qt lazily caches a converted form of each path the first time it's painted,
+        which isn't safe to do concurrently for paths shared between items. This
+        paints each path once to a tiny image, so later painting only reads them.
+        """
+        q_image = QImage(1, 1, QImage.Format_ARGB32)
+        painter = QPainter()
+        painter.begin(q_image)
+        for item in items:
+            if isinstance(item, QGraphicsPathItem):
+                painter.drawPath(item.path())
+        painter.end()
+
+    def _paint_strip(
+        self,
+        source_rect: QRectF,
+        scale: float,
+        pix_width: int,
+        strip_y: int,
+        strip_height: int,
+        q_image_format: QImage.Format,
+        dpm: int,
+        q_bg_color: QColor,
+    ) -> QImage:
+        """Paint a horizontal strip of an image of ``source_rect`` to a new image.
+
+        Args:
+            source_rect: The part of the scene covered by the whole image.
+            scale: The number of pixels per scene unit.
+            pix_width: The width of the image in pixels.
+            strip_y: The top pixel row of the strip in the whole image.
+            strip_height: The height of the strip in pixels.
+            q_image_format: The format of the new image.
+            dpm: The resolution of the new image in dots per meter.
+            q_bg_color: The background color to fill the new image with.
+        """
+        q_image = QImage(pix_width, strip_height, q_image_format)
+        q_image.setDotsPerMeterX(dpm)
+        q_image.setDotsPerMeterY(dpm)
+        q_image.fill(q_bg_color)
+        painter = QPainter()
+        painter.begin(q_image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        self.scene.render(
+            painter,
+            target=QRectF(q_image.rect()),
+            source=QRectF(
+                source_rect.x(),
+                source_rect.y() + (strip_y / scale),
+                pix_width / scale,
+                strip_height / scale,
+            ),
+            mode=QtCore.Qt.IgnoreAspectRatio,
+        )
+        painter.end()
+        return q_image
+
+    @staticmethod
+    def _save_image(
+        q_image: QImage,
+        dest: str | pathlib.Path | bytearray,
+        quality: int,
+        q_bg_color: QColor,
+        autocrop: bool,
+    ):
+        """Optionally autocrop an image, then save it to a file or bytearray."""
+        final_image = (
+            AppInterface._autocrop(q_image, q_bg_color) if autocrop else q_image
+        )
+        if isinstance(dest, bytearray):
+            output_array = QByteArray()
+            qbuf = QBuffer(output_array)
+            qbuf.open(QIODevice.OpenModeFlag.WriteOnly)
+            success = final_image.save(qbuf, quality=quality, format="PNG")
+            qbuf.close()
+            dest.clear()
+            dest.extend(output_array)
+        else:
+            success = final_image.save(
+                file_paths.resolve_qt_path(dest), quality=quality
+            )
+        if not success:
+            dest_description = "bytearray" if isinstance(dest, bytearray) else dest
+            raise ImageExportError(
+                "Unknown error occurred when exporting image to " + dest_description
+            )
+
+    def render_pdf(
+        self,
+        page_rects: Iterable[RectDef],
+        dest: str | pathlib.Path,
+        dpi: int,
+        bg_color: Color,
+    ):
+        """Render parts of the scene to a vector PDF, one page per rect.
+
+        Pages are painted and written to ``dest`` one at a time, so memory use does
+        not grow with the number of pages. Each page is sized to match its rect.
+
+        Args:
+            page_rects: The parts of the document to render on each page,
+                in document coordinates.
+            dest: An output file path.
+            dpi: The resolution used for any raster content, like pixmap images.
+            bg_color: The background color for the pages. Fully transparent colors
+                leave the page background unpainted.
+
+        Raises:
+            ImageExportError: If Qt PDF export fails for unknown reasons.
+        """
+        # Cached items are painted from pixmaps, which would rasterize them
+        with self._items_uncached():
+            self._render_pdf_pages(page_rects, dest, dpi, bg_color)
+
+    def render_raster_pdf(
+        self,
+        page_rects: Iterable[RectDef],
+        dest: str | pathlib.Path,
+        dpi: int,
+        bg_color: Color,
+        grayscale: bool = False,
+        jpeg_quality: Optional[int] = None,
+        processes: Optional[int] = 1,
+        cache: Optional[ExportCache] = None,
+    ):
+        """Render parts of the scene to a PDF of page images, one page per rect.
+
+        Pages are painted and compressed one at a time, or in parallel worker
+        processes as in ``render_images`` if ``processes`` allows, and each is
+        appended to ``dest`` as soon as it is ready, in order. Only a few encoded
+        pages are held in memory at once, no matter how many pages there are.
+
+        Args:
+            page_rects: The parts of the document to render on each page,
+                in document coordinates.
+            dest: An output file path.
+            dpi: The pixels per inch of the page images.
+            bg_color: The background color for the pages.
+            grayscale: Whether to store pages as 8-bit grayscale rather than RGB.
+                This is a third of the size for monochrome scores.
+            jpeg_quality: If given, pages are JPEG compressed at this quality
+                (between ``0`` and ``100``). Otherwise they are losslessly
+                compressed.
+            processes: The number of worker processes to use, or ``None`` for the
+                number of CPUs. Defaults to painting pages in this process.
+            cache: A cache of encoded pages. Pages found in it are copied
+                instead of painted, and newly painted pages are added to it.
+
+        Raises:
+            ImageExportError: If Qt image encoding fails for unknown reasons.
+        """
+        page_rects = list(page_rects)
+        q_bg_color = color_to_q_color(bg_color)
+        cache_keys = [
+            self.content_hash(
+                rect, "raster-pdf-page", dpi, repr(bg_color), grayscale, jpeg_quality
+            )
+            if cache
+            else None
+            for rect in page_rects
+        ]
+        uncached_pages = [
+            i for i, key in enumerate(cache_keys) if not (key and key in cache)
+        ]
+
+        def encode_page(index: int) -> bytes:
+            q_image = self._paint_image(page_rects[index], dpi, q_bg_color, False)
+            return AppInterface._encode_pdf_page(q_image, grayscale, jpeg_quality)
+
+        encoded_pages = self._map_in_forked_processes(
+            encode_page, uncached_pages, processes
+        )
+        with closing(encoded_pages), open(file_paths.resolve_qt_path(dest), "wb") as f:
+            writer = RasterPdfWriter(f.write)
+            uncached_page_set = set(uncached_pages)
+            for i, (rect, key) in enumerate(zip(page_rects, cache_keys)):
+                if i in uncached_page_set:
+                    page = next(encoded_pages)
+                    if key:
+                        cache.put(key, page)
+                else:
+                    page = cache.get(key)
+                    if page is None:
+                        # Evicted since it was checked
+                        page = encode_page(i)
+                source_rect = rect_to_qt_rect_f(Rect.from_def(rect))
+                pix_width, pix_height = struct.unpack_from(">II", page)
+                # Base units are points, matching PDF user space units
+                writer.add_page(
+                    source_rect.width(),
+                    source_rect.height(),
+                    pix_width,
+                    pix_height,
+                    grayscale,
+                    jpeg_quality is not None,
+                    page[8:],
+                )
+            writer.close()
+
+    @staticmethod
+    def _encode_pdf_page(
+        q_image: QImage, grayscale: bool, jpeg_quality: Optional[int]
+    ) -> bytes:
+        """Compress a page image for ``RasterPdfWriter``.
+
+        The result is the image's pixel dimensions packed as two big-endian 32-bit
+        integers, followed by the compressed image data.
+        """
+        q_image = q_image.convertToFormat(
+            QImage.Format_Grayscale8 if grayscale else QImage.Format_RGB888
+        )
+        header = struct.pack(">II", q_image.width(), q_image.height())
+        if jpeg_quality is not None:
+            data = QByteArray()
+            buffer = QBuffer(data)
+            buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+            success = q_image.save(buffer, "JPEG", jpeg_quality)
+            buffer.close()
+            if not success:
+                raise ImageExportError("Unknown error occurred when encoding JPEG")
+            return header + bytes(data)
+        bits = q_image.constBits()
+        bits.setsize(q_image.sizeInBytes())
+        pixels = bytes(bits)
+        bytes_per_line = q_image.bytesPerLine()
+        row_length = q_image.width() * (q_image.depth() // 8)
+        compressor = zlib.compressobj()
+        chunks = [header]
+        for start in range(0, bytes_per_line * q_image.height(), bytes_per_line):
+            chunks.append(compressor.compress(pixels[start : start + row_length]))
+        chunks.append(compressor.flush())
+        return b"".join(chunks)
+
+    @contextmanager
+    def _items_uncached(self) -> Iterator[None]:
+        """A context in which scene items are painted without their pixmap caches."""
+        cached_items = [
+            (item, item.cacheMode())
+            for item in self.scene.items()
+            if item.cacheMode() != QGraphicsItem.NoCache
+        ]
+        for item, _ in cached_items:
+            item.setCacheMode(QGraphicsItem.NoCache)
+        try:
+            yield
+        finally:
+            for item, cache_mode in cached_items:
+                item.setCacheMode(cache_mode)
+
+    def _render_pdf_pages(
+        self,
+        page_rects: Iterable[RectDef],
+        dest: str | pathlib.Path,
+        dpi: int,
+        bg_color: Color,
+    ):
+        writer = QPdfWriter(file_paths.resolve_qt_path(dest))
+        writer.setResolution(dpi)
+        writer.setCreator("neoscore")
+        q_bg_color = color_to_q_color(bg_color)
+        painter = QPainter()
+        for i, rect in enumerate(page_rects):
+            source_rect = rect_to_qt_rect_f(Rect.from_def(rect))
+            # Base units are points, matching `QPageSize.Point`
+            writer.setPageSize(
+                QPageSize(
+                    QSizeF(source_rect.width(), source_rect.height()),
+                    QPageSize.Point,
+                    "",
+                    QPageSize.ExactMatch,
+                )
+            )
+            writer.setPageMargins(QMarginsF(0, 0, 0, 0))
+            if i == 0:
+                if not painter.begin(writer):
                     raise ImageExportError(
-                        "Unknown error occurred when exporting image to "
-                        + dest_description
+                        f"Unknown error occurred when exporting PDF to {dest}"
                     )
+                painter.setRenderHint(QPainter.Antialiasing)
+            elif not writer.newPage():
+                painter.end()
+                raise ImageExportError(
+                    f"Unknown error occurred when exporting PDF to {dest}"
+                )
+            target_rect = QRectF(0, 0, writer.width(), writer.height())
+            if q_bg_color.alpha():
+                painter.fillRect(target_rect, q_bg_color)
+            self.scene.render(painter, target=target_rect, source=source_rect)
+        if painter.isActive():
+            painter.end()
 
-        thread = PropagatingThread(target=finalize)
-        thread.start()
-        return thread
+    def render_svg(
+        self,
+        rect: Optional[RectDef],
+        dest: str | pathlib.Path | bytearray,
+        bg_color: Color,
+    ):
+        """Render the scene, or part of it, to an SVG document.
+
+        Items are written directly as SVG elements, with each distinct path
+        (including each glyph) defined once and reused. See :obj:`.SvgWriter`.
+
+        Args:
+            rect: The part of the document to render, in document coordinates.
+                If ``None``, the entire scene will be rendered.
+            dest: An output file path or a bytearray to save to.
+            bg_color: The background color for the image. Fully transparent colors
+                leave the background unpainted.
+        """
+        source_rect = self._source_rect(rect)
+        items = self.scene.items(
+            source_rect,
+            QtCore.Qt.IntersectsItemBoundingRect,
+            QtCore.Qt.AscendingOrder,
+        )
+        if isinstance(dest, bytearray):
+            writer = SvgWriter(
+                lambda text: dest.extend(text.encode("utf-8")), source_rect
+            )
+            self._write_svg(writer, items, bg_color)
+        else:
+            with open(file_paths.resolve_qt_path(dest), "w", encoding="utf-8") as f:
+                self._write_svg(SvgWriter(f.write, source_rect), items, bg_color)
+
+    @staticmethod
+    def _write_svg(writer: SvgWriter, items: List[QGraphicsItem], bg_color: Color):
+        writer.begin(color_to_q_color(bg_color))
+        for item in items:
+            writer.write_item(item)
+        writer.end()
 
     def destroy(self):
         """Destroy the window and all global interface-level data."""
         self.app.exit()
         self.app = None
         self.scene = None
+        self._inactive_document_scenes.clear()
+        text_metrics_cache.save_all()
 
     def register_font(self, font_file_path: str | pathlib.Path) -> List[str]:
         """Register a font file with the graphics engine.
@@ -242,6 +1303,7 @@ class AppInterface:
         if not len(family_names):
             # I think this should be impossible, but log a warning just in case
             print(f"Warning: font at {font_file_path} provided no family names")
+        text_metrics_cache.register_font_file(font_file_path, family_names)
         return self.font_database.applicationFontFamilies(font_id)
 
     @property
@@ -319,14 +1381,47 @@ class AppInterface:
 
         This is primarily useful for testing purposes.
         """
+        text_metrics_cache.forget_font_files()
         success = self.font_database.removeAllApplicationFonts()
         if not success:
             raise RuntimeError("Failed to remove application fonts.")
 
     def clear_scene(self):
         """Clear the QT Scene. This should be called before each render."""
+        self._retired_qt_objects.clear()
         self.scene.clear()
 
+    def retire_qt_object(
+        self, key: Hashable, interface: PositionedObjectInterface, obj: QGraphicsItem
+    ):
+        """Make a rendered Qt object available for reuse by equivalent interfaces.
+
+        The object stays in the scene until :obj:`.remove_retired_qt_objects` is
+        called, unless :obj:`.reclaim_qt_object` hands it to a new interface first.
+        """
+        self._retired_qt_objects.setdefault(key, []).append((interface, obj))
+
+    def reclaim_qt_object(
+        self, key: Hashable
+    ) -> Optional[Tuple[PositionedObjectInterface, QGraphicsItem]]:
+        """Take a retired Qt object and the interface it was retired from, if any."""
+        candidates = self._retired_qt_objects.get(key)
+        while candidates:
+            interface, obj = candidates.pop()
+            if not sip.isdeleted(obj):
+                return interface, obj
+        return None
+
+    def remove_retired_qt_objects(self):
+        """Remove all retired Qt objects which weren't reused from the scene."""
+        for candidates in self._retired_qt_objects.values():
+            for _, obj in candidates:
+                if not sip.isdeleted(obj):
+                    scene = obj.scene()
+                    if scene is not None:
+                        scene.removeItem(obj)
+        self._retired_qt_objects.clear()
+
     def _optimize_for_interactive_view(self):
         QPixmapCache.setCacheLimit(_QT_PIXMAP_CACHE_LIMIT_KB)
         self.view.setViewportUpdateMode(3)  # NoViewportUpdate
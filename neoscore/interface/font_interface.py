@@ -6,7 +6,9 @@ from PyQt5 import QtGui
 from neoscore.core import neoscore
 from neoscore.core.rect import Rect
 from neoscore.core.units import Unit
+from neoscore.interface import text_metrics_cache
 from neoscore.interface.qt.converters import qt_rect_to_rect
+from neoscore.interface.text_metrics_cache import TextMetricsCache
 
 
 @dataclass(frozen=True)
@@ -72,4 +74,22 @@ class FontInterface:
         """Calculate the tight bounding rectangle around a string in this font."""
         # Qt warns that tightBoundingRect is very slow on Windows.
         # Maybe horizontalAdvance can be used instead?
-        return qt_rect_to_rect(self._qt_font_metrics_object.tightBoundingRect(text))
+        cache = self._text_metrics_cache()
+        if cache is None:
+            return qt_rect_to_rect(self._qt_font_metrics_object.tightBoundingRect(text))
+        font_size = self.qt_object.pixelSize()
+        qt_rect = cache.bounding_rect(text, font_size)
+        if qt_rect is None:
+            qt_rect = self._qt_font_metrics_object.tightBoundingRect(text)
+            cache.add_bounding_rect(text, font_size, qt_rect)
+        return qt_rect_to_rect(qt_rect)
+
+    def _text_metrics_cache(self) -> Optional[TextMetricsCache]:
+        """Get the persistent cache of text outlines and metrics in this font.
+
+        Returns ``None`` if there is none, including when Qt fell back to another
+        family because this one isn't available.
+        """
+        if self._qt_font_info_object.family() != self.family_name:
+            return None
+        return text_metrics_cache.for_face(self.family_name, self.weight, self.italic)
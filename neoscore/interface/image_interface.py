@@ -38,6 +38,8 @@ class ImageInterface(PositionedObjectInterface):
 
     def _create_svg_qt_object(self) -> QGraphicsSvgItem:
         qt_object = QGraphicsSvgItem(self._resolved_path)
+        # Kept for exporters which embed the original file
+        qt_object.source_path = self._resolved_path
         self._apply_common_properties(qt_object)
         return qt_object
 
@@ -69,6 +71,8 @@ class ImageInterface(PositionedObjectInterface):
             qt_object.setOpacity(self.opacity)
 
     def render(self):
+        if self._reuse_retired_qt_object():
+            return
         if self.file_path.suffix == ".svg":
             qt_object = self._create_svg_qt_object()
         else:
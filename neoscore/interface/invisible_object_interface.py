@@ -14,6 +14,8 @@ class InvisibleObjectInterface(PositionedObjectInterface):
 
     # TODO work on fixing the ResizableGraphicsItem subclass
     def render(self):
+        if self._reuse_retired_qt_object():
+            return
         qt_object = QGraphicsSimpleTextItem()
         qt_object.setPos(point_to_qt_point_f(self.pos))
         if self.transform_origin != ORIGIN:
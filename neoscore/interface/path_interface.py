@@ -103,7 +103,13 @@ class PathInterface(PositionedObjectInterface):
 
     def render(self):
         """Render the path to the scene."""
-        self._register_qt_object(self._create_qt_object())
+        if not self._reuse_retired_qt_object():
+            self._register_qt_object(self._create_qt_object())
+
+    def _rescale_qt_object(
+        self, obj: QClippingPath, previous: PositionedObjectInterface
+    ):
+        obj.rescale(self.scale / previous.scale)
 
     def _create_qt_object(self) -> QClippingPath:
         painter_path = PathInterface.create_qt_path(self.elements)
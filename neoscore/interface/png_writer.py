@@ -0,0 +1,96 @@
+import struct
+import zlib
+from typing import Any, Callable
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# PNG color types
+_COLOR_TYPE_RGB = 2
+_COLOR_TYPE_RGBA = 6
+
+
+class PngWriter:
+
+    """An incremental PNG encoder.
+
+    Rows of pixels are compressed and written as they are given, so images can be
+    encoded without ever holding the whole image in memory. Rows are given as raw
+    8-bit RGB or RGBA pixel data, each prefixed with a PNG filter type byte.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[bytes], Any],
+        width: int,
+        height: int,
+        alpha: bool,
+        dots_per_meter: int,
+    ):
+        """
+        Args:
+            write: A function receiving each chunk of encoded output in order.
+            width: The image width in pixels.
+            height: The image height in pixels.
+            alpha: Whether rows include an alpha channel.
+            dots_per_meter: The image resolution, recorded in the file's metadata.
+        """
+        self._write = write
+        self.width = width
+        self.height = height
+        self.alpha = alpha
+        self.rows_written = 0
+        self._compressor = zlib.compressobj()
+        self._write(_PNG_SIGNATURE)
+        self._write_chunk(
+            b"IHDR",
+            struct.pack(
+                ">IIBBBBB",
+                width,
+                height,
+                8,
+                _COLOR_TYPE_RGBA if alpha else _COLOR_TYPE_RGB,
+                0,
+                0,
+                0,
+            ),
+        )
+        # Unit 1 is meters
+        self._write_chunk(
+            b"pHYs", struct.pack(">IIB", dots_per_meter, dots_per_meter, 1)
+        )
+
+    @property
+    def row_size(self) -> int:
+        """The size in bytes of each row, including its filter type byte."""
+        return 1 + self.width * (4 if self.alpha else 3)
+
+    def _write_chunk(self, chunk_type: bytes, data: bytes):
+        self._write(struct.pack(">I", len(data)))
+        self._write(chunk_type)
+        self._write(data)
+        self._write(struct.pack(">I", zlib.crc32(data, zlib.crc32(chunk_type))))
+
+    def write_rows(self, data: bytes):
+        """Write the next rows of the image.
+
+        ``data`` must contain a whole number of rows of ``row_size`` bytes.
+        """
+        self.rows_written += len(data) // self.row_size
+        if self.rows_written > self.height:
+            raise ValueError("More rows written than the image height")
+        compressed = self._compressor.compress(data)
+        if compressed:
+            self._write_chunk(b"IDAT", compressed)
+
+    def close(self):
+        """Finish writing the image.
+
+        Raises:
+            ValueError: If fewer rows were written than the image height.
+        """
+        if self.rows_written != self.height:
+            raise ValueError(
+                f"Only {self.rows_written} of {self.height} image rows written"
+            )
+        self._write_chunk(b"IDAT", self._compressor.flush())
+        self._write_chunk(b"IEND", b"")
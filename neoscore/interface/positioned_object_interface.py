@@ -1,12 +1,71 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Optional
+import pathlib
+from dataclasses import dataclass, field, fields
+from enum import Enum
+from typing import Any, Hashable, Optional, Tuple
 from warnings import warn
 
+from PyQt5 import sip
 from PyQt5.QtWidgets import QGraphicsSimpleTextItem
 from neoscore.core import neoscore
 from neoscore.core.point import Point
+from neoscore.core.units import Unit
+from neoscore.interface.qt.converters import point_to_qt_point_f
+
+_TRANSFORM_FIELD_NAMES = {"pos", "parent", "scale", "rotation", "transform_origin"}
+"""Interface fields which can be changed on an existing Qt object."""
+
+
+_Z_VALUES_PER_STACKING_RANK = 2**20
+"""The number of Qt objects which can be stacked at each stacking rank."""
+
+_next_z_value: float = 0
+"""The z-value given to the next Qt object registered or reused.
+
+See :obj:`.set_stacking_rank`.
+"""
+
+
+def set_stacking_rank(rank: int, skipped_count: int = 0):
+    """Stack Qt objects registered or reused from now on at a position in the scene.
+
+    Each Qt object is given the next z-value in the rank's range, so objects are
+    stacked by rank and then by the order they were rendered in. Renderers set a rank
+    reflecting document order, so graphics re-rendered on their own stack the same as
+    they would if the whole scene were rebuilt.
+
+    Args:
+        rank: The stacking rank.
+        skipped_count: How many z-values at the start of the rank's range to skip,
+            for adding to objects already rendered at this rank.
+    """
+    global _next_z_value
+    _next_z_value = float(rank * _Z_VALUES_PER_STACKING_RANK + skipped_count)
+
+
+def _take_z_value() -> float:
+    global _next_z_value
+    z_value = _next_z_value
+    _next_z_value += 1
+    return z_value
+
+
+def _hashable_value(value: Any) -> Hashable:
+    """Convert an interface field value into a hashable equivalent.
+
+    Units are compared by value and sequences element-wise, while any other
+    unhashable objects (brush, pen, and font interfaces) are compared by identity.
+    """
+    if isinstance(value, Unit):
+        return value.base_value
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_hashable_value(v) for v in value))
+    if value is None or isinstance(
+        value, (str, int, float, bool, Enum, pathlib.PurePath)
+    ):
+        return value
+    return id(value)
 
 # this makes the class abstract
 @dataclass(frozen=True)
@@ -58,12 +117,29 @@ class PositionedObjectInterface:
     def render(self):
         """Render the object to the scene.
 
-        This is typically done by constructing a `QGraphicsSimpleTextItem` subclass and calling
+        This is typically done by calling ``_reuse_retired_qt_object``, and if that
+        fails, constructing a `QGraphicsSimpleTextItem` subclass and calling
         `_register_qt_object` with it. Do *not* manually assign the Qt object's parent
         or add it to the Qt scene.
         """
         raise NotImplementedError
 
+    @property
+    def _reuse_key(self) -> Optional[Tuple]:
+        """A hashable key describing everything but this interface's transform.
+
+        Qt objects retired from interfaces with equal keys can be reused by this one.
+        This is ``None`` when the interface can't reuse Qt objects.
+        """
+        if self.scale == 0:
+            # Scale changes are applied relative to the old scale
+            return None
+        return (type(self),) + tuple(
+            _hashable_value(getattr(self, f.name))
+            for f in fields(self)
+            if f.compare and f.name not in _TRANSFORM_FIELD_NAMES
+        )
+
     def _parent_qt_obj(self) -> Optional[QGraphicsSimpleTextItem]:
         if self.parent:
             parent_qt_obj = getattr(self.parent, "_qt_object", None)
@@ -81,9 +157,95 @@ class PositionedObjectInterface:
         obj.setFlag(QGraphicsSimpleTextItem.ItemIsSelectable, True)
         obj.setFlag(QGraphicsSimpleTextItem.ItemSendsGeometryChanges, True)
         # obj.setFlag(QGraphicsSimpleTextItem.ItemIsFocusable, True)
+        obj.setZValue(_take_z_value())
         if parent_obj:
             obj.setParentItem(parent_obj)
         else:
             neoscore.app_interface.scene.addItem(obj) # TODO look more closely at this line
         
         super().__setattr__("_qt_object", obj)
+
+    def _retire_qt_object(self):
+        """Offer this interface's Qt object for reuse in the ongoing render.
+
+        Retired objects stay in the scene until the render completes, at which point
+        any which weren't reused are removed. Interfaces which can't be reused are
+        unregistered immediately.
+        """
+        obj = getattr(self, "_qt_object", None)
+        if obj is None:
+            return
+        key = self._reuse_key
+        if key is None or sip.isdeleted(obj):
+            self._unregister_qt_object()
+            return
+        neoscore.app_interface.retire_qt_object(key, self, obj)
+        super().__setattr__("_qt_object", None)
+
+    def _reuse_retired_qt_object(self) -> bool:
+        """Try to take over a Qt object retired from an equivalent interface.
+
+        If one is available, it is moved into this interface's position, parent, and
+        transform, and registered as this interface's Qt object.
+
+        Returns:
+            Whether a retired object was reused.
+        """
+        key = self._reuse_key
+        if key is None:
+            return False
+        retired = neoscore.app_interface.reclaim_qt_object(key)
+        if retired is None:
+            return False
+        previous, obj = retired
+        parent_obj = self._parent_qt_obj()
+        if parent_obj is not None and obj.isAncestorOf(parent_obj):
+            # Reparenting this would create a cycle, leave it for another interface
+            neoscore.app_interface.retire_qt_object(key, previous, obj)
+            return False
+        obj.setPos(point_to_qt_point_f(self.pos))
+        obj.setTransformOriginPoint(point_to_qt_point_f(self.transform_origin))
+        obj.setRotation(self.rotation)
+        if self.scale != previous.scale:
+            self._rescale_qt_object(obj, previous)
+        obj.setZValue(_take_z_value())
+        if parent_obj:
+            obj.setParentItem(parent_obj)
+        elif obj.parentItem() is not None:
+            obj.setParentItem(None)
+        super().__setattr__("_qt_object", obj)
+        return True
+
+    def _rescale_qt_object(self, obj: Any, previous: PositionedObjectInterface):
+        """Apply this interface's scale to a Qt object reused from ``previous``.
+
+        Subclasses whose Qt objects derive other geometry from the scale should
+        override this.
+        """
+        obj.setScale(self.scale)
+
+    def _restack_qt_object(self, rank_change: int):
+        """Move this interface's Qt object by a change in its stacking rank.
+
+        See :obj:`.set_stacking_rank`. This is a no-op if the interface isn't
+        rendered.
+        """
+        obj = getattr(self, "_qt_object", None)
+        if obj is None or sip.isdeleted(obj):
+            return
+        obj.setZValue(obj.zValue() + rank_change * _Z_VALUES_PER_STACKING_RANK)
+
+    def _unregister_qt_object(self):
+        """Remove this interface's Qt object, and any Qt children, from the scene.
+
+        This is a no-op if the interface was never rendered or its Qt object was
+        already removed along with a parent.
+        """
+        obj = getattr(self, "_qt_object", None)
+        if obj is None:
+            return
+        if not sip.isdeleted(obj):
+            scene = obj.scene()
+            if scene is not None:
+                scene.removeItem(obj)
+        super().__setattr__("_qt_object", None)
@@ -127,8 +127,7 @@ class MainWindow(QtWidgets.QMainWindow):
         print("Paste file clicked")
         
     def updatePage(self):
-        neoscore.app_interface.clear_scene() 
-        neoscore.document.render(True, Brush("#FFFFFF"))
+        neoscore._render_document(True, Brush("#FFFFFF"))
         # self.graphicsView.viewport().update()
         self.refresh()
 
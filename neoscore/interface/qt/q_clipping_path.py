@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Hashable, Optional
 
 from PyQt5.QtCore import QPointF, QRectF
 from PyQt5.QtGui import QBrush, QColor, QPainter, QPainterPath, QPen
@@ -25,7 +25,8 @@ class QClippingPath(QGraphicsPathItem):
     on a path with a scale of 2, ``clip_width=50`` should be passed.
 
     While the Qt superclass is mutable, this is intended to be treated
-    immutably. Mutations after instantation will result unexpected
+    immutably apart from its position, rotation, and ``rescale``.
+    Other mutations after instantation will result unexpected
     behavior. Object mutations at higher abstraction levels should
     result in new Qt objects created.
 
@@ -85,6 +86,11 @@ class QClippingPath(QGraphicsPathItem):
         self.setRotation(rotation)
         super().setScale(scale)
         self.background_brush = background_brush
+        self.path_key: Optional[Hashable] = None
+        """An optional key shared by items known to have identical paths.
+
+        Exporters use this to deduplicate paths without comparing them.
+        """
         self.bounding_rect = None
         self.clip_rect = None
         if not defer_geometry_calculation:
@@ -120,6 +126,18 @@ class QClippingPath(QGraphicsPathItem):
 
         super().paint(painter, *args, **kwargs)
 
+    def rescale(self, factor: float):
+        """Multiply the item's scale by a factor, keeping its clipping region.
+
+        The clipping region is kept the same size in unscaled coordinates, as if the
+        item had been created with the new scale.
+        """
+        self.clip_start_x /= factor
+        if self.clip_width is not None:
+            self.clip_width /= factor
+        super().setScale(self.scale() * factor)
+        self.update_geometry()
+
     def update_geometry(self):
         """Recalculate the object's bounding and clipping rects.
 
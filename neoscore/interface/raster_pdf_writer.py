@@ -0,0 +1,121 @@
+from typing import Any, Callable, Dict, List, Optional
+
+_PDF_HEADER = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+
+# Object numbers reserved for the document catalog and page tree, which are
+# written last since they reference every page.
+_CATALOG_ID = 1
+_PAGES_ID = 2
+
+
+class RasterPdfWriter:
+
+    """An incremental PDF writer for documents made of full-page images.
+
+    Each page is written as soon as it is given, so documents can be assembled
+    without holding more than one page in memory. Page images are given already
+    compressed, either as JPEG files or as zlib-compressed 8-bit pixel rows.
+    """
+
+    def __init__(self, write: Callable[[bytes], Any]):
+        """
+        Args:
+            write: A function receiving each chunk of encoded output in order.
+        """
+        self._write_func = write
+        self._offset = 0
+        self._object_offsets: Dict[int, int] = {}
+        self._next_id = _PAGES_ID + 1
+        self._page_ids: List[int] = []
+        self._write(_PDF_HEADER)
+
+    @property
+    def page_count(self) -> int:
+        return len(self._page_ids)
+
+    def _write(self, data: bytes):
+        self._write_func(data)
+        self._offset += len(data)
+
+    def _new_id(self) -> int:
+        self._next_id += 1
+        return self._next_id - 1
+
+    def _write_object(
+        self, object_id: int, dictionary: str, stream: Optional[bytes] = None
+    ):
+        self._object_offsets[object_id] = self._offset
+        entries = f"{dictionary} " if dictionary else ""
+        self._write(f"{object_id} 0 obj\n<< {entries}".encode("ascii"))
+        if stream is None:
+            self._write(b">>\nendobj\n")
+        else:
+            self._write(f"/Length {len(stream)} >>\nstream\n".encode("ascii"))
+            self._write(stream)
+            self._write(b"\nendstream\nendobj\n")
+
+    def add_page(
+        self,
+        width: float,
+        height: float,
+        pix_width: int,
+        pix_height: int,
+        grayscale: bool,
+        jpeg: bool,
+        data: bytes,
+    ):
+        """Write a page showing a single image.
+
+        Args:
+            width: The page width in points.
+            height: The page height in points.
+            pix_width: The image width in pixels.
+            pix_height: The image height in pixels.
+            grayscale: Whether the image is 8-bit grayscale rather than 8-bit RGB.
+            jpeg: Whether ``data`` is a JPEG file rather than zlib-compressed
+                pixel rows.
+            data: The compressed image.
+        """
+        image_id = self._new_id()
+        self._write_object(
+            image_id,
+            "/Type /XObject /Subtype /Image"
+            + f" /Width {pix_width} /Height {pix_height}"
+            + f" /ColorSpace /{'DeviceGray' if grayscale else 'DeviceRGB'}"
+            + " /BitsPerComponent 8"
+            + f" /Filter /{'DCTDecode' if jpeg else 'FlateDecode'}",
+            data,
+        )
+        contents_id = self._new_id()
+        self._write_object(
+            contents_id,
+            "",
+            f"q {width:.4f} 0 0 {height:.4f} 0 0 cm /Im0 Do Q".encode("ascii"),
+        )
+        page_id = self._new_id()
+        self._write_object(
+            page_id,
+            f"/Type /Page /Parent {_PAGES_ID} 0 R"
+            + f" /MediaBox [0 0 {width:.4f} {height:.4f}]"
+            + f" /Resources << /XObject << /Im0 {image_id} 0 R >> >>"
+            + f" /Contents {contents_id} 0 R",
+        )
+        self._page_ids.append(page_id)
+
+    def close(self):
+        """Finish writing the document."""
+        kids = " ".join(f"{page_id} 0 R" for page_id in self._page_ids)
+        self._write_object(
+            _PAGES_ID, f"/Type /Pages /Kids [{kids}] /Count {len(self._page_ids)}"
+        )
+        self._write_object(_CATALOG_ID, f"/Type /Catalog /Pages {_PAGES_ID} 0 R")
+        xref_offset = self._offset
+        object_count = self._next_id
+        entries = ["xref", f"0 {object_count}", "0000000000 65535 f "]
+        for object_id in range(1, object_count):
+            entries.append(f"{self._object_offsets[object_id]:010d} 00000 n ")
+        self._write(("\n".join(entries) + "\n").encode("ascii"))
+        self._write(
+            f"trailer\n<< /Size {object_count} /Root {_CATALOG_ID} 0 R >>\n"
+            f"startxref\n{xref_offset}\n%%EOF\n".encode("ascii")
+        )
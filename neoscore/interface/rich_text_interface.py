@@ -21,7 +21,8 @@ class RichTextInterface(PositionedObjectInterface):
 
     def render(self):
         """Render the line to the scene."""
-        self._register_qt_object(self._create_qt_object())
+        if not self._reuse_retired_qt_object():
+            self._register_qt_object(self._create_qt_object())
 
     def _create_qt_object(self) -> QRichTextItem:
         """Create and return this interface's underlying Qt object"""
@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import base64
+import pathlib
+from typing import Callable, Dict, Hashable, List, Optional
+from warnings import warn
+
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice, QRectF, Qt
+from PyQt5.QtGui import QBrush, QColor, QPainterPath, QPen, QTransform
+from PyQt5.QtSvg import QGraphicsSvgItem
+from PyQt5.QtWidgets import (
+    QGraphicsItem,
+    QGraphicsPixmapItem,
+    QGraphicsSimpleTextItem,
+)
+
+from neoscore.interface.qt.q_clipping_path import QClippingPath
+
+# Qt::OddEvenFill
+_QT_ODD_EVEN_FILL = 0
+
+_CAP_STYLES = {
+    Qt.PenCapStyle.FlatCap: "butt",
+    Qt.PenCapStyle.SquareCap: "square",
+    Qt.PenCapStyle.RoundCap: "round",
+}
+
+_JOIN_STYLES = {
+    Qt.PenJoinStyle.MiterJoin: "miter",
+    Qt.PenJoinStyle.SvgMiterJoin: "miter",
+    Qt.PenJoinStyle.BevelJoin: "bevel",
+    Qt.PenJoinStyle.RoundJoin: "round",
+}
+
+
+def _num(value: float) -> str:
+    """Format a number compactly for SVG attributes."""
+    text = f"{value:.3f}".rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
+def _color(color: QColor) -> str:
+    return f"#{color.red():02x}{color.green():02x}{color.blue():02x}"
+
+
+def _transform(transform: QTransform) -> str:
+    if transform.isIdentity():
+        return ""
+    if transform.type() == QTransform.TxTranslate:
+        return f' transform="translate({_num(transform.dx())} {_num(transform.dy())})"'
+    values = " ".join(
+        _num(v)
+        for v in (
+            transform.m11(),
+            transform.m12(),
+            transform.m21(),
+            transform.m22(),
+            transform.dx(),
+            transform.dy(),
+        )
+    )
+    return f' transform="matrix({values})"'
+
+
+def path_data(path: QPainterPath) -> str:
+    """Convert a ``QPainterPath`` to SVG path data."""
+    commands = []
+    i = 0
+    count = path.elementCount()
+    while i < count:
+        el = path.elementAt(i)
+        if el.type == QPainterPath.MoveToElement:
+            commands.append(f"M{_num(el.x)} {_num(el.y)}")
+            i += 1
+        elif el.type == QPainterPath.LineToElement:
+            commands.append(f"L{_num(el.x)} {_num(el.y)}")
+            i += 1
+        elif el.type == QPainterPath.CurveToElement:
+            c2 = path.elementAt(i + 1)
+            end = path.elementAt(i + 2)
+            commands.append(
+                f"C{_num(el.x)} {_num(el.y)} {_num(c2.x)} {_num(c2.y)} "
+                + f"{_num(end.x)} {_num(end.y)}"
+            )
+            i += 3
+        else:
+            # Stray curve data element; treat as a line
+            commands.append(f"L{_num(el.x)} {_num(el.y)}")
+            i += 1
+    return "".join(commands)
+
+
+class SvgWriter:
+
+    """A streaming SVG emitter for Qt scene items.
+
+    Items are painted directly to SVG elements rather than through a ``QPainter``,
+    so paths stay exact and shared geometry is only written once. Every distinct
+    path, including each glyph used in text, is emitted once in ``<defs>`` and drawn
+    with ``<use>`` references. Paths are identified by ``QClippingPath.path_key``
+    where available, and otherwise by their path data.
+
+    Elements are passed to ``write`` as soon as they are generated. Since SVG
+    permits forward references, the ``<defs>`` block is written at the end.
+    """
+
+    def __init__(self, write: Callable[[str], None], rect: QRectF):
+        """
+        Args:
+            write: A function receiving each chunk of SVG text in order.
+            rect: The region of the scene to draw, in scene coordinates.
+        """
+        self._write = write
+        self.rect = rect
+        self._defs: List[str] = []
+        self._path_ids_by_key: Dict[Hashable, str] = {}
+        self._path_ids_by_data: Dict[str, str] = {}
+        self._gradient_ids: Dict[Hashable, str] = {}
+        self._next_id = 0
+        self._warned_types = set()
+
+    def _new_id(self, prefix: str) -> str:
+        self._next_id += 1
+        return f"{prefix}{self._next_id}"
+
+    def begin(self, bg_color: Optional[QColor] = None):
+        """Write the document header, and a background fill if requested."""
+        rect = self.rect
+        self._write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            + '<svg xmlns="http://www.w3.org/2000/svg"'
+            + ' xmlns:xlink="http://www.w3.org/1999/xlink" version="1.1"'
+            # Base units are points
+            + f' width="{_num(rect.width())}pt" height="{_num(rect.height())}pt"'
+            + f' viewBox="{_num(rect.x())} {_num(rect.y())}'
+            + f' {_num(rect.width())} {_num(rect.height())}">\n'
+        )
+        if bg_color is not None and bg_color.alpha():
+            self._write(
+                f'<rect x="{_num(rect.x())}" y="{_num(rect.y())}"'
+                + f' width="{_num(rect.width())}" height="{_num(rect.height())}"'
+                + f' fill="{_color(bg_color)}"{self._opacity("fill", bg_color)}/>\n'
+            )
+
+    def end(self):
+        """Write the collected definitions and close the document."""
+        if self._defs:
+            self._write("<defs>\n")
+            for definition in self._defs:
+                self._write(definition)
+            self._write("</defs>\n")
+        self._write("</svg>\n")
+
+    def write_item(self, item: QGraphicsItem):
+        """Write a single item, not including its children."""
+        if not item.isVisible():
+            return
+        if isinstance(item, QClippingPath):
+            self._write_clipping_path(item)
+        elif isinstance(item, QGraphicsPixmapItem):
+            self._write_pixmap(item)
+        elif isinstance(item, QGraphicsSvgItem):
+            self._write_svg_image(item)
+        elif isinstance(item, QGraphicsSimpleTextItem) and not item.text():
+            # Invisible objects
+            pass
+        elif type(item) not in self._warned_types:
+            self._warned_types.add(type(item))
+            warn(f"SVG export does not support {type(item).__name__}, skipping")
+
+    @staticmethod
+    def _opacity(attr: str, color: QColor) -> str:
+        if color.alpha() == 255:
+            return ""
+        return f' {attr}-opacity="{_num(color.alphaF())}"'
+
+    def _path_id(self, item: QClippingPath) -> str:
+        key = item.path_key
+        if key is not None:
+            path_id = self._path_ids_by_key.get(key)
+            if path_id:
+                return path_id
+        path = item.path()
+        fill_rule = "evenodd" if path.fillRule() == _QT_ODD_EVEN_FILL else "nonzero"
+        definition = f'd="{path_data(path)}" fill-rule="{fill_rule}"'
+        path_id = self._path_ids_by_data.get(definition)
+        if not path_id:
+            path_id = self._new_id("p")
+            self._defs.append(f'<path id="{path_id}" {definition}/>\n')
+            self._path_ids_by_data[definition] = path_id
+        if key is not None:
+            self._path_ids_by_key[key] = path_id
+        return path_id
+
+    def _gradient_id(self, brush: QBrush) -> str:
+        gradient = brush.gradient()
+        stops = tuple(
+            (position, color.rgba()) for position, color in gradient.stops()
+        )
+        start = gradient.start()
+        stop = gradient.finalStop()
+        key = (start.x(), start.y(), stop.x(), stop.y(), stops)
+        gradient_id = self._gradient_ids.get(key)
+        if gradient_id:
+            return gradient_id
+        gradient_id = self._new_id("g")
+        parts = [
+            f'<linearGradient id="{gradient_id}" gradientUnits="userSpaceOnUse"'
+            + f' x1="{_num(start.x())}" y1="{_num(start.y())}"'
+            + f' x2="{_num(stop.x())}" y2="{_num(stop.y())}">'
+        ]
+        for position, color in gradient.stops():
+            parts.append(
+                f'<stop offset="{_num(position)}" stop-color="{_color(color)}"'
+                + f'{self._opacity("stop", color)}/>'
+            )
+        parts.append("</linearGradient>\n")
+        self._defs.append("".join(parts))
+        self._gradient_ids[key] = gradient_id
+        return gradient_id
+
+    def _fill(self, brush: QBrush) -> str:
+        style = brush.style()
+        if style == Qt.BrushStyle.NoBrush:
+            return ' fill="none"'
+        if style == Qt.BrushStyle.LinearGradientPattern:
+            return f' fill="url(#{self._gradient_id(brush)})"'
+        # Hatched patterns are approximated with solid fills
+        color = brush.color()
+        return f' fill="{_color(color)}"{self._opacity("fill", color)}'
+
+    def _stroke(self, pen: QPen) -> str:
+        style = pen.style()
+        if style == Qt.PenStyle.NoPen:
+            return ""
+        color = pen.color()
+        attrs = f' stroke="{_color(color)}"{self._opacity("stroke", color)}'
+        width = pen.widthF()
+        if width == 0:
+            # Cosmetic pens are one device pixel wide regardless of transforms
+            attrs += ' stroke-width="1" vector-effect="non-scaling-stroke"'
+            width = 1
+        else:
+            attrs += f' stroke-width="{_num(width)}"'
+        attrs += f' stroke-linecap="{_CAP_STYLES.get(pen.capStyle(), "square")}"'
+        attrs += f' stroke-linejoin="{_JOIN_STYLES.get(pen.joinStyle(), "bevel")}"'
+        if style != Qt.PenStyle.SolidLine:
+            # Qt dash patterns are given in multiples of the pen width
+            dashes = ",".join(_num(d * width) for d in pen.dashPattern())
+            attrs += f' stroke-dasharray="{dashes}"'
+        return attrs
+
+    def _write_clipping_path(self, item: QClippingPath):
+        attrs = _transform(item.sceneTransform())
+        if item.opacity() != 1:
+            attrs += f' opacity="{_num(item.opacity())}"'
+        bounding_rect = item.bounding_rect
+        clipped = item.clip_start_x != 0 or item.clip_width is not None
+        parts = []
+        if clipped:
+            clip_id = self._new_id("c")
+            self._defs.append(
+                f'<clipPath id="{clip_id}"><rect x="{_num(bounding_rect.x())}"'
+                + f' y="{_num(bounding_rect.y())}"'
+                + f' width="{_num(bounding_rect.width())}"'
+                + f' height="{_num(bounding_rect.height())}"/></clipPath>\n'
+            )
+            attrs += f' clip-path="url(#{clip_id})"'
+        if item.background_brush:
+            parts.append(
+                f'<rect x="{_num(bounding_rect.x())}" y="{_num(bounding_rect.y())}"'
+                + f' width="{_num(bounding_rect.width())}"'
+                + f' height="{_num(bounding_rect.height())}"'
+                + f"{self._fill(item.background_brush)}/>"
+            )
+        use_transform = (
+            f' transform="translate({_num(-item.clip_start_x)} 0)"'
+            if item.clip_start_x != 0
+            else ""
+        )
+        parts.append(
+            f'<use xlink:href="#{self._path_id(item)}"{use_transform}'
+            + f"{self._fill(item.brush())}{self._stroke(item.pen())}/>"
+        )
+        if len(parts) == 1 and not clipped:
+            # Put everything on the `use` element without a wrapping group
+            self._write(parts[0].replace("<use ", f"<use{attrs} ", 1) + "\n")
+        else:
+            self._write(f"<g{attrs}>{''.join(parts)}</g>\n")
+
+    def _write_image(self, item: QGraphicsItem, mime_type: str, data: bytes):
+        rect = item.boundingRect()
+        attrs = _transform(item.sceneTransform())
+        if item.opacity() != 1:
+            attrs += f' opacity="{_num(item.opacity())}"'
+        encoded = base64.b64encode(data).decode("ascii")
+        self._write(
+            f'<image{attrs} x="{_num(rect.x())}" y="{_num(rect.y())}"'
+            + f' width="{_num(rect.width())}" height="{_num(rect.height())}"'
+            + ' preserveAspectRatio="none"'
+            + f' xlink:href="data:{mime_type};base64,{encoded}"/>\n'
+        )
+
+    def _write_pixmap(self, item: QGraphicsPixmapItem):
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.WriteOnly)
+        item.pixmap().save(buffer, "PNG")
+        buffer.close()
+        self._write_image(item, "image/png", bytes(data))
+
+    def _write_svg_image(self, item: QGraphicsSvgItem):
+        source_path = getattr(item, "source_path", None)
+        if source_path is None:
+            warn("SVG export could not find the source file of an SVG image")
+            return
+        self._write_image(
+            item, "image/svg+xml", pathlib.Path(source_path).read_bytes()
+        )
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Dict, NamedTuple, Optional
+from typing import Dict, NamedTuple, Optional, Tuple
 
 from PyQt5.QtGui import QFont, QPainterPath
 
@@ -70,7 +70,13 @@ class TextInterface(PositionedObjectInterface):
 
     def render(self):
         """Render the line to the scene."""
-        self._register_qt_object(self._create_qt_object())
+        if not self._reuse_retired_qt_object():
+            self._register_qt_object(self._create_qt_object())
+
+    def _rescale_qt_object(
+        self, obj: QClippingPath, previous: PositionedObjectInterface
+    ):
+        obj.rescale(self.scale / previous.scale)
 
     def _create_qt_object(self) -> QClippingPath:
         """Create and return this interface's underlying Qt object"""
@@ -82,18 +88,9 @@ class TextInterface(PositionedObjectInterface):
         return qt_object
 
     def _get_path(self, text: str, font: FontInterface, scale: float) -> QClippingPath:
-        qt_font = font.qt_object
-        needed_font_size = qt_font.pixelSize()
-        key = _CachedTextKey(text, font.family_name, font.weight, font.italic)
-        cached_result = _PATH_CACHE.get(key)
-        if cached_result:
-            cache_scale = needed_font_size / cached_result.generation_font_size
-            scale *= cache_scale
-            path = cached_result.path
-        else:
-            path = TextInterface._create_qt_path(text, qt_font)
-            _PATH_CACHE[key] = _CachedTextPath(path, needed_font_size)
-        return QClippingPath(
+        path, cache_scale = TextInterface._get_cached_qt_path(text, font)
+        scale *= cache_scale
+        qt_object = QClippingPath(
             path,
             self.clip_start_x.base_value if self.clip_start_x is not None else 0,
             self.clip_width.base_value if self.clip_width is not None else None,
@@ -103,6 +100,45 @@ class TextInterface(PositionedObjectInterface):
             defer_geometry_calculation=True,
             transform_origin=point_to_qt_point_f(self.transform_origin),
         )
+        qt_object.path_key = TextInterface._cache_key(text, font)
+        return qt_object
+
+    @staticmethod
+    def _cache_key(text: str, font: FontInterface) -> _CachedTextKey:
+        return _CachedTextKey(text, font.family_name, font.weight, font.italic)
+
+    @staticmethod
+    def _get_cached_qt_path(
+        text: str, font: FontInterface
+    ) -> Tuple[QPainterPath, float]:
+        """Get a possibly shared path for some text, along with a scale to draw it at.
+
+        Paths are cached by text and font face, regardless of font size, so the
+        returned scale converts the cached path to the requested size. Paths are
+        also kept in the font's persistent :obj:`.TextMetricsCache` if it has one,
+        keyed by the size they are made at so they match newly made ones.
+        """
+        qt_font = font.qt_object
+        needed_font_size = qt_font.pixelSize()
+        key = TextInterface._cache_key(text, font)
+        cached_result = _PATH_CACHE.get(key)
+        if cached_result:
+            return (
+                cached_result.path,
+                needed_font_size / cached_result.generation_font_size,
+            )
+        persistent_cache = font._text_metrics_cache()
+        path = (
+            persistent_cache.outline(text, needed_font_size)
+            if persistent_cache
+            else None
+        )
+        if path is None:
+            path = TextInterface._create_qt_path(text, qt_font)
+            if persistent_cache:
+                persistent_cache.add_outline(text, needed_font_size, path)
+        _PATH_CACHE[key] = _CachedTextPath(path, needed_font_size)
+        return path, 1.0
 
     @staticmethod
     def _create_qt_path(text: str, font: QFont) -> QPainterPath:
@@ -0,0 +1,259 @@
+"""A persistent cache of text outlines and tight bounding rects.
+
+Extracting glyph outlines with ``QPainterPath.addText`` and measuring text with
+``QFontMetricsF.tightBoundingRect`` are among the slowest parts of laying out and
+rendering text, and their results are the same in every run. This keeps them in
+:obj:`.env.CACHE_DIR`, in one file per font face, so later runs can skip the work.
+
+Faces are identified by a hash of their family's registered font files along with
+the requested weight and italicness and the Qt version, so caches are automatically
+rebuilt when fonts change. Fonts which weren't registered with
+:obj:`.AppInterface.register_font`, like system fonts, aren't cached.
+
+Loading a serialized outline is only faster than extracting it for fonts with CFF
+outlines, like Bravura, whose glyph programs are comparatively slow to interpret,
+so outlines are only kept for fonts whose files all have CFF outlines. Bounding rects
+are kept for every registered font.
+
+Both are keyed by the font pixel size they were made at, since glyph outlines can
+differ between sizes through hinting, so cached values always match uncached ones.
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import pathlib
+import struct
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from PyQt5.QtCore import QT_VERSION_STR, QByteArray, QDataStream, QIODevice, QRectF
+from PyQt5.QtGui import QPainterPath
+
+from neoscore.core import env
+from neoscore.core.metadata_index import _map_index_file, _write_index_file
+
+_MAGIC = b"NSTEXT2\0"
+_HEADER_LENGTH = struct.Struct("<I")
+
+# OpenType files with CFF outlines start with this tag instead of a version number
+_CFF_TAG = b"OTTO"
+
+_FaceKey = Tuple[str, Optional[int], bool]
+
+_TextKey = Tuple[str, int]
+"""A text and a font pixel size."""
+
+_FONT_FILES: Dict[str, List[str]] = {}
+"""Registered font file paths by family name."""
+
+_FONT_FILE_INFO: Dict[str, Tuple[bytes, bool]] = {}
+"""The digest of each font file, and whether it has CFF outlines."""
+
+_FACE_CACHES: Dict[_FaceKey, Optional[TextMetricsCache]] = {}
+
+
+class TextMetricsCache:
+
+    """Outlines and tight bounding rects of texts in one font face.
+
+    Cached values are read from disk the first time any of them is looked up, and
+    new ones are written back by :obj:`.save`.
+    """
+
+    def __init__(self, path: pathlib.Path, persist_outlines: bool):
+        """
+        Args:
+            path: The cache file.
+            persist_outlines: Whether to keep text outlines, or only bounding rects.
+        """
+        self.path = path
+        self.persist_outlines = persist_outlines
+        self._outlines: Optional[Dict[_TextKey, bytes]] = None
+        self._rects: Dict[_TextKey, Tuple[float, float, float, float]] = {}
+        self._dirty = False
+
+    def _ensure_loaded(self):
+        if self._outlines is None:
+            self._outlines, self._rects = _read_cache_file(self.path)
+
+    def outline(self, text: str, font_size: int) -> Optional[QPainterPath]:
+        """Get the cached outline of a text at a font pixel size."""
+        if not self.persist_outlines:
+            return None
+        self._ensure_loaded()
+        data = self._outlines.get((text, font_size))
+        if data is None:
+            return None
+        path = QPainterPath()
+        stream = QDataStream(QByteArray(data))
+        stream >> path
+        return path
+
+    def add_outline(self, text: str, font_size: int, path: QPainterPath):
+        """Cache the outline of a text at a font pixel size."""
+        if not self.persist_outlines:
+            return
+        self._ensure_loaded()
+        data = QByteArray()
+        stream = QDataStream(data, QIODevice.WriteOnly)
+        stream << path
+        self._outlines[(text, font_size)] = bytes(data)
+        self._dirty = True
+
+    def bounding_rect(self, text: str, font_size: int) -> Optional[QRectF]:
+        """Get the cached tight bounding rect of a text at a font pixel size."""
+        self._ensure_loaded()
+        rect = self._rects.get((text, font_size))
+        if rect is None:
+            return None
+        return QRectF(*rect)
+
+    def add_bounding_rect(self, text: str, font_size: int, rect: QRectF):
+        """Cache the tight bounding rect of a text at a font pixel size."""
+        self._ensure_loaded()
+        self._rects[(text, font_size)] = (
+            rect.x(),
+            rect.y(),
+            rect.width(),
+            rect.height(),
+        )
+        self._dirty = True
+
+    def save(self):
+        """Write any newly cached values to disk."""
+        if not self._dirty:
+            return
+        # Merge with the file on disk, which other processes may have added to
+        outlines, rects = _read_cache_file(self.path)
+        outlines.update(self._outlines)
+        rects.update(self._rects)
+        _write_index_file(self.path, _encode(outlines, rects))
+        self._dirty = False
+
+
+def for_face(
+    family_name: str, weight: Optional[int], italic: bool
+) -> Optional[TextMetricsCache]:
+    """Get the cache for a font face.
+
+    Returns ``None`` if caching is disabled or the family's font files weren't
+    registered.
+    """
+    key = (family_name, weight, italic)
+    try:
+        return _FACE_CACHES[key]
+    except KeyError:
+        pass
+    cache = _create_cache(key)
+    _FACE_CACHES[key] = cache
+    return cache
+
+
+def register_font_file(font_file_path: str, family_names: List[str]):
+    """Record the font file providing some font families."""
+    for family_name in family_names:
+        paths = _FONT_FILES.setdefault(family_name, [])
+        if font_file_path in paths:
+            continue
+        paths.append(font_file_path)
+        # The family's faces may now resolve differently
+        for key in [key for key in _FACE_CACHES if key[0] == family_name]:
+            cache = _FACE_CACHES.pop(key)
+            if cache is not None:
+                cache.save()
+
+
+def forget_font_files():
+    """Forget all registered font files, saving any newly cached values."""
+    save_all()
+    _FONT_FILES.clear()
+    _FACE_CACHES.clear()
+
+
+def save_all():
+    """Write newly cached values of every face to disk."""
+    for cache in _FACE_CACHES.values():
+        if cache is not None:
+            cache.save()
+
+
+def _create_cache(key: _FaceKey) -> Optional[TextMetricsCache]:
+    if env.CACHE_DIR is None:
+        return None
+    font_file_paths = _FONT_FILES.get(key[0])
+    if not font_file_paths:
+        return None
+    digest = hashlib.sha256(_MAGIC)
+    digest.update(json.dumps([QT_VERSION_STR, sys.platform, *key]).encode("utf-8"))
+    persist_outlines = True
+    for font_file_path in font_file_paths:
+        info = _font_file_info(font_file_path)
+        if info is None:
+            return None
+        digest.update(info[0])
+        persist_outlines = persist_outlines and info[1]
+    path = env.CACHE_DIR / "text_metrics" / f"{digest.hexdigest()}.tmc"
+    return TextMetricsCache(path, persist_outlines)
+
+
+def _font_file_info(font_file_path: str) -> Optional[Tuple[bytes, bool]]:
+    info = _FONT_FILE_INFO.get(font_file_path)
+    if info is None:
+        try:
+            data = pathlib.Path(font_file_path).read_bytes()
+        except OSError:
+            return None
+        info = (hashlib.sha256(data).digest(), data[: len(_CFF_TAG)] == _CFF_TAG)
+        _FONT_FILE_INFO[font_file_path] = info
+    return info
+
+
+def _encode(
+    outlines: Dict[_TextKey, bytes],
+    rects: Dict[_TextKey, Tuple[float, float, float, float]],
+) -> bytes:
+    outline_index = []
+    blobs = []
+    offset = 0
+    for (text, font_size), data in outlines.items():
+        outline_index.append([text, font_size, offset, len(data)])
+        blobs.append(data)
+        offset += len(data)
+    header = json.dumps(
+        {
+            "outlines": outline_index,
+            "rects": [[text, size, *rect] for (text, size), rect in rects.items()],
+        }
+    ).encode("utf-8")
+    return b"".join([_MAGIC, _HEADER_LENGTH.pack(len(header)), header, *blobs])
+
+
+def _read_cache_file(path: pathlib.Path):
+    buffer = _map_index_file(path, _MAGIC)
+    if buffer is None:
+        return {}, {}
+    try:
+        offset = len(_MAGIC)
+        (header_length,) = _HEADER_LENGTH.unpack_from(buffer, offset)
+        offset += _HEADER_LENGTH.size
+        header = json.loads(buffer[offset : offset + header_length])
+        offset += header_length
+        outlines = {
+            (text, font_size): buffer[offset + start : offset + start + length]
+            for text, font_size, start, length in header["outlines"]
+        }
+        rects = {
+            (text, size): tuple(rect) for text, size, *rect in header["rects"]
+        }
+        return outlines, rects
+    except (struct.error, ValueError, KeyError, TypeError):
+        # Corrupt files are rebuilt
+        return {}, {}
+    finally:
+        buffer.close()
+
+
+atexit.register(save_all)
@@ -0,0 +1,114 @@
+"""Render many neoscore scripts in one go.
+
+Run it with::
+
+    python -m neoscore.render score1.py score2.py --format pdf --format png
+
+Scripts are run by a pool of warm worker processes (see
+:obj:`neoscore.render_server`), so the Qt application, fonts, and SMuFL metadata
+are set up once per worker rather than once per script, and scripts are rendered
+concurrently. Each script's output is written next to it, or to ``--out-dir``, named
+after the script: ``score1.pdf`` for PDFs and ``score1-0.png``, ``score1-1.png``
+and so on for per-page PNGs and SVGs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import pathlib
+import sys
+from concurrent.futures import as_completed
+from typing import Dict, List, Optional, Union
+
+from neoscore.render_server import SUPPORTED_FORMATS, RenderServer
+
+
+def output_paths(
+    script_path: pathlib.Path,
+    outputs: Dict[str, Union[bytes, List[bytes]]],
+    out_dir: Optional[pathlib.Path] = None,
+) -> Dict[pathlib.Path, bytes]:
+    """Work out where to write a script's rendered outputs.
+
+    Args:
+        script_path: The rendered script.
+        outputs: The script's outputs, as given by :obj:`.render_server.run_job`.
+        out_dir: The directory to write to. Defaults to the script's directory.
+
+    Returns:
+        A dict mapping output paths to file contents.
+    """
+    directory = out_dir or script_path.parent
+    stem = script_path.stem
+    paths = {}
+    for fmt, output in outputs.items():
+        if isinstance(output, bytes):
+            paths[directory / f"{stem}.{fmt}"] = output
+        else:
+            for index, page_output in enumerate(output):
+                paths[directory / f"{stem}-{index}.{fmt}"] = page_output
+    return paths
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m neoscore.render",
+        description="Render neoscore scripts to PDF, PNG, or SVG files.",
+    )
+    parser.add_argument("scripts", nargs="+", type=pathlib.Path)
+    parser.add_argument(
+        "--format",
+        dest="formats",
+        action="append",
+        choices=SUPPORTED_FORMATS,
+        help="An output format. Can be given several times. Defaults to pdf.",
+    )
+    parser.add_argument("--dpi", type=int, default=300)
+    parser.add_argument(
+        "--out-dir",
+        type=pathlib.Path,
+        help="The directory to write outputs to. Defaults to each script's directory.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="The number of worker processes. Defaults to the number of CPUs.",
+    )
+    args = parser.parse_args(argv)
+    if args.out_dir:
+        args.out_dir.mkdir(parents=True, exist_ok=True)
+    formats = args.formats or ["pdf"]
+    # Don't start workers which would have nothing to do
+    workers = min(args.workers or multiprocessing.cpu_count(), len(args.scripts))
+    server = RenderServer(workers)
+    failures = 0
+    try:
+        futures = {
+            server.submit(
+                {
+                    "script_path": str(script_path),
+                    "formats": formats,
+                    "dpi": args.dpi,
+                }
+            ): script_path
+            for script_path in args.scripts
+        }
+        for future in as_completed(futures):
+            script_path = futures[future]
+            try:
+                outputs = future.result()
+            except Exception as e:
+                print(f"{script_path}: {type(e).__name__}: {e}", file=sys.stderr)
+                failures += 1
+                continue
+            for path, data in output_paths(script_path, outputs, args.out_dir).items():
+                path.write_bytes(data)
+                print(path)
+    finally:
+        server.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,351 @@
+"""A long-running render service which keeps neoscore warm between jobs.
+
+Every neoscore script normally pays for creating a Qt application, registering
+fonts, loading SMuFL metadata, and warming up Qt's font database before it can draw
+anything. This service keeps a pool of worker processes which each do that once,
+and then run any number of score-building scripts, returning rendered PDF, PNG, and
+SVG files.
+
+Run it with::
+
+    python -m neoscore.render_server                          # stdin / stdout
+    python -m neoscore.render_server --socket /tmp/neoscore.sock
+
+Requests are `JSON-RPC 2.0 <https://www.jsonrpc.org/specification>`_ objects, one per
+line. Responses are written one per line as jobs finish, so they may arrive out of
+order and should be matched to requests by ``id``. Supported methods are:
+
+* ``ping``, returning ``"pong"``.
+* ``render``, taking a job object (see :obj:`.run_job`) and returning an object
+  mapping each requested format to base64-encoded output. PDFs are returned as a
+  single string, and PNGs and SVGs as lists of strings with one per page. ::
+
+    {"jsonrpc": "2.0", "id": 1, "method": "render",
+     "params": {"script": "from neoscore.common import *\\n...",
+                "formats": ["pdf", "png"], "dpi": 150}}
+
+Scripts are run as ordinary neoscore programs, except that ``neoscore.setup`` only
+starts a new document, and ``neoscore.show`` and ``neoscore.shutdown`` do nothing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import multiprocessing
+import os
+import pathlib
+import signal
+import socketserver
+import sys
+import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import IO, Any, Callable, Dict, List, Optional, Union
+
+from neoscore.core import env, neoscore
+
+SUPPORTED_FORMATS = ("pdf", "png", "svg")
+"""The output formats render jobs can request."""
+
+# JSON-RPC error codes
+_PARSE_ERROR = -32700
+_INVALID_REQUEST = -32600
+_METHOD_NOT_FOUND = -32601
+_JOB_FAILED = -32000
+
+
+def _init_worker():
+    """Set up neoscore in a worker process, ready to run jobs."""
+    # Interrupts are handled by the serving process, which then stops the workers
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    env.HEADLESS = True
+    neoscore.setup()
+    neoscore._render_host_active = True
+    _warm_up()
+
+
+def _warm_up():
+    """Draw some text and music once, so font lookups are cached before real jobs."""
+    # Imported here to work around cyclic import problems
+    from neoscore.core.music_font import MusicFont
+    from neoscore.core.music_text import MusicText
+    from neoscore.core.point import ORIGIN
+    from neoscore.core.text import Text
+    from neoscore.core.units import Mm
+
+    Text(ORIGIN, None, "neoscore")
+    MusicText(ORIGIN, None, "gClef", MusicFont("Bravura", Mm))
+    neoscore.render_to_buffer(None, dpi=10)
+    neoscore.reset()
+
+
+def run_job(job: Dict[str, Any]) -> Dict[str, Union[bytes, List[bytes]]]:
+    """Run a render job in this process.
+
+    neoscore must be running in a render host (see ``neoscore._render_host_active``).
+    The document is reset before the job's script runs.
+
+    Jobs are dicts with these keys:
+
+    * ``script``: Python source code building a score in the global document. This
+      is run like a ``__main__`` module.
+    * ``script_path``: A path to a script file, used if ``script`` isn't given.
+    * ``formats``: A list of output formats from :obj:`.SUPPORTED_FORMATS`.
+      Defaults to ``["pdf"]``.
+    * ``dpi``: The resolution for raster output. Defaults to 300.
+    * ``pages``: A list of page indices to render PNGs and SVGs for. Defaults to all
+      pages.
+
+    Returns:
+        A dict mapping each format to its output. PDFs are given as a single file,
+        and PNGs and SVGs as a list of files, one per page.
+
+    Raises:
+        ValueError: If the job is missing a script or requests unsupported formats.
+    """
+    formats = job.get("formats", ["pdf"])
+    unsupported = [fmt for fmt in formats if fmt not in SUPPORTED_FORMATS]
+    if unsupported:
+        raise ValueError(f"Unsupported formats: {', '.join(unsupported)}")
+    dpi = job.get("dpi", 300)
+    if "script" in job:
+        source = job["script"]
+        filename = "<script>"
+    elif "script_path" in job:
+        filename = str(job["script_path"])
+        source = pathlib.Path(filename).read_text(encoding="utf-8")
+    else:
+        raise ValueError("Jobs need a script or script_path")
+
+    neoscore.reset()
+    namespace = {"__name__": "__main__", "__file__": filename}
+    original_argv = sys.argv
+    sys.argv = [filename]
+    try:
+        exec(compile(source, filename, "exec"), namespace)
+    finally:
+        sys.argv = original_argv
+
+    outputs: Dict[str, Union[bytes, List[bytes]]] = {}
+    pages = neoscore.document.pages
+    page_indices = job.get("pages", range(len(pages)))
+    with neoscore.export_session():
+        for fmt in formats:
+            if fmt == "pdf":
+                outputs[fmt] = _render_pdf_bytes(dpi)
+                continue
+            page_outputs = []
+            for index in page_indices:
+                rect = pages[index].document_space_bounding_rect
+                output = bytearray()
+                if fmt == "png":
+                    neoscore.render_image(rect, output, dpi)
+                else:
+                    neoscore.render_svg(rect, output)
+                page_outputs.append(bytes(output))
+            outputs[fmt] = page_outputs
+    return outputs
+
+
+def _render_pdf_bytes(dpi: int) -> bytes:
+    out_file = tempfile.NamedTemporaryFile(suffix=".pdf", delete=False)
+    out_file.close()
+    try:
+        neoscore.render_pdf(out_file.name, dpi)
+        return pathlib.Path(out_file.name).read_bytes()
+    finally:
+        os.unlink(out_file.name)
+
+
+class RenderServer:
+
+    """A JSON-RPC render service backed by a pool of warm worker processes.
+
+    Workers are started fresh rather than forked, so they never inherit Qt state from
+    the serving process. If a worker crashes, the pool is restarted for later jobs.
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        """
+        Args:
+            workers: The number of worker processes. Defaults to the number of CPUs.
+        """
+        self.workers = workers or multiprocessing.cpu_count()
+        self._executor_lock = threading.Lock()
+        self._executor = self._new_executor()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+
+    def submit(self, job: Dict[str, Any]) -> Future:
+        """Queue a job to run in a worker.
+
+        Returns:
+            A future resolving to the result of :obj:`.run_job`.
+        """
+        with self._executor_lock:
+            try:
+                return self._executor.submit(run_job, job)
+            except BrokenProcessPool:
+                self._executor.shutdown(wait=False)
+                self._executor = self._new_executor()
+                return self._executor.submit(run_job, job)
+
+    def handle_request(self, line: str, respond: Callable[[str], None]) -> Future:
+        """Handle a single JSON-RPC request line.
+
+        Args:
+            line: The request.
+            respond: A function taking the response line. This may be called from
+                another thread.
+
+        Returns:
+            A future which resolves once the response has been passed to
+            ``respond``.
+        """
+        responded: Future = Future()
+
+        def send(response: Dict[str, Any]):
+            try:
+                respond(json.dumps({"jsonrpc": "2.0", **response}))
+            finally:
+                responded.set_result(None)
+
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            send(_error(None, _PARSE_ERROR, f"Parse error: {e}"))
+            return responded
+        if not isinstance(request, dict) or "method" not in request:
+            send(_error(None, _INVALID_REQUEST, "Invalid request"))
+            return responded
+        request_id = request.get("id")
+        method = request["method"]
+        if method == "ping":
+            send({"id": request_id, "result": "pong"})
+        elif method == "render":
+            job_future = self.submit(request.get("params") or {})
+
+            def job_done(future: Future):
+                try:
+                    outputs = future.result()
+                except Exception as e:
+                    send(_error(request_id, _JOB_FAILED, f"{type(e).__name__}: {e}"))
+                    return
+                send({"id": request_id, "result": _encode_outputs(outputs)})
+
+            job_future.add_done_callback(job_done)
+        else:
+            send(_error(request_id, _METHOD_NOT_FOUND, f"Unknown method: {method}"))
+        return responded
+
+    def serve_stream(self, requests: IO[str], responses: IO[str]):
+        """Serve requests read line by line until the end of ``requests``.
+
+        Responses are written to ``responses`` as jobs finish. This returns once
+        every request has been answered.
+        """
+        write_lock = threading.Lock()
+
+        def respond(response: str):
+            with write_lock:
+                responses.write(response + "\n")
+                responses.flush()
+
+        pending = []
+        for line in requests:
+            if line.strip():
+                pending.append(self.handle_request(line, respond))
+        for responded in pending:
+            responded.result()
+
+    def serve_unix_socket(self, path: Union[str, pathlib.Path]):
+        """Serve requests from connections to a Unix socket until interrupted.
+
+        Each connection is served like :obj:`.serve_stream`, and any number of
+        connections can be served at once.
+        """
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                requests = (line.decode("utf-8") for line in self.rfile)
+                responses = _SocketWriter(self.wfile)
+                server.serve_stream(requests, responses)
+
+        with socketserver.ThreadingUnixStreamServer(str(path), Handler) as unix_server:
+            try:
+                unix_server.serve_forever()
+            finally:
+                os.unlink(path)
+
+    def close(self):
+        """Stop the worker processes, after finishing any queued jobs."""
+        self._executor.shutdown(wait=True)
+
+
+class _SocketWriter:
+    """A minimal text stream writing to a socket file."""
+
+    def __init__(self, wfile: IO[bytes]):
+        self._wfile = wfile
+
+    def write(self, text: str):
+        self._wfile.write(text.encode("utf-8"))
+
+    def flush(self):
+        self._wfile.flush()
+
+
+def _error(request_id: Any, code: int, message: str) -> Dict[str, Any]:
+    return {"id": request_id, "error": {"code": code, "message": message}}
+
+
+def _encode_outputs(
+    outputs: Dict[str, Union[bytes, List[bytes]]]
+) -> Dict[str, Union[str, List[str]]]:
+    def encode(data: bytes) -> str:
+        return base64.b64encode(data).decode("ascii")
+
+    return {
+        fmt: encode(output) if isinstance(output, bytes) else list(map(encode, output))
+        for fmt, output in outputs.items()
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m neoscore.render_server",
+        description="Serve neoscore render jobs over JSON-RPC.",
+    )
+    parser.add_argument(
+        "--socket",
+        help="Serve on a Unix socket at this path instead of stdin and stdout.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="The number of worker processes. Defaults to the number of CPUs.",
+    )
+    args = parser.parse_args(argv)
+    server = RenderServer(args.workers)
+    try:
+        if args.socket:
+            server.serve_unix_socket(args.socket)
+        else:
+            server.serve_stream(sys.stdin, sys.stdout)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -24,6 +24,10 @@ class Clef(MusicText, StaffObject):
     ``Staff`` uses these to map pitches to vertical positions.
     """
 
+    # Type sentinel used to hackily check type
+    # without importing the type, risking cyclic imports.
+    _neoscore_clef_type_marker = True
+
     def __init__(
         self,
         pos_x: Unit,
@@ -46,6 +50,8 @@ class Clef(MusicText, StaffObject):
         StaffObject.__init__(self, staff)
         # Init with placeholder y position and text; clef_type setter will update
         MusicText.__init__(self, (pos_x, ZERO), staff, "", font, brush, pen)
+        # The staff's fringe layout depends on this object
+        self._add_render_dependent(self.staff)
         self.clef_type = clef_type
 
     @property
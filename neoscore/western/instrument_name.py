@@ -67,6 +67,7 @@ class InstrumentName(PaintedObject, StaffObject):
     @relative_fringe_pos.setter
     def relative_fringe_pos(self, value: PointDef):
         self._relative_fringe_pos = Point.from_def(value)
+        self._mark_dirty()
 
     @property
     def font(self) -> Font:
@@ -76,6 +77,7 @@ class InstrumentName(PaintedObject, StaffObject):
     @font.setter
     def font(self, value: Font):
         self._font = value
+        self._mark_dirty()
 
     @property
     def first_line_text(self) -> str:
@@ -85,6 +87,7 @@ class InstrumentName(PaintedObject, StaffObject):
     @first_line_text.setter
     def first_line_text(self, value: str):
         self._first_line_text = value
+        self._mark_dirty()
 
     @property
     def later_lines_text(self) -> Optional[str]:
@@ -98,6 +101,7 @@ class InstrumentName(PaintedObject, StaffObject):
     @later_lines_text.setter
     def later_lines_text(self, value: Optional[str]):
         self._later_lines_text = value
+        self._mark_dirty()
 
     @property
     def _resolved_later_lines_text(self) -> str:
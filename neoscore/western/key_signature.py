@@ -3,7 +3,10 @@ from typing import Optional, Union
 from neoscore.core.layout_controllers import NewLine
 from neoscore.core.music_text import MusicText
 from neoscore.core.point import Point
-from neoscore.core.positioned_object import PositionedObject, render_cached_property
+from neoscore.core.positioned_object import (
+    PositionedObject,
+    persistent_cached_property,
+)
 from neoscore.core.units import ZERO, Unit
 from neoscore.western import clef_type
 from neoscore.western.accidental_type import AccidentalType
@@ -43,6 +46,8 @@ class KeySignature(PositionedObject, StaffObject):
         """
         PositionedObject.__init__(self, Point(pos_x, ZERO), staff)
         StaffObject.__init__(self, staff)
+        # The staff's fringe layout depends on this object
+        self._add_render_dependent(self.staff)
         self._key_signature_type = (
             key_signature_type
             if isinstance(key_signature_type, KeySignatureType)
@@ -59,7 +64,7 @@ class KeySignature(PositionedObject, StaffObject):
         """Key signatures extend until another is found in the staff."""
         return self.staff.distance_to_next_of_type(self)
 
-    @render_cached_property
+    @persistent_cached_property
     def visual_width(self) -> Unit:
         """The visual width of this key signature
 
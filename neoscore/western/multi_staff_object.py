@@ -1,5 +1,6 @@
-from typing import List, Union
+from typing import List, Union, cast
 
+from neoscore.core.positioned_object import PositionedObject
 from neoscore.core.units import Unit
 from neoscore.western.abstract_staff import AbstractStaff
 from neoscore.western.staff_group import StaffGroup
@@ -33,6 +34,7 @@ class MultiStaffObject:
     @staves.setter
     def staves(self, value: List[AbstractStaff]):
         self._staves = value
+        cast(PositionedObject, self)._mark_dirty()
 
     @property
     def highest(self) -> AbstractStaff:
@@ -7,7 +7,10 @@ from neoscore.core.layout_controllers import MarginController, NewLine
 from neoscore.core.music_font import MusicFont
 from neoscore.core.pen import Pen, PenDef
 from neoscore.core.point import PointDef
-from neoscore.core.positioned_object import PositionedObject, render_cached_property
+from neoscore.core.positioned_object import (
+    PositionedObject,
+    persistent_cached_property,
+)
 from neoscore.core.units import ZERO, Mm, Unit, make_unit_class
 from neoscore.western.abstract_staff import AbstractStaff
 from neoscore.western.staff_fringe_layout import StaffFringeLayout
@@ -80,10 +83,10 @@ class Staff(AbstractStaff):
             return self.breakable_length - start_x
         return closest_x - start_x
 
-    @render_cached_property
+    @persistent_cached_property
     def clefs(self) -> List[Tuple[Unit, Clef]]:
         """All the clefs in this staff, ordered by their relative x pos."""
-        return self.find_ordered_descendants_with_attr("middle_c_staff_position")
+        return self.find_ordered_descendants_with_attr("_neoscore_clef_type_marker")
 
     def active_clef_at(self, pos_x: Unit) -> Optional[Clef]:
         """Return the active clef at a given x position, if any."""
@@ -92,14 +95,14 @@ class Staff(AbstractStaff):
             None,
         )
 
-    @render_cached_property
+    @persistent_cached_property
     def key_signatures(self) -> List[Tuple[Unit, KeySignature]]:
         """All the key signatures in this staff, ordered by their relative x pos."""
         return self.find_ordered_descendants_with_attr(
             "_neoscore_key_signature_type_marker"
         )
 
-    @render_cached_property
+    @persistent_cached_property
     def time_signatures(self) -> List[Tuple[Unit, KeySignature]]:
         """All the time signatures in this staff, ordered by their relative x pos."""
         return self.find_ordered_descendants_with_attr(
@@ -4,7 +4,6 @@ from typing import TYPE_CHECKING, Optional
 
 from sortedcontainers import SortedKeyList  # type: ignore
 
-from neoscore.core import neoscore
 from neoscore.core.layout_controllers import NewLine
 from neoscore.core.units import ZERO, Unit
 from neoscore.western.staff_fringe_layout import StaffFringeLayout
@@ -13,6 +12,12 @@ if TYPE_CHECKING:
     from neoscore.western.abstract_staff import AbstractStaff
 
 
+def _staff_document_y(staff: AbstractStaff) -> Unit:
+    """Find a staff's y position relative to the first page of its document."""
+    page = staff.first_ancestor_with_attr("_neoscore_page_type_marker")
+    return page.document.pages[0].map_to(staff).y
+
+
 class StaffGroup:
 
     """A collection of staves.
@@ -43,7 +48,7 @@ class StaffGroup:
         ] = {}
         # Sort staves according to position to some arbitrary known object
         self._staves: SortedKeyList[AbstractStaff] = SortedKeyList(
-            key=lambda s: neoscore.document.pages[0].map_to(s).y
+            key=_staff_document_y
         )
 
     @property
@@ -60,6 +60,8 @@ class TabClef(MusicText, StaffObject):
             background_brush=neoscore.background_brush if hide_background else None,
             alignment_y=AlignmentY.CENTER,
         )
+        # The staff's fringe layout depends on this object
+        self._add_render_dependent(self.staff)
 
     @property
     def breakable_length(self) -> Unit:
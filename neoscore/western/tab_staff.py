@@ -6,7 +6,10 @@ from neoscore.core.layout_controllers import MarginController, NewLine
 from neoscore.core.music_font import MusicFont
 from neoscore.core.pen import Pen
 from neoscore.core.point import PointDef
-from neoscore.core.positioned_object import PositionedObject, render_cached_property
+from neoscore.core.positioned_object import (
+    PositionedObject,
+    persistent_cached_property,
+)
 from neoscore.core.units import ZERO, Mm, Unit, make_unit_class
 from neoscore.western.abstract_staff import AbstractStaff
 from neoscore.western.staff_fringe_layout import StaffFringeLayout
@@ -84,7 +87,7 @@ class TabStaff(AbstractStaff):
         """Conversion ratio between the font's unit and the staff line spacing."""
         return cast(float, self.unit(1) / self.line_spacing)
 
-    @render_cached_property
+    @persistent_cached_property
     def clefs(self) -> List[Tuple[Unit, TabClef]]:
         """All the clefs in this staff, ordered by their relative x pos."""
         return self.find_ordered_descendants_with_attr("_neoscore_tab_clef_type_marker")
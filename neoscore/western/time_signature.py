@@ -43,6 +43,8 @@ class TimeSignature(PositionedObject, StaffObject):
         """
         StaffObject.__init__(self, staff)
         PositionedObject.__init__(self, Point(pos_x, ZERO), staff)
+        # The staff's fringe layout depends on this object
+        self._add_render_dependent(self.staff)
         font = font or staff.music_font
         self._meter = Meter.from_def(meter)
         # Add one glyph for each digit
@@ -0,0 +1,18 @@
+import os
+from unittest import mock
+
+import pytest
+
+from neoscore.core import env
+
+
+@pytest.fixture(scope="session", autouse=True)
+def temporary_cache_dir(tmp_path_factory):
+    """Keep persistent caches made by tests out of the real cache directory.
+
+    The variable is set too so example scripts run in subprocesses use it.
+    """
+    cache_dir = tmp_path_factory.mktemp("neoscore_cache")
+    with mock.patch.dict(os.environ, {"NEOSCORE_CACHE_DIR": str(cache_dir)}):
+        with mock.patch.object(env, "CACHE_DIR", cache_dir):
+            yield cache_dir
@@ -1,14 +1,44 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from neoscore.core import neoscore
 from neoscore.core.brush import Brush
 from neoscore.core.color import Color
+from neoscore.core.document import Document
+from neoscore.core.exceptions import InvalidImageFormatError
+from neoscore.core.flowable import Flowable
+from neoscore.core.paper import A4, Paper
 from neoscore.core.path import Path
 from neoscore.core.pen import Pen
 from neoscore.core.point import ORIGIN
+from neoscore.core.positioned_object import PositionedObject
 from neoscore.core.text import Text
+from neoscore.core.units import Mm
+from neoscore.interface import app_interface
 
 from ..helpers import AppTest
 
 
+class _RenderCountingObject(PositionedObject):
+    def __init__(self):
+        super().__init__(ORIGIN, None)
+        self.render_count = 0
+
+    def pre_render_hook(self):
+        super().pre_render_hook()
+        self.render_count += 1
+
+
+_EXPORT_RECT = (Mm(0), Mm(0), Mm(10), Mm(10))
+
+
 class TestNeoscore(AppTest):
     def test_setting_global_color(self):
         initial_color = Pen._default_color
@@ -37,3 +67,216 @@ class TestNeoscore(AppTest):
         neoscore.set_background_brush(new_brush)
         assert neoscore.background_brush == new_brush
         assert neoscore.app_interface.background_brush == new_brush.interface
+
+    def test_reset(self):
+        app_interface = neoscore.app_interface
+        original_document = neoscore.document
+        registered_fonts = dict(neoscore.registered_music_fonts)
+        Text(ORIGIN, None, "Test")
+        neoscore.set_default_color(Color(1, 2, 3))
+        neoscore.set_background_brush(Brush("#ffff00"))
+        neoscore.set_key_event_handler(lambda event: None)
+        neoscore.render_image(_EXPORT_RECT, bytearray())
+        neoscore.reset()
+        assert neoscore.app_interface is app_interface
+        assert neoscore.document is not original_document
+        assert app_interface.document is neoscore.document
+        assert not len(neoscore.document.pages)
+        assert not app_interface.scene.items()
+        assert app_interface.view.key_event_handler is None
+        assert neoscore.registered_music_fonts == registered_fonts
+        assert neoscore.background_brush == neoscore._default_background_brush
+        assert Text(ORIGIN, None, "Test").brush.color == Color(0, 0, 0)
+        neoscore.render_image(_EXPORT_RECT, bytearray())
+
+    def test_reset_restores_render_settings(self):
+        neoscore.incremental_rendering = False
+        with tempfile.TemporaryDirectory() as cache_dir:
+            neoscore.set_export_cache(cache_dir)
+            with neoscore.export_session():
+                neoscore.reset()
+                assert not neoscore._export_session_depth
+            assert not neoscore._export_session_depth
+        assert neoscore.incremental_rendering
+        assert neoscore.export_cache is None
+
+    def test_use_document(self):
+        first_document = neoscore.document
+        second_document = Document(A4)
+        first_text = Text(ORIGIN, None, "Test")
+        neoscore.render_image(_EXPORT_RECT, bytearray())
+        first_scene = neoscore.app_interface.scene
+        first_scene_item_count = len(first_scene.items())
+        with neoscore.use_document(second_document) as doc:
+            assert doc is second_document
+            assert neoscore.document is second_document
+            assert neoscore.app_interface.document is second_document
+            assert neoscore.app_interface.scene is not first_scene
+            second_text = Text(ORIGIN, None, "Test")
+            neoscore.render_image(_EXPORT_RECT, bytearray())
+            assert len(neoscore.app_interface.scene.items()) == first_scene_item_count
+        assert neoscore.document is first_document
+        assert neoscore.app_interface.scene is first_scene
+        assert len(first_scene.items()) == first_scene_item_count
+        assert first_text.parent is first_document.pages[0]
+        assert second_text.parent is second_document.pages[0]
+        assert len(first_document.pages[0].children) == 1
+
+    def test_flowable_uses_own_document_paper(self):
+        small_paper = Paper(Mm(100), Mm(100))
+        with neoscore.use_document(Document(small_paper)):
+            flowable = Flowable(ORIGIN, None, Mm(500), Mm(10))
+            neoscore.render_image(_EXPORT_RECT, bytearray())
+            assert flowable.lines[0].length == Mm(100)
+
+    def _render_with_full_rebuild(self) -> bytearray:
+        neoscore.incremental_rendering = False
+        try:
+            neoscore.render_image(_EXPORT_RECT, bytearray(), dpi=72)
+            rebuilt = bytearray()
+            neoscore.render_image(_EXPORT_RECT, rebuilt, dpi=72)
+        finally:
+            neoscore.incremental_rendering = True
+        return rebuilt
+
+    def test_incremental_render_keeps_stacking_order(self):
+        below = Path.rect(ORIGIN, None, Mm(6), Mm(6), Brush("#ff0000"), Pen.no_pen())
+        Path.rect((Mm(3), Mm(3)), None, Mm(6), Mm(6), Brush("#0000ff"), Pen.no_pen())
+        neoscore.render_image(_EXPORT_RECT, bytearray(), dpi=72)
+        below.brush = Brush("#00ff00")
+        incremental = bytearray()
+        neoscore.render_image(_EXPORT_RECT, incremental, dpi=72)
+        assert incremental == self._render_with_full_rebuild()
+
+    def test_incremental_render_stacks_new_objects_in_document_order(self):
+        first = PositionedObject(ORIGIN, None)
+        Path.rect((Mm(3), Mm(3)), None, Mm(6), Mm(6), Brush("#0000ff"), Pen.no_pen())
+        neoscore.render_image(_EXPORT_RECT, bytearray(), dpi=72)
+        # This comes before the blue rect in document order, so is drawn below it
+        Path.rect(ORIGIN, first, Mm(6), Mm(6), Brush("#ff0000"), Pen.no_pen())
+        incremental = bytearray()
+        neoscore.render_image(_EXPORT_RECT, incremental, dpi=72)
+        assert incremental == self._render_with_full_rebuild()
+
+    def test_repeated_region_exports_are_identical(self):
+        flowable = Flowable(ORIGIN, None, Mm(2000), Mm(20), Mm(5))
+        spanning_path = Path.straight_line(
+            ORIGIN, flowable, (Mm(2000), Mm(5)), pen=Pen("#000000", Mm(2))
+        )
+        Path.rect(ORIGIN, None, Mm(6), Mm(6), Brush("#ff0000"), Pen.no_pen())
+        first = bytearray()
+        neoscore.render_image(_EXPORT_RECT, first, dpi=72)
+        rendered_interfaces = list(spanning_path.interfaces)
+        second = bytearray()
+        neoscore.render_image(_EXPORT_RECT, second, dpi=72)
+        assert first == second
+        # The parts of the path already rendered are kept
+        assert spanning_path.interfaces == rendered_interfaces
+
+    def test_export_session_renders_once(self):
+        obj = _RenderCountingObject()
+        with neoscore.export_session():
+            neoscore.render_image(_EXPORT_RECT, bytearray())
+            neoscore.render_image(_EXPORT_RECT, bytearray(), dpi=72)
+            assert obj.render_count == 1
+            with neoscore.export_session():
+                neoscore.render_image(_EXPORT_RECT, bytearray())
+            assert obj.render_count == 1
+        neoscore.render_image(_EXPORT_RECT, bytearray())
+        assert obj.render_count == 2
+
+    def test_export_session_renders_again_after_changes(self):
+        obj = _RenderCountingObject()
+        with neoscore.export_session():
+            neoscore.render_image(_EXPORT_RECT, bytearray())
+            Text(ORIGIN, None, "Test")
+            neoscore.render_image(_EXPORT_RECT, bytearray())
+        assert obj.render_count == 2
+
+    def test_render_svg_shares_export_session(self):
+        obj = _RenderCountingObject()
+        Text(ORIGIN, None, "Test")
+        dest = bytearray()
+        with neoscore.export_session():
+            neoscore.render_image(_EXPORT_RECT, bytearray())
+            neoscore.render_svg(_EXPORT_RECT, dest)
+        assert obj.render_count == 1
+        assert dest.decode("utf-8").startswith("<?xml")
+
+    def test_render_image_in_strips_requires_png(self):
+        with self.assertRaises(InvalidImageFormatError):
+            neoscore.render_image(_EXPORT_RECT, "out.jpg", tile_height=10)
+        with self.assertRaises(ValueError):
+            neoscore.render_image(
+                _EXPORT_RECT, bytearray(), autocrop=True, tile_height=10
+            )
+
+    def test_render_to_buffers_renders_once(self):
+        obj = _RenderCountingObject()
+        buffers = neoscore.render_to_buffers([_EXPORT_RECT, _EXPORT_RECT], dpi=72)
+        assert obj.render_count == 1
+        assert len(buffers) == 2
+        assert buffers[0].shape == buffers[1].shape
+        assert buffers[0].shape[2] == 4
+
+    @unittest.skipIf(numpy is None, "NumPy not installed")
+    def test_render_to_array(self):
+        array = neoscore.render_to_array(_EXPORT_RECT, dpi=72, grayscale=True)
+        assert array.dtype == numpy.uint8
+        assert array.ndim == 2
+
+    @unittest.skipIf(numpy is not None, "NumPy installed")
+    def test_render_to_array_without_numpy(self):
+        with self.assertRaises(ImportError):
+            neoscore.render_to_array(_EXPORT_RECT)
+
+    def test_render_image_pyramid_renders_once(self):
+        obj = _RenderCountingObject()
+        dests = [bytearray(), bytearray()]
+        neoscore.render_image_pyramid(_EXPORT_RECT, [(72, dests[0]), (36, dests[1])])
+        assert obj.render_count == 1
+        assert all(dests)
+
+    def test_render_raster_pdf(self):
+        Text(ORIGIN, None, "a")
+        Text(ORIGIN, neoscore.document.pages[1], "b")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = os.path.join(tmp_dir, "out.pdf")
+            # Pages are painted in this process rather than forked workers
+            with mock.patch.object(
+                app_interface.multiprocessing, "cpu_count", return_value=4
+            ), mock.patch.object(
+                app_interface.multiprocessing,
+                "get_context",
+                side_effect=AssertionError,
+            ):
+                neoscore.render_pdf(pdf_path, dpi=72, vector=False, grayscale=True)
+            with open(pdf_path, "rb") as f:
+                pdf = f.read()
+        assert pdf.startswith(b"%PDF")
+        assert pdf.count(b"/Type /Page ") == len(neoscore.document.pages)
+
+    def test_render_image_with_export_cache(self):
+        text = Text(ORIGIN, None, "a")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            neoscore.set_export_cache(tmp_dir)
+            try:
+                first = bytearray()
+                neoscore.render_image(_EXPORT_RECT, first, dpi=72)
+                with mock.patch.object(
+                    neoscore.app_interface, "render_image"
+                ) as render_image:
+                    cached = bytearray()
+                    neoscore.render_image(_EXPORT_RECT, cached, dpi=72)
+                    render_image.assert_not_called()
+                assert cached == first
+                text.text = "b"
+                changed = bytearray()
+                neoscore.render_images([(_EXPORT_RECT, changed)], dpi=72)
+                assert changed != first
+            finally:
+                neoscore.set_export_cache(None)
+
+    def test_render_deep_zoom_requires_supported_tile_format(self):
+        with self.assertRaises(InvalidImageFormatError):
+            neoscore.render_deep_zoom(_EXPORT_RECT, "out.dzi", tile_format="tiff")
@@ -0,0 +1,58 @@
+import pathlib
+import tempfile
+import unittest
+
+from neoscore import render
+
+_SCRIPT = """
+from neoscore.common import *
+neoscore.setup()
+Text(ORIGIN, None, "test")
+neoscore.show()
+"""
+
+
+class TestRender(unittest.TestCase):
+    def test_output_paths(self):
+        paths = render.output_paths(
+            pathlib.Path("/scores/a.py"),
+            {"pdf": b"pdf", "png": [b"page 0", b"page 1"]},
+        )
+        assert paths == {
+            pathlib.Path("/scores/a.pdf"): b"pdf",
+            pathlib.Path("/scores/a-0.png"): b"page 0",
+            pathlib.Path("/scores/a-1.png"): b"page 1",
+        }
+
+    def test_output_paths_with_out_dir(self):
+        paths = render.output_paths(
+            pathlib.Path("/scores/a.py"), {"pdf": b"pdf"}, pathlib.Path("/out")
+        )
+        assert paths == {pathlib.Path("/out/a.pdf"): b"pdf"}
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            directory = pathlib.Path(temp_dir)
+            (directory / "a.py").write_text(_SCRIPT)
+            (directory / "b.py").write_text(_SCRIPT)
+            (directory / "broken.py").write_text("raise ValueError('oops')")
+            status = render.main(
+                [
+                    str(directory / "a.py"),
+                    str(directory / "b.py"),
+                    str(directory / "broken.py"),
+                    "--format",
+                    "pdf",
+                    "--format",
+                    "png",
+                    "--dpi",
+                    "30",
+                    "--workers",
+                    "2",
+                ]
+            )
+            assert status == 1
+            for stem in ["a", "b"]:
+                assert (directory / f"{stem}.pdf").read_bytes().startswith(b"%PDF")
+                assert (directory / f"{stem}-0.png").is_file()
+            assert not (directory / "broken.pdf").exists()
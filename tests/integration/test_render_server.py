@@ -0,0 +1,120 @@
+import base64
+import io
+import json
+import tempfile
+import unittest
+
+from neoscore import render_server
+from neoscore.core import neoscore
+from neoscore.core.text import Text
+
+from ..helpers import AppTest
+
+_SCRIPT = """
+from neoscore.common import *
+neoscore.setup()
+Text(ORIGIN, None, "test")
+neoscore.show()
+"""
+
+
+class TestRenderHost(AppTest):
+    def setUp(self):
+        super().setUp()
+        neoscore._render_host_active = True
+
+    def tearDown(self):
+        neoscore._render_host_active = False
+        super().tearDown()
+
+    def test_setup_in_host_only_resets_document(self):
+        original_app_interface = neoscore.app_interface
+        original_document = neoscore.document
+        Text((0, 0), None, "test")
+        neoscore.setup()
+        assert neoscore.app_interface is original_app_interface
+        assert neoscore.document is not original_document
+        assert neoscore.app_interface.document is neoscore.document
+        assert not len(neoscore.document.pages)
+
+    def test_run_job(self):
+        outputs = render_server.run_job(
+            {"script": _SCRIPT, "formats": ["pdf", "png", "svg"], "dpi": 30}
+        )
+        assert outputs["pdf"].startswith(b"%PDF")
+        assert len(outputs["png"]) == 1
+        assert outputs["png"][0].startswith(b"\x89PNG")
+        assert len(outputs["svg"]) == 1
+        assert b"<svg" in outputs["svg"][0]
+
+    def test_run_job_does_not_leak_objects_between_jobs(self):
+        render_server.run_job({"script": _SCRIPT, "formats": []})
+        first_document = neoscore.document
+        render_server.run_job({"script": "", "formats": []})
+        assert neoscore.document is not first_document
+        assert not len(neoscore.document.pages)
+
+    def test_run_job_does_not_leak_settings_between_jobs(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            script = (
+                "from neoscore.common import *\n"
+                "neoscore.incremental_rendering = False\n"
+                f"neoscore.set_export_cache({cache_dir!r})\n"
+                "neoscore.export_session().__enter__()\n"
+            )
+            render_server.run_job({"script": script, "formats": []})
+            assert not neoscore.incremental_rendering
+            render_server.run_job({"script": "", "formats": []})
+        assert neoscore.incremental_rendering
+        assert neoscore.export_cache is None
+        assert not neoscore._export_session_depth
+
+    def test_run_job_with_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            render_server.run_job({"script": _SCRIPT, "formats": ["gif"]})
+
+    def test_run_job_without_script(self):
+        with self.assertRaises(ValueError):
+            render_server.run_job({"formats": ["pdf"]})
+
+
+class TestRenderServer(unittest.TestCase):
+    def test_serve_stream(self):
+        requests = io.StringIO(
+            "\n".join(
+                [
+                    '{"jsonrpc": "2.0", "id": 1, "method": "ping"}',
+                    "not json",
+                    '{"jsonrpc": "2.0", "id": 2, "method": "unknown"}',
+                    json.dumps(
+                        {
+                            "jsonrpc": "2.0",
+                            "id": 3,
+                            "method": "render",
+                            "params": {
+                                "script": _SCRIPT,
+                                "formats": ["png"],
+                                "dpi": 30,
+                            },
+                        }
+                    ),
+                    '{"jsonrpc": "2.0", "id": 4, "method": "render", "params": {}}',
+                ]
+            )
+        )
+        responses = io.StringIO()
+        server = render_server.RenderServer(1)
+        try:
+            server.serve_stream(requests, responses)
+        finally:
+            server.close()
+        results = [json.loads(line) for line in responses.getvalue().splitlines()]
+        by_id = {result["id"]: result for result in results}
+        assert len(results) == 5
+        assert by_id[1]["result"] == "pong"
+        assert by_id[None]["error"]["code"] == -32700
+        assert by_id[2]["error"]["code"] == -32601
+        png = base64.b64decode(by_id[3]["result"]["png"][0])
+        assert png.startswith(b"\x89PNG")
+        assert by_id[4]["error"]["code"] == -32000
+        assert "script" in by_id[4]["error"]["message"]
@@ -0,0 +1,43 @@
+import os
+import tempfile
+import unittest
+
+from neoscore.core.export_cache import ExportCache
+
+
+class TestExportCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def test_get_missing_key(self):
+        cache = ExportCache(self.tmp_dir.name, 100)
+        assert cache.get("abc") is None
+        assert "abc" not in cache
+
+    def test_put_and_get(self):
+        cache = ExportCache(self.tmp_dir.name, 100)
+        cache.put("abc", b"data")
+        assert "abc" in cache
+        assert cache.get("abc") == b"data"
+        # Entries persist across cache instances
+        assert ExportCache(self.tmp_dir.name, 100).get("abc") == b"data"
+
+    def test_least_recently_used_entries_evicted(self):
+        cache = ExportCache(self.tmp_dir.name, 10)
+        cache.put("a", b"1234")
+        cache.put("b", b"1234")
+        # Make `a` the least recently used, then use `b`
+        os.utime(os.path.join(self.tmp_dir.name, "a"), (0, 0))
+        os.utime(os.path.join(self.tmp_dir.name, "b"), (1, 1))
+        cache.get("b")
+        cache.put("c", b"1234")
+        assert cache.get("a") is None
+        assert cache.get("b") == b"1234"
+        assert cache.get("c") == b"1234"
+
+    def test_clear(self):
+        cache = ExportCache(self.tmp_dir.name, 100)
+        cache.put("a", b"1234")
+        cache.clear()
+        assert cache.get("a") is None
@@ -135,6 +135,16 @@ class TestFlowable(AppTest):
         assert flowable.last_break_at(Mm(140)) == flowable.lines[0]
         assert flowable.last_break_at(Mm(180)) == flowable.lines[1]
 
+    def test_last_break_index_at_line_ends(self):
+        flowable = Flowable((Mm(10), Mm(0)), None, Mm(500), Mm(90), Mm(5))
+        flowable._generate_lines()
+        first_line_end = flowable.lines[0].flowable_x + flowable.lines[0].length
+        assert flowable.last_break_index_at(ZERO) == 0
+        assert flowable.last_break_index_at(first_line_end) == 0
+        assert flowable.last_break_index_at(first_line_end + Mm(1)) == 1
+        flowable._generate_lines()
+        assert flowable.last_break_index_at(first_line_end + Mm(1)) == 1
+
     def test_last_break_at_raises_out_of_bounds_when_needed(self):
         flowable = Flowable((Mm(10), Mm(0)), None, Mm(10000), Mm(90), Mm(5))
         flowable._generate_lines()
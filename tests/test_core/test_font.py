@@ -1,8 +1,9 @@
 import pytest
 
+from neoscore.core import neoscore
 from neoscore.core.font import Font
 from neoscore.core.rect import Rect
-from neoscore.core.units import Unit
+from neoscore.core.units import Mm, Unit
 
 from ..helpers import AppTest
 
@@ -77,6 +78,19 @@ class TestFont(AppTest):
         assert hash(font) != hash(Font("Bravura", 12, 2, False))
         assert hash(font) != hash(Font("Bravura", 12, 1, True))
 
+    def test_equal_fonts_are_interned(self):
+        font = Font("Bravura", 12, 1, False)
+        assert Font("Bravura", Unit(12), weight=1) is font
+        assert font.modified() is font
+        assert Font("Bravura", 12, 1, False).interface is font.interface
+        assert Font("Bravura", 13, 1, False) is not font
+        assert Font("Bravura", Mm(12), 1, False) is not font
+
+    def test_interned_fonts_forgotten_after_font_registration(self):
+        font = Font("Bravura", 12)
+        neoscore.register_font(neoscore._LORA_REGULAR_PATH)
+        assert Font("Bravura", 12) is not font
+
     @pytest.mark.skip(reason="Exact loaded Qt font size seems to flake")
     def test_bounding_rect_of(self):
         font = Font("Bravura", 12, 1, False)
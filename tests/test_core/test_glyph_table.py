@@ -0,0 +1,75 @@
+import math
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+from neoscore.core import env
+from neoscore.core.glyph_table import GlyphTable
+from neoscore.core.metadata_index import MetadataIndex, compile_index
+
+_METADATA = {
+    "glyphBBoxes": {
+        "a": {"bBoxNE": [1.5, 2], "bBoxSW": [0, -1]},
+        "b": {"bBoxNE": [3, 4], "bBoxSW": [1, 2]},
+    },
+    "glyphAdvanceWidths": {"a": 1.25, "c": 2},
+    "glyphsWithAnchors": {"b": {"stemUpSE": [1, 0.5], "cutOutNW": [0, 3]}},
+}
+
+
+class TestGlyphTable(unittest.TestCase):
+    def test_from_metadata(self):
+        table = GlyphTable.from_metadata(_METADATA)
+        assert table.names == ["a", "b", "c"]
+        assert len(table) == 3
+        assert table.anchor_names == ["cutOutNW", "stemUpSE"]
+        a = table.glyph_id("a")
+        b = table.glyph_id("b")
+        c = table.glyph_id("c")
+        assert table.glyph_id("missing") is None
+        assert table.bbox(a) == (0, -1, 1.5, 2)
+        assert table.bbox(c) is None
+        assert table.advance_width[a] == 1.25
+        assert math.isnan(table.advance_width[b])
+        assert table.anchors(a) is None
+        assert table.anchors(b) == {"stemUpSE": (1, 0.5), "cutOutNW": (0, 3)}
+        assert list(table.bbox_ne_y)[:2] == [2, 4]
+
+    def test_from_metadata_index(self):
+        index = MetadataIndex(compile_index(_METADATA, depth=1))
+        table = GlyphTable.from_metadata(index)
+        assert table.names == ["a", "b", "c"]
+        assert table.bbox(table.glyph_id("b")) == (1, 2, 3, 4)
+
+    def test_bytes_round_trip(self):
+        table = GlyphTable.from_metadata(_METADATA)
+        restored = GlyphTable.from_bytes(table.to_bytes())
+        assert restored.names == table.names
+        assert restored.anchor_names == table.anchor_names
+        for glyph_id in range(len(table)):
+            assert restored.bbox(glyph_id) == table.bbox(glyph_id)
+            assert restored.anchors(glyph_id) == table.anchors(glyph_id)
+
+    def test_for_family_shares_tables(self):
+        index = MetadataIndex(compile_index(_METADATA, depth=1))
+        table = GlyphTable.for_family("test family", index)
+        assert GlyphTable.for_family("test family", index) is table
+        # Re-registered metadata gets a new table
+        new_index = MetadataIndex(compile_index(_METADATA, depth=1))
+        assert GlyphTable.for_family("test family", new_index) is not table
+
+    def test_for_family_caches_tables_on_disk(self):
+        index = MetadataIndex(compile_index(_METADATA, depth=1))
+        index.source_digest = "test_digest"
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_dir = pathlib.Path(tmp_dir)
+            with mock.patch.object(env, "CACHE_DIR", cache_dir):
+                GlyphTable.for_family("cached family", index)
+                assert (cache_dir / "glyph_tables" / "test_digest.tbl").is_file()
+                with mock.patch.object(
+                    GlyphTable, "from_metadata"
+                ) as from_metadata_mock:
+                    table = GlyphTable.for_family("other family", index)
+                    from_metadata_mock.assert_not_called()
+        assert table.names == ["a", "b", "c"]
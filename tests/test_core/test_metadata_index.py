@@ -0,0 +1,95 @@
+import copy
+import json
+import os
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+from neoscore.core import env
+from neoscore.core.metadata_index import MetadataIndex, compile_index, load_json_index
+
+_OBJ = {
+    "b": {"x": [1, 2], "y": {"nested": True}},
+    "a": 1.5,
+    "é": "unicode key",
+    "c": None,
+}
+
+
+class TestMetadataIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.json_path = pathlib.Path(self.tmp_dir.name) / "metadata.json"
+        self.json_path.write_text(json.dumps(_OBJ))
+
+    def test_lookups(self):
+        index = MetadataIndex(compile_index(_OBJ))
+        assert index["a"] == 1.5
+        assert index["b"] == {"x": [1, 2], "y": {"nested": True}}
+        assert index["é"] == "unicode key"
+        assert index["c"] is None
+        assert index.get("missing") is None
+        assert "a" in index
+        assert "missing" not in index
+        assert 1 not in index
+        with self.assertRaises(KeyError):
+            index["missing"]
+
+    def test_iteration(self):
+        index = MetadataIndex(compile_index(_OBJ))
+        assert len(index) == 4
+        assert set(index) == set(_OBJ)
+        assert index.to_dict() == _OBJ
+
+    def test_nested_tables(self):
+        index = MetadataIndex(compile_index(_OBJ, depth=1))
+        nested = index["b"]
+        assert isinstance(nested, MetadataIndex)
+        assert nested is index["b"]
+        assert nested["x"] == [1, 2]
+        assert nested["y"] == {"nested": True}
+        assert index.to_dict() == _OBJ
+
+    def test_lookups_give_fresh_objects(self):
+        index = MetadataIndex(compile_index(_OBJ))
+        index["b"]["x"].append(3)
+        assert index["b"]["x"] == [1, 2]
+
+    def test_deepcopy_gives_dict(self):
+        index = MetadataIndex(compile_index(_OBJ, depth=1))
+        assert copy.deepcopy(index["b"]) == _OBJ["b"]
+
+    def test_load_json_index_builds_cached_index_once(self):
+        cache_dir = pathlib.Path(self.tmp_dir.name) / "cache"
+        with mock.patch.object(env, "CACHE_DIR", cache_dir):
+            assert load_json_index(self.json_path).to_dict() == _OBJ
+            index_files = list((cache_dir / "metadata").iterdir())
+            assert len(index_files) == 1
+            with mock.patch(
+                "neoscore.core.metadata_index.compile_index"
+            ) as compile_mock:
+                assert load_json_index(self.json_path)["a"] == 1.5
+                compile_mock.assert_not_called()
+
+    def test_load_json_index_rebuilds_after_source_changes(self):
+        cache_dir = pathlib.Path(self.tmp_dir.name) / "cache"
+        with mock.patch.object(env, "CACHE_DIR", cache_dir):
+            load_json_index(self.json_path)
+            self.json_path.write_text(json.dumps({"a": 2}))
+            assert load_json_index(self.json_path)["a"] == 2
+
+    def test_load_json_index_ignores_corrupt_cache_files(self):
+        cache_dir = pathlib.Path(self.tmp_dir.name) / "cache"
+        with mock.patch.object(env, "CACHE_DIR", cache_dir):
+            load_json_index(self.json_path)
+            (index_file,) = (cache_dir / "metadata").iterdir()
+            index_file.write_bytes(b"")
+            assert load_json_index(self.json_path)["a"] == 1.5
+            assert index_file.read_bytes().startswith(b"NSMETA")
+
+    def test_load_json_index_without_cache(self):
+        with mock.patch.object(env, "CACHE_DIR", None):
+            assert load_json_index(self.json_path).to_dict() == _OBJ
+        assert os.listdir(self.tmp_dir.name) == ["metadata.json"]
@@ -111,3 +111,23 @@ class TestMusicFont(AppTest):
             "cutOutSE": Point(Unit(0.84), Unit(0.596)),
             "cutOutSW": Point(Unit(0.144), Unit(0.896)),
         }
+
+    def test_glyph_table_shared_across_sizes(self):
+        table = MusicFont("Bravura", Mm(2)).glyph_table
+        assert MusicFont("Bravura", Mm(3)).glyph_table is table
+        glyph_id = table.glyph_id("gClef")
+        sw_x, sw_y, ne_x, ne_y = table.bbox(glyph_id)
+        info = self.font.glyph_info("gClef")
+        assert info.bounding_rect.width == self.font.unit(ne_x - sw_x)
+
+    def test_equal_fonts_are_interned(self):
+        font = MusicFont("Bravura", Mm(2))
+        same_font = MusicFont("Bravura", Mm(2))
+        assert same_font is font
+        assert same_font.unit is font.unit
+        assert MusicFont("Bravura", font.unit) is font
+        assert MusicFont("Bravura", Mm(3)) is not font
+
+    def test_engraving_defaults_cannot_be_modified(self):
+        with pytest.raises(TypeError):
+            self.font.engraving_defaults["stemThickness"] = Unit(1)
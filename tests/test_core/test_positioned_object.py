@@ -1,11 +1,20 @@
+from typing import Any, cast
+
+import pytest
+
 from neoscore.core import neoscore
 from neoscore.core.flowable import Flowable
 from neoscore.core.paper import Paper
+from neoscore.core.path import Path
 from neoscore.core.point import ORIGIN, Point
-from neoscore.core.positioned_object import PositionedObject
+from neoscore.core.positioned_object import (
+    PositionedObject,
+    persistent_cached_property,
+)
+from neoscore.core.text import Text
 from neoscore.core.units import ZERO, Mm, Unit
 
-from ..helpers import AppTest, assert_almost_equal
+from ..helpers import AppTest, assert_almost_equal, render_scene
 
 
 class TestPositionedObject(AppTest):
@@ -121,6 +130,45 @@ class TestPositionedObject(AppTest):
         # Assert descendants content
         assert {child_2} == descendants_set
 
+    def test_descendants_yields_children_after_their_descendants(self):
+        root = PositionedObject(ORIGIN, None)
+        child_1 = PositionedObject(ORIGIN, root)
+        subchild_1 = PositionedObject(ORIGIN, child_1)
+        child_2 = PositionedObject(ORIGIN, root)
+        assert list(root.descendants) == [subchild_1, child_1, child_2]
+
+    def test_descendants_with_type_marker_attribute(self):
+        class MockMarkedClass(PositionedObject):
+            _neoscore_mock_type_marker = True
+
+        root = PositionedObject(ORIGIN, None)
+        child_1 = PositionedObject(ORIGIN, root)
+        child_2 = MockMarkedClass(ORIGIN, child_1)
+        assert list(root.descendants_with_attribute("_neoscore_mock_type_marker")) == [
+            child_2
+        ]
+
+    def test_descendant_index_updated_on_tree_changes(self):
+        class MockDifferentClass(PositionedObject):
+            pass
+
+        root = PositionedObject(ORIGIN, None)
+        child = PositionedObject(ORIGIN, root)
+        other_root = PositionedObject(ORIGIN, None)
+        assert list(root.descendants_of_class_or_subclass(MockDifferentClass)) == []
+        assert list(other_root.descendants_of_exact_class(MockDifferentClass)) == []
+        subchild = MockDifferentClass(ORIGIN, child)
+        assert list(root.descendants_of_class_or_subclass(MockDifferentClass)) == [
+            subchild
+        ]
+        child.parent = other_root
+        assert list(root.descendants_of_class_or_subclass(MockDifferentClass)) == []
+        assert list(other_root.descendants_of_exact_class(MockDifferentClass)) == [
+            subchild
+        ]
+        subchild.remove()
+        assert list(other_root.descendants_of_exact_class(MockDifferentClass)) == []
+
     def test_ancestors(self):
         root = PositionedObject(ORIGIN, None)
         child_1 = PositionedObject(ORIGIN, root)
@@ -197,6 +245,46 @@ class TestPositionedObject(AppTest):
         expected = (page_4_x + Unit(99)) - (page_1_x + Unit(5))
         assert_almost_equal(relative_x, expected)
 
+    def test_map_to_updates_when_ancestor_moves(self):
+        grandparent = PositionedObject((Unit(5), Unit(6)), None)
+        parent = PositionedObject((Unit(1), Unit(1)), grandparent)
+        source = PositionedObject((Unit(1), Unit(2)), parent)
+        destination = PositionedObject((Unit(3), Unit(10)), None)
+        assert_almost_equal(source.map_to(destination), Point(Unit(-4), Unit(1)))
+        grandparent.pos = Point(Unit(0), Unit(0))
+        assert_almost_equal(source.map_to(destination), Point(Unit(1), Unit(7)))
+        assert_almost_equal(source.map_x_to(destination), Unit(1))
+
+    def test_map_to_updates_when_ancestor_reparented(self):
+        parent = PositionedObject((Unit(1), Unit(1)), None)
+        other_parent = PositionedObject((Unit(10), Unit(10)), None)
+        source = PositionedObject((Unit(1), Unit(2)), parent)
+        destination = PositionedObject((Unit(3), Unit(10)), None)
+        assert_almost_equal(source.map_to(destination), Point(Unit(1), Unit(7)))
+        parent.parent = other_parent
+        assert_almost_equal(source.map_to(destination), Point(Unit(-9), Unit(-3)))
+
+    def test_map_to_without_common_ancestor(self):
+        class MockRoot:
+            pass
+
+        source = PositionedObject(ORIGIN, None)
+        destination = PositionedObject(ORIGIN, cast(Any, MockRoot()))
+        destination_child = PositionedObject(ORIGIN, destination)
+        with pytest.raises(ValueError):
+            source.map_to(destination_child)
+
+    def test_descendant_pos(self):
+        root = PositionedObject((Unit(5), Unit(6)), None)
+        child = PositionedObject((Unit(1), Unit(2)), root)
+        subchild = PositionedObject((Unit(3), Unit(4)), child)
+        assert_almost_equal(root.descendant_pos(subchild), Point(Unit(4), Unit(6)))
+        assert_almost_equal(root.descendant_pos_x(subchild), Unit(4))
+        child.pos = ORIGIN
+        assert_almost_equal(root.descendant_pos(subchild), Point(Unit(3), Unit(4)))
+        with pytest.raises(ValueError):
+            subchild.descendant_pos(root)
+
     def test_distance_to(self):
         source = PositionedObject((Unit(1), Unit(2)), None)
         destination = PositionedObject((Unit(3), Unit(10)), None)
@@ -210,3 +298,190 @@ class TestPositionedObject(AppTest):
         page_pos = neoscore.document.pages[2].canvas_pos()
         relative_pos = canvas_pos - page_pos
         assert_almost_equal(relative_pos, Point(Mm(5), Mm(6)))
+
+    def test_new_objects_are_dirty_and_flag_ancestors(self):
+        parent = PositionedObject(ORIGIN, None)
+        parent._dirty = False
+        child = PositionedObject(ORIGIN, parent)
+        assert child._dirty
+        assert parent._dirty_descendants
+        assert neoscore.document.pages[0]._dirty_descendants
+
+    def test_render_clears_dirty_flags(self):
+        obj = PositionedObject(ORIGIN, None)
+        render_scene()
+        assert not obj._dirty
+        assert not neoscore.document.pages[0]._dirty_descendants
+
+    def test_property_changes_mark_dirty(self):
+        obj = PositionedObject(ORIGIN, None)
+        render_scene()
+        obj.pos = Point(Unit(1), Unit(2))
+        assert obj._dirty
+        render_scene()
+        obj.rotation = 20
+        assert obj._dirty
+
+    def test_incremental_render_only_rebuilds_dirty_objects(self):
+        unchanged = Text(ORIGIN, None, "a")
+        changed = Text(ORIGIN, None, "b")
+        render_scene()
+        unchanged_qt_object = unchanged.interfaces[0]._qt_object
+        old_changed_qt_object = changed.interfaces[0]._qt_object
+        changed.text = "c"
+        render_scene()
+        assert unchanged.interfaces[0]._qt_object is unchanged_qt_object
+        assert len(changed.interfaces) == 1
+        assert changed.interfaces[0]._qt_object is not old_changed_qt_object
+        assert changed.interfaces[0].text == "c"
+        scene_items = neoscore.app_interface.scene.items()
+        assert unchanged_qt_object in scene_items
+        assert changed.interfaces[0]._qt_object in scene_items
+        assert old_changed_qt_object not in scene_items
+
+    def test_incremental_render_reuses_qt_objects_of_moved_objects(self):
+        obj = Text(ORIGIN, None, "a")
+        render_scene()
+        qt_object = obj.interfaces[0]._qt_object
+        obj.pos = Point(Unit(10), Unit(10))
+        render_scene()
+        assert obj.interfaces[0]._qt_object is qt_object
+        assert obj.interfaces[0].pos == Point(Unit(10), Unit(10))
+        assert qt_object.pos().x() == 10
+        assert qt_object in neoscore.app_interface.scene.items()
+
+    def test_remove_clears_rendered_items_from_scene(self):
+        obj = Text(ORIGIN, None, "a")
+        render_scene()
+        qt_object = obj.interfaces[0]._qt_object
+        obj.remove()
+        assert not obj.interfaces
+        assert qt_object not in neoscore.app_interface.scene.items()
+
+    def test_render_dependents_marked_with_subtree(self):
+        anchor_parent = PositionedObject(ORIGIN, None)
+        anchor = PositionedObject(ORIGIN, anchor_parent)
+        dependent = PositionedObject(ORIGIN, None)
+        anchor._add_render_dependent(dependent)
+        render_scene()
+        anchor_parent.pos = Point(Unit(5), ZERO)
+        assert dependent._dirty
+
+    def test_render_dependents_registered_once(self):
+        anchor = PositionedObject(ORIGIN, None)
+        dependent = PositionedObject(ORIGIN, None)
+        anchor._add_render_dependent(dependent)
+        anchor._add_render_dependent(dependent)
+        assert list(anchor._render_dependents) == [dependent]
+
+    def test_removed_render_dependents_are_unregistered(self):
+        anchor = PositionedObject(ORIGIN, None)
+        dependent_parent = PositionedObject(ORIGIN, None)
+        dependent = PositionedObject(ORIGIN, dependent_parent)
+        anchor._add_render_dependent(dependent)
+        render_scene()
+        dependent_parent.remove()
+        assert not anchor._render_dependents
+        assert not dependent._render_dependencies
+        render_scene()
+        anchor.pos = Point(Unit(5), ZERO)
+        assert not dependent._dirty
+        assert not dependent_parent._dirty_descendants
+
+    def test_render_limited_to_region_skips_other_pages(self):
+        first = Text(ORIGIN, None, "a")
+        second = Text(ORIGIN, neoscore.document.pages[1], "b")
+        region = neoscore.document.pages[0].document_space_bounding_rect
+        neoscore._render_document(False, neoscore.background_brush, region)
+        assert len(first.interfaces) == 1
+        assert not second.interfaces
+        assert second._dirty
+        assert neoscore.document._has_pending_changes()
+        neoscore._render_document(False, neoscore.background_brush)
+        assert len(second.interfaces) == 1
+        assert not neoscore.document._has_pending_changes()
+
+    def test_render_limited_to_region_skips_flowable_lines(self):
+        path = Path.straight_line(ORIGIN, self.flowable, (Mm(1500), ZERO))
+        far_text = Text((Mm(5000), ZERO), self.flowable, "a")
+        region = neoscore.document.pages[0].document_space_bounding_rect
+        neoscore._render_document(False, neoscore.background_brush, region)
+        lines_on_first_page = [
+            line for line in self.flowable.lines if line.page.index == 0
+        ]
+        assert len(path.interfaces) == len(lines_on_first_page)
+        assert path._render_pending
+        assert not far_text.interfaces
+        assert far_text._render_pending
+        rendered_interfaces = list(path.interfaces)
+        neoscore._render_document(False, neoscore.background_brush, region)
+        assert path.interfaces == rendered_interfaces
+        neoscore._render_document(False, neoscore.background_brush)
+        # Only the skipped lines are rendered, keeping the rendered ones
+        assert path.interfaces[: len(rendered_interfaces)] == rendered_interfaces
+        assert len(path.interfaces) > len(lines_on_first_page)
+        assert len(far_text.interfaces) == 1
+        assert not path._render_pending
+        assert not neoscore.document._has_pending_changes()
+
+    def test_repeated_renders_do_not_accumulate_scene_items(self):
+        Text(ORIGIN, None, "a")
+        render_scene()
+        item_count = len(neoscore.app_interface.scene.items())
+        render_scene()
+        render_scene()
+        assert len(neoscore.app_interface.scene.items()) == item_count
+
+    def test_persistent_cached_property_survives_render(self):
+        class MockCachingClass(PositionedObject):
+            calls = 0
+
+            @persistent_cached_property
+            def cached_value(self):
+                MockCachingClass.calls += 1
+                return MockCachingClass.calls
+
+        obj = MockCachingClass(ORIGIN, None)
+        assert obj.cached_value == 1
+        assert obj.cached_value == 1
+        render_scene()
+        assert obj.cached_value == 1
+        obj.scale = 2
+        assert obj.cached_value == 2
+
+    def test_persistent_cached_property_cleared_on_descendant_changes(self):
+        class MockCachingClass(PositionedObject):
+            @persistent_cached_property
+            def child_x_positions(self):
+                return [self.descendant_pos_x(d) for d in self.descendants]
+
+        obj = MockCachingClass(ORIGIN, None)
+        child = PositionedObject(ORIGIN, obj)
+        subchild = PositionedObject((Unit(1), ZERO), child)
+        assert obj.child_x_positions == [Unit(1), ZERO]
+        child.pos = (Unit(5), ZERO)
+        assert obj.child_x_positions == [Unit(6), Unit(5)]
+        PositionedObject((Unit(2), ZERO), child)
+        assert obj.child_x_positions == [Unit(6), Unit(7), Unit(5)]
+        subchild.remove()
+        assert obj.child_x_positions == [Unit(7), Unit(5)]
+
+    def test_persistent_cached_property_survives_render_helpers(self):
+        class MockCachingClass(PositionedObject):
+            calls = 0
+
+            @persistent_cached_property
+            def cached_value(self):
+                MockCachingClass.calls += 1
+                return MockCachingClass.calls
+
+        class MockHelperRenderingClass(PositionedObject):
+            def render_complete(self, pos, flowable_line=None, flowable_x=None):
+                # Like ``KeySignature``, draw through a temporary helper
+                PositionedObject(ORIGIN, self)
+
+        obj = MockCachingClass(ORIGIN, None)
+        MockHelperRenderingClass(ORIGIN, obj)
+        assert obj.cached_value == 1
+        render_scene()
+        assert obj.cached_value == 1
@@ -24,3 +24,13 @@ def test_rect_merge():
     r1 = Rect(Mm(2), Mm(-10), Mm(1), Mm(30))
     r2 = Rect(Mm(-5), Mm(10), Mm(15), Mm(2))
     assert r1.merge(r2) == Rect(Mm(-5), Mm(-10), Mm(15), Mm(30))
+
+
+def test_rect_intersects():
+    rect = Rect(Mm(0), Mm(0), Mm(10), Mm(10))
+    assert rect.intersects(Rect(Mm(5), Mm(5), Mm(10), Mm(10)))
+    assert rect.intersects(Rect(Mm(2), Mm(2), Mm(1), Mm(1)))
+    assert not rect.intersects(Rect(Mm(20), Mm(0), Mm(10), Mm(10)))
+    assert not rect.intersects(Rect(Mm(0), Mm(-20), Mm(10), Mm(10)))
+    # Touching edges don't overlap
+    assert not rect.intersects(Rect(Mm(10), Mm(0), Mm(10), Mm(10)))
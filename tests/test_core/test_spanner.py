@@ -72,3 +72,11 @@ class TestSpanner(AppTest):
         right_mro_spanner = RightMROSpanner((Unit(20), Unit(5)), None, Unit(30), None)
         assert wrong_mro_spanner.breakable_length == ZERO
         assert right_mro_spanner.breakable_length == Unit(30)
+
+    def test_end_parent_change_moves_render_dependency(self):
+        old_end_parent = PositionedObject(ORIGIN, None)
+        new_end_parent = PositionedObject(ORIGIN, None)
+        spanner = MockSpanner(ORIGIN, None, Unit(30), old_end_parent)
+        spanner.end_parent = new_end_parent
+        assert spanner not in old_end_parent._render_dependents
+        assert spanner in new_end_parent._render_dependents
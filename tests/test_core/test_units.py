@@ -124,3 +124,11 @@ class TestInch(unittest.TestCase):
     def test_inch_unit_conversion(self):
         assert_almost_equal(Inch(1), Unit(72))
         assert_almost_equal(Inch(2), Unit(144))
+
+
+class TestMakeUnitClass(unittest.TestCase):
+    def test_classes_reused(self):
+        unit_class = make_unit_class("TestUnit", 2.5)
+        assert make_unit_class("TestUnit", 2.5) is unit_class
+        assert make_unit_class("TestUnit", 3) is not unit_class
+        assert make_unit_class("OtherTestUnit", 2.5) is not unit_class
@@ -1,8 +1,28 @@
+import pathlib
 import random
+import re
+import struct
+import tempfile
+import time
+import unittest
+import zlib
+from unittest import mock
+
+from PyQt5.QtCore import QSize
+from PyQt5.QtGui import QColor, QImage
 
 from neoscore.core import neoscore
+from neoscore.core.brush import Brush
+from neoscore.core.color import Color
+from neoscore.core.path import Path
+from neoscore.core.pen import Pen
+from neoscore.core.point import ORIGIN
+from neoscore.core.rect import Rect
+from neoscore.core.text import Text
+from neoscore.core.units import Mm
+from neoscore.interface import app_interface
 
-from ..helpers import AppTest
+from ..helpers import AppTest, render_scene
 
 
 class TestAppInterface(AppTest):
@@ -13,3 +33,289 @@ class TestAppInterface(AppTest):
             neoscore.app_interface.viewport_scale = set_scale
             got_scale = neoscore.app_interface.viewport_scale
             self.assertAlmostEqual(set_scale, got_scale)
+
+    def test_render_pdf_writes_one_vector_page_per_rect(self):
+        Text(ORIGIN, None, "Test")
+        render_scene()
+        rects = [
+            Rect(Mm(0), Mm(0), Mm(100), Mm(50)),
+            Rect(Mm(0), Mm(50), Mm(100), Mm(50)),
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = pathlib.Path(tmp_dir) / "out.pdf"
+            neoscore.app_interface.render_pdf(
+                rects, pdf_path, 300, Color("#ffffff")
+            )
+            data = pdf_path.read_bytes()
+        assert data.startswith(b"%PDF")
+        assert len(re.findall(rb"/Type\s*/Page\b", data)) == 2
+        # Items should be drawn as paths rather than rasterized
+        assert not re.search(rb"/Subtype\s*/Image", data)
+
+    def test_render_raster_pdf(self):
+        Text(ORIGIN, None, "Test")
+        render_scene()
+        rects = [
+            Rect(Mm(0), Mm(0), Mm(100), Mm(50)),
+            Rect(Mm(0), Mm(50), Mm(100), Mm(50)),
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = pathlib.Path(tmp_dir) / "out.pdf"
+            neoscore.app_interface.render_raster_pdf(
+                rects, pdf_path, 72, Color("#ffffff"), grayscale=True
+            )
+            pdf = pdf_path.read_bytes()
+            assert pdf.count(b"/Type /Page ") == 2
+            assert pdf.count(b"/ColorSpace /DeviceGray") == 2
+            assert pdf.count(b"/Filter /FlateDecode") == 2
+            neoscore.app_interface.render_raster_pdf(
+                rects, pdf_path, 72, Color("#ffffff"), jpeg_quality=50
+            )
+            pdf = pdf_path.read_bytes()
+            assert pdf.count(b"/ColorSpace /DeviceRGB") == 2
+            assert pdf.count(b"/Filter /DCTDecode") == 2
+
+    def test_encode_pdf_page_strips_row_padding(self):
+        # 3 pixel RGB888 rows are padded to 12 bytes in a QImage
+        q_image = QImage(3, 2, QImage.Format_RGB32)
+        q_image.fill(QColor("#ff0000"))
+        page = neoscore.app_interface._encode_pdf_page(q_image, False, None)
+        assert page[:8] == struct.pack(">II", 3, 2)
+        assert zlib.decompress(page[8:]) == b"\xff\x00\x00" * 6
+
+    def test_render_images_in_worker_processes_matches_render_image(self):
+        Text(ORIGIN, None, "Test")
+        render_scene()
+        rects = [
+            Rect(Mm(0), Mm(-5), Mm(20), Mm(10)),
+            Rect(Mm(-5), Mm(-5), Mm(20), Mm(10)),
+        ]
+        expected = []
+        for rect in rects:
+            dest = bytearray()
+            neoscore.app_interface.render_image(
+                rect, dest, 72, -1, Color("#ffffff"), False, True
+            ).join()
+            expected.append(bytes(dest))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = pathlib.Path(tmp_dir) / "out.png"
+            buffers = [bytearray(), bytearray()]
+            neoscore.app_interface.render_images(
+                [(rects[0], buffers[0]), (rects[1], buffers[1]), (rects[0], file_path)],
+                72,
+                -1,
+                Color("#ffffff"),
+                False,
+                True,
+                processes=2,
+            )
+            assert file_path.read_bytes() == expected[0]
+        assert [bytes(b) for b in buffers] == expected
+
+    def test_render_images_not_forked_where_unsafe(self):
+        Text(ORIGIN, None, "Test")
+        render_scene()
+        rect = Rect(Mm(0), Mm(-5), Mm(20), Mm(10))
+        buffers = [bytearray(), bytearray()]
+        with mock.patch.object(
+            app_interface, "_CAN_FORK_RENDER_WORKERS", False
+        ), mock.patch.object(
+            app_interface.multiprocessing, "get_context", side_effect=AssertionError
+        ):
+            neoscore.app_interface.render_images(
+                [(rect, buffers[0]), (rect, buffers[1])],
+                72,
+                -1,
+                Color("#ffffff"),
+                False,
+                True,
+                processes=2,
+            )
+        assert buffers[0] and buffers[0] == buffers[1]
+
+    @unittest.skipUnless(
+        app_interface._CAN_FORK_RENDER_WORKERS, "Render workers aren't forked here"
+    )
+    def test_render_images_waits_for_render_image_threads_before_forking(self):
+        Text(ORIGIN, None, "Test")
+        render_scene()
+        rect = Rect(Mm(0), Mm(-5), Mm(20), Mm(10))
+        save_image = app_interface.AppInterface._save_image
+
+        def slow_save_image(*args):
+            time.sleep(0.2)
+            save_image(*args)
+
+        with mock.patch.object(
+            app_interface.AppInterface, "_save_image", slow_save_image
+        ):
+            thread = neoscore.app_interface.render_image(
+                rect, bytearray(), 72, -1, Color("#ffffff"), False, True
+            )
+        get_context = app_interface.multiprocessing.get_context
+        threads_alive_at_fork = []
+
+        def checked_get_context(method):
+            threads_alive_at_fork.append(thread.is_alive())
+            return get_context(method)
+
+        with mock.patch.object(
+            app_interface.multiprocessing, "get_context", checked_get_context
+        ):
+            neoscore.app_interface.render_images(
+                [(rect, bytearray()), (rect, bytearray())],
+                72,
+                -1,
+                Color("#ffffff"),
+                False,
+                True,
+                processes=2,
+            )
+        assert threads_alive_at_fork == [False]
+
+    def test_render_image_in_strips(self):
+        Text(ORIGIN, None, "Test")
+        render_scene()
+        rect = Rect(Mm(-1), Mm(-5), Mm(20), Mm(10))
+        images = []
+        for tile_height in [10000, 7]:
+            dest = bytearray()
+            neoscore.app_interface.render_image(
+                rect, dest, 300, -1, Color("#ffffff"), False, True, tile_height
+            ).join()
+            images.append(QImage.fromData(bytes(dest)))
+        full, stripped = images
+        assert full.size() == QSize(236, 118)
+        assert stripped.size() == full.size()
+        assert stripped.dotsPerMeterX() == 11811
+        # Strips match a single strip within antialiasing rounding
+        for y in range(0, full.height(), 3):
+            for x in range(0, full.width(), 3):
+                full_color = QColor(full.pixel(x, y))
+                stripped_color = QColor(stripped.pixel(x, y))
+                assert abs(full_color.red() - stripped_color.red()) <= 2
+                assert abs(full_color.alpha() - stripped_color.alpha()) <= 2
+
+    def test_render_image_in_bands(self):
+        for i in range(10):
+            Text((Mm(i), Mm(i)), None, "Test")
+        render_scene()
+        rect = Rect(Mm(-1), Mm(-5), Mm(20), Mm(20))
+        images = []
+        # A single uncached strip is painted with the same transforms as bands
+        for tile_height, bands in [(10000, 1), (None, 4)]:
+            dest = bytearray()
+            neoscore.app_interface.render_image(
+                rect, dest, 300, -1, Color("#ffffff"), False, True, tile_height, bands
+            ).join()
+            images.append(QImage.fromData(bytes(dest)))
+        single, banded = images
+        assert banded.size() == single.size()
+        assert banded.dotsPerMeterX() == single.dotsPerMeterX()
+        for y in range(0, single.height(), 3):
+            for x in range(0, single.width(), 3):
+                single_color = QColor(single.pixel(x, y))
+                banded_color = QColor(banded.pixel(x, y))
+                assert abs(single_color.red() - banded_color.red()) <= 2
+                assert abs(single_color.alpha() - banded_color.alpha()) <= 2
+
+    def test_render_to_buffer(self):
+        Path.rect((Mm(1), Mm(1)), None, Mm(1), Mm(1), Brush("#ff0000"), Pen.no_pen())
+        render_scene()
+        rect = Rect(Mm(0), Mm(0), Mm(4), Mm(2))
+        rgba = neoscore.app_interface.render_to_buffer(
+            rect, 254, Color("#0000ff"), False
+        )
+        # About 10 pixels per mm
+        assert rgba.shape[2] == 4
+        assert abs(rgba.shape[0] - 20) <= 1
+        assert abs(rgba.shape[1] - 40) <= 1
+        assert [rgba[0, 0, i] for i in range(4)] != [255, 0, 0, 255]
+        assert [rgba[15, 15, i] for i in range(4)] == [255, 0, 0, 255]
+        gray = neoscore.app_interface.render_to_buffer(
+            rect, 254, Color("#ffffff"), True
+        )
+        assert gray.shape == rgba.shape[:2]
+        assert gray[15, 15] < gray[0, 0]
+
+    def test_render_to_buffer_with_empty_rect(self):
+        with self.assertRaises(ValueError):
+            neoscore.app_interface.render_to_buffer(
+                Rect(Mm(0), Mm(0), Mm(0), Mm(1)), 300, Color("#ffffff"), False
+            )
+
+    def test_vector_autocrop_crops_to_item_bounds_before_painting(self):
+        Path.rect((Mm(2), Mm(3)), None, Mm(4), Mm(1), Brush("#ff0000"), Pen.no_pen())
+        render_scene()
+        rect = Rect(Mm(0), Mm(0), Mm(20), Mm(20))
+        images = []
+        for tile_height in [None, 3]:
+            dest = bytearray()
+            neoscore.app_interface.render_image(
+                rect,
+                dest,
+                254,
+                -1,
+                Color("#ffffff"),
+                True,
+                True,
+                tile_height,
+                vector_autocrop=True,
+            ).join()
+            images.append(QImage.fromData(bytes(dest)))
+        for image in images:
+            # About 10 pixels per mm
+            assert abs(image.width() - 40) <= 1
+            assert abs(image.height() - 10) <= 1
+            assert QColor(image.pixel(20, 5)) == QColor("#ff0000")
+
+    def test_render_image_pyramid(self):
+        Text(ORIGIN, None, "Test")
+        render_scene()
+        rect = Rect(Mm(0), Mm(-5), Mm(20), Mm(10))
+        expected = bytearray()
+        neoscore.app_interface.render_image(
+            rect, expected, 300, -1, Color("#ffffff"), False, True
+        ).join()
+        full = bytearray()
+        small = bytearray()
+        neoscore.app_interface.render_image_pyramid(
+            rect, [(30, small), (300, full)], -1, Color("#ffffff"), True
+        )
+        # The highest resolution is painted as normal
+        assert full == expected
+        full_image = QImage.fromData(bytes(full))
+        small_image = QImage.fromData(bytes(small))
+        assert abs(small_image.width() - full_image.width() / 10) <= 1
+        assert abs(small_image.height() - full_image.height() / 10) <= 1
+        assert abs(small_image.dotsPerMeterX() - full_image.dotsPerMeterX() / 10) <= 1
+
+    def test_render_deep_zoom(self):
+        Text(ORIGIN, None, "Test")
+        render_scene()
+        # About 10 pixels per mm gives roughly 300x100 pixels
+        rect = Rect(Mm(0), Mm(-5), Mm(30), Mm(10))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dest = pathlib.Path(tmp_dir) / "score.dzi"
+            neoscore.app_interface.render_deep_zoom(
+                rect, dest, 254, Color("#ffffff"), True, 128, 1, "png"
+            )
+            descriptor = dest.read_text()
+            width = int(re.search(r'Width="(\d+)"', descriptor)[1])
+            height = int(re.search(r'Height="(\d+)"', descriptor)[1])
+            assert 'TileSize="128"' in descriptor
+            assert 'Overlap="1"' in descriptor
+            tiles_dir = pathlib.Path(tmp_dir) / "score_files"
+            max_level = 9  # ceil(log2(~300))
+            assert sorted(int(p.name) for p in tiles_dir.iterdir()) == list(
+                range(max_level + 1)
+            )
+            top_level = sorted(p.name for p in (tiles_dir / "9").iterdir())
+            assert top_level == ["0_0.png", "1_0.png", "2_0.png"]
+            first_tile = QImage(str(tiles_dir / "9" / "0_0.png"))
+            assert first_tile.width() == 129
+            assert first_tile.height() == height
+            last_tile = QImage(str(tiles_dir / "9" / "2_0.png"))
+            assert last_tile.width() == width - 256 + 1
+            assert [p.name for p in (tiles_dir / "0").iterdir()] == ["0_0.png"]
+            assert QImage(str(tiles_dir / "0" / "0_0.png")).width() == 1
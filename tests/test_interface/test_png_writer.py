@@ -0,0 +1,42 @@
+import unittest
+
+from PyQt5.QtGui import QColor, QImage
+
+from neoscore.interface.png_writer import PngWriter
+
+
+class TestPngWriter(unittest.TestCase):
+    def test_rows_written_incrementally(self):
+        chunks = []
+        writer = PngWriter(chunks.append, 2, 3, False, 11811)
+        assert writer.row_size == 7
+        writer.write_rows(b"\x00" + bytes([255, 0, 0, 0, 255, 0]))
+        writer.write_rows((b"\x00" + bytes([0, 0, 255] * 2)) * 2)
+        writer.close()
+        image = QImage.fromData(b"".join(chunks))
+        assert image.width() == 2
+        assert image.height() == 3
+        assert image.dotsPerMeterX() == 11811
+        assert QColor(image.pixel(0, 0)) == QColor(255, 0, 0)
+        assert QColor(image.pixel(1, 0)) == QColor(0, 255, 0)
+        assert QColor(image.pixel(1, 2)) == QColor(0, 0, 255)
+
+    def test_alpha(self):
+        chunks = []
+        writer = PngWriter(chunks.append, 1, 1, True, 11811)
+        writer.write_rows(b"\x00" + bytes([255, 0, 0, 128]))
+        writer.close()
+        image = QImage.fromData(b"".join(chunks))
+        assert image.hasAlphaChannel()
+        assert QColor.fromRgba(image.pixel(0, 0)).alpha() == 128
+
+    def test_too_many_rows_raises(self):
+        writer = PngWriter(lambda _: None, 1, 1, False, 11811)
+        with self.assertRaises(ValueError):
+            writer.write_rows(b"\x00\x00\x00\x00" * 2)
+
+    def test_close_before_all_rows_raises(self):
+        writer = PngWriter(lambda _: None, 1, 2, False, 11811)
+        writer.write_rows(b"\x00\x00\x00\x00")
+        with self.assertRaises(ValueError):
+            writer.close()
@@ -1,6 +1,9 @@
 from PyQt5.QtWidgets import QGraphicsSimpleTextItem
 
-from neoscore.core.point import ORIGIN
+from neoscore.core import neoscore
+from neoscore.core.point import ORIGIN, Point
+from neoscore.core.units import Unit
+from neoscore.interface.invisible_object_interface import InvisibleObjectInterface
 from neoscore.interface.positioned_object_interface import PositionedObjectInterface
 
 from ..helpers import AppTest
@@ -24,3 +27,50 @@ class TestPositionedObjectInterface(AppTest):
         interface._register_qt_object(qt_obj)
         assert qt_obj.parentItem() == parent_interface._qt_object
         assert qt_obj.scene() is not None
+
+    def test_retired_qt_object_reused_with_new_transform(self):
+        old = InvisibleObjectInterface(ORIGIN, None, 1, 0, ORIGIN)
+        old.render()
+        qt_obj = old._qt_object
+        old._retire_qt_object()
+        assert old._qt_object is None
+        new = InvisibleObjectInterface(Point(Unit(10), Unit(20)), None, 2, 30, ORIGIN)
+        new.render()
+        assert new._qt_object is qt_obj
+        assert qt_obj.pos().x() == 10
+        assert qt_obj.pos().y() == 20
+        assert qt_obj.scale() == 2
+        assert qt_obj.rotation() == 30
+
+    def test_retired_qt_object_reused_with_new_parent(self):
+        parent = InvisibleObjectInterface(ORIGIN, None, 1, 0, ORIGIN)
+        parent.render()
+        old = InvisibleObjectInterface(ORIGIN, None, 1, 0, ORIGIN)
+        old.render()
+        qt_obj = old._qt_object
+        old._retire_qt_object()
+        new = InvisibleObjectInterface(ORIGIN, parent, 1, 0, ORIGIN)
+        new.render()
+        assert new._qt_object is qt_obj
+        assert qt_obj.parentItem() == parent._qt_object
+
+    def test_reuse_key_ignores_transform(self):
+        parent = InvisibleObjectInterface(ORIGIN, None, 1, 0, ORIGIN)
+        interface = InvisibleObjectInterface(ORIGIN, None, 1, 0, ORIGIN)
+        moved = InvisibleObjectInterface(
+            Point(Unit(1), Unit(2)), parent, 3, 4, Point(Unit(5), Unit(6))
+        )
+        assert interface._reuse_key == moved._reuse_key
+
+    def test_reuse_key_none_with_zero_scale(self):
+        interface = InvisibleObjectInterface(ORIGIN, None, 0, 0, ORIGIN)
+        assert interface._reuse_key is None
+
+    def test_unreused_retired_qt_objects_removed_from_scene(self):
+        interface = InvisibleObjectInterface(ORIGIN, None, 1, 0, ORIGIN)
+        interface.render()
+        qt_obj = interface._qt_object
+        interface._retire_qt_object()
+        assert qt_obj.scene() is not None
+        neoscore.app_interface.remove_retired_qt_objects()
+        assert qt_obj.scene() is None
@@ -27,6 +27,14 @@ class TestQClippingPath(AppTest):
         assert obj.clip_start_x == 1
         assert obj.clip_width == 4
 
+    def test_rescale(self):
+        painter_path = QPainterPath()
+        obj = QClippingPath(painter_path, 2, 8, 2)
+        obj.rescale(2)
+        assert obj.scale() == 4
+        assert obj.clip_start_x == 0.5
+        assert obj.clip_width == 2
+
     def test_geometry_covering_full_path(self):
         painter_path = QPainterPath()
         painter_path.moveTo(-5, -5)
@@ -0,0 +1,40 @@
+import re
+import unittest
+import zlib
+
+from neoscore.interface.raster_pdf_writer import RasterPdfWriter
+
+
+class TestRasterPdfWriter(unittest.TestCase):
+    def write_pdf(self, page_count: int) -> bytes:
+        output = bytearray()
+        writer = RasterPdfWriter(output.extend)
+        for _ in range(page_count):
+            writer.add_page(72, 36, 2, 1, True, False, zlib.compress(b"\x00\xff"))
+        writer.close()
+        return bytes(output)
+
+    def test_document_structure(self):
+        pdf = self.write_pdf(2)
+        assert pdf.startswith(b"%PDF-1.4\n")
+        assert pdf.endswith(b"%%EOF\n")
+        assert pdf.count(b"/Type /Page ") == 2
+        assert b"/Count 2" in pdf
+        assert b"/MediaBox [0 0 72.0000 36.0000]" in pdf
+        assert b"/ColorSpace /DeviceGray" in pdf
+
+    def test_xref_offsets_point_to_objects(self):
+        pdf = self.write_pdf(1)
+        xref_offset = int(re.search(rb"startxref\n(\d+)", pdf).group(1))
+        xref = pdf[xref_offset:].split(b"trailer")[0].splitlines()
+        assert xref[0] == b"xref"
+        entries = xref[3:]
+        assert len(entries) == int(xref[1].split()[1]) - 1
+        for object_id, entry in enumerate(entries, 1):
+            assert len(entry) == 19
+            offset = int(entry[:10])
+            assert pdf[offset:].startswith(f"{object_id} 0 obj".encode())
+
+    def test_empty_document(self):
+        pdf = self.write_pdf(0)
+        assert b"/Kids [] /Count 0" in pdf
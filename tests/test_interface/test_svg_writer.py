@@ -0,0 +1,74 @@
+import re
+
+from PyQt5.QtCore import QRectF
+from PyQt5.QtGui import QPainterPath
+
+from neoscore.core import neoscore
+from neoscore.core.color import Color
+from neoscore.core.path import Path
+from neoscore.core.point import ORIGIN
+from neoscore.core.text import Text
+from neoscore.core.units import Mm, Unit
+from neoscore.interface.svg_writer import SvgWriter, path_data
+
+from ..helpers import AppTest, render_scene
+
+
+class TestSvgWriter(AppTest):
+    def render_svg(self, rect=None) -> str:
+        render_scene()
+        dest = bytearray()
+        neoscore.app_interface.render_svg(rect, dest, Color("#ffffff"))
+        return dest.decode("utf-8")
+
+    def test_path_data(self):
+        path = QPainterPath()
+        path.moveTo(1, 2)
+        path.lineTo(3.5, -4)
+        path.cubicTo(1, 1, 2, 2, 3, 3)
+        assert path_data(path) == "M1 2L3.5 -4C1 1 2 2 3 3"
+
+    def test_repeated_glyphs_defined_once(self):
+        for i in range(5):
+            Text((Mm(i * 10), Mm(0)), None, "a")
+        svg = self.render_svg()
+        assert svg.count("<path id=") == 1
+        assert len(re.findall(r'<use [^>]*xlink:href="#p1"', svg)) == 5
+
+    def test_equal_paths_defined_once(self):
+        for i in range(3):
+            Path.straight_line((Mm(i * 10), Mm(0)), None, (Mm(5), Mm(5)))
+        svg = self.render_svg()
+        assert svg.count("<path id=") == 1
+        assert svg.count("<use ") == 3
+
+    def test_items_outside_rect_skipped(self):
+        Text(ORIGIN, None, "a")
+        Text((Mm(500), Mm(500)), None, "b")
+        svg = self.render_svg((Mm(-10), Mm(-10), Mm(20), Mm(20)))
+        assert svg.count("<use ") == 1
+
+    def test_document_structure(self):
+        dest = []
+        writer = SvgWriter(dest.append, QRectF(0, 0, 100, 50))
+        writer.begin()
+        writer.end()
+        svg = "".join(dest)
+        assert 'width="100pt" height="50pt"' in svg
+        assert 'viewBox="0 0 100 50"' in svg
+        assert svg.rstrip().endswith("</svg>")
+        assert "<defs>" not in svg
+
+    def test_clipped_path_uses_clip_path(self):
+        Path.straight_line(ORIGIN, None, (Mm(50), Unit(0)))
+        render_scene()
+        item = next(iter(neoscore.app_interface.scene.items()))
+        item.clip_start_x = 10
+        item.clip_width = 20
+        item.update_geometry()
+        dest = []
+        writer = SvgWriter(dest.append, QRectF(0, 0, 100, 50))
+        writer.write_item(item)
+        svg = "".join(dest)
+        assert 'clip-path="url(#c' in svg
+        assert 'transform="translate(-10 0)"' in svg
@@ -0,0 +1,137 @@
+import pathlib
+import tempfile
+from unittest import mock
+
+from PyQt5.QtCore import QRectF
+from PyQt5.QtGui import QPainterPath
+
+from neoscore.core import env
+from neoscore.core.rect import Rect
+from neoscore.core.units import Unit
+from neoscore.interface import text_interface, text_metrics_cache
+from neoscore.interface.font_interface import FontInterface
+from neoscore.interface.text_interface import TextInterface
+from neoscore.interface.text_metrics_cache import TextMetricsCache
+
+from ..helpers import AppTest
+
+
+def _make_path() -> QPainterPath:
+    path = QPainterPath()
+    path.addRect(1, 2, 3, 4)
+    path.cubicTo(5, 6, 7, 8, 9, 10)
+    path.setFillRule(1)
+    return path
+
+
+class TestTextMetricsCache(AppTest):
+    def setUp(self):
+        super().setUp()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = pathlib.Path(self.temp_dir.name)
+        patcher = mock.patch.object(env, "CACHE_DIR", self.cache_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Don't reuse caches made for the default cache directory
+        text_metrics_cache._FACE_CACHES.clear()
+
+    def tearDown(self):
+        super().tearDown()
+        text_metrics_cache._FACE_CACHES.clear()
+        self.temp_dir.cleanup()
+
+    def test_round_trip(self):
+        path = self.cache_dir / "test.tmc"
+        cache = TextMetricsCache(path, True)
+        cache.add_outline("foo", 12, _make_path())
+        cache.add_bounding_rect("foo", 12, QRectF(1, 2, 3.5, 4))
+        cache.save()
+        restored = TextMetricsCache(path, True)
+        restored_path = restored.outline("foo", 12)
+        assert restored_path == _make_path()
+        assert restored_path.fillRule() == 1
+        assert restored.outline("foo", 24) is None
+        assert restored.bounding_rect("foo", 12) == QRectF(1, 2, 3.5, 4)
+        assert restored.bounding_rect("foo", 24) is None
+        assert restored.outline("bar", 12) is None
+
+    def test_save_merges_with_file(self):
+        path = self.cache_dir / "test.tmc"
+        first = TextMetricsCache(path, True)
+        second = TextMetricsCache(path, True)
+        first.add_bounding_rect("foo", 12, QRectF(1, 2, 3, 4))
+        second.add_bounding_rect("bar", 12, QRectF(5, 6, 7, 8))
+        first.save()
+        second.save()
+        restored = TextMetricsCache(path, True)
+        assert restored.bounding_rect("foo", 12) == QRectF(1, 2, 3, 4)
+        assert restored.bounding_rect("bar", 12) == QRectF(5, 6, 7, 8)
+
+    def test_outlines_only_kept_if_persisting_outlines(self):
+        path = self.cache_dir / "test.tmc"
+        cache = TextMetricsCache(path, False)
+        cache.add_outline("foo", 12, _make_path())
+        cache.add_bounding_rect("foo", 12, QRectF(1, 2, 3, 4))
+        cache.save()
+        assert TextMetricsCache(path, True).outline("foo", 12) is None
+
+    def test_corrupt_file_is_ignored(self):
+        path = self.cache_dir / "test.tmc"
+        path.write_bytes(text_metrics_cache._MAGIC + b"garbage")
+        cache = TextMetricsCache(path, True)
+        assert cache.bounding_rect("foo", 12) is None
+        cache.add_bounding_rect("foo", 12, QRectF(1, 2, 3, 4))
+        cache.save()
+        assert TextMetricsCache(path, True).bounding_rect("foo", 12) is not None
+
+    def test_for_face(self):
+        bravura = text_metrics_cache.for_face("Bravura", None, False)
+        assert bravura is not None
+        assert text_metrics_cache.for_face("Bravura", None, False) is bravura
+        assert bravura.path.parent == self.cache_dir / "text_metrics"
+        # Bravura has CFF outlines, while Lora has TrueType ones
+        assert bravura.persist_outlines
+        assert not text_metrics_cache.for_face("Lora", None, False).persist_outlines
+        assert text_metrics_cache.for_face("Bravura", 1, False) is not bravura
+        assert text_metrics_cache.for_face("Not a registered font", None, False) is None
+
+    def test_for_face_with_cache_disabled(self):
+        with mock.patch.object(env, "CACHE_DIR", None):
+            assert text_metrics_cache.for_face("Bravura", None, False) is None
+
+    def test_bounding_rect_of_uses_cache(self):
+        font = FontInterface("Bravura", Unit(12), 1, False)
+        rect = font.bounding_rect_of("")
+        cache = font._text_metrics_cache()
+        assert cache.bounding_rect("", 12) is not None
+        cache.add_bounding_rect("", 12, QRectF(1, 2, 3, 4))
+        assert font.bounding_rect_of("") == Rect(
+            Unit(1), Unit(2), Unit(3), Unit(4)
+        )
+        assert rect != font.bounding_rect_of("")
+
+    def test_text_paths_use_cache(self):
+        font = FontInterface("Bravura", Unit(12), 1, False)
+        pixel_size = font.qt_object.pixelSize()
+        with mock.patch.dict(text_interface._PATH_CACHE, clear=True):
+            path, scale = TextInterface._get_cached_qt_path("", font)
+            assert font._text_metrics_cache().outline("", pixel_size) == path
+            font._text_metrics_cache().add_outline("", pixel_size, _make_path())
+            path, scale = TextInterface._get_cached_qt_path("", font)
+            assert path == _make_path()
+            assert scale == 1
+
+    def test_text_paths_match_uncached_ones_at_other_sizes(self):
+        small_font = FontInterface("Bravura", Unit(6), 1, False)
+        font = FontInterface("Bravura", Unit(12), 1, False)
+        with mock.patch.dict(text_interface._PATH_CACHE, clear=True):
+            TextInterface._get_cached_qt_path("", small_font)
+        # Outlines made at other sizes aren't reused
+        with mock.patch.dict(text_interface._PATH_CACHE, clear=True):
+            path, scale = TextInterface._get_cached_qt_path("", font)
+        assert path == TextInterface._create_qt_path("", font.qt_object)
+        assert scale == 1
+
+    def test_unavailable_font_is_not_cached(self):
+        font = FontInterface("Not a registered font", Unit(12), 1, False)
+        assert font._text_metrics_cache() is None
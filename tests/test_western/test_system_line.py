@@ -6,7 +6,7 @@ from neoscore.core.units import ZERO, Mm
 from neoscore.western.staff import Staff
 from neoscore.western.system_line import SystemLine
 
-from ..helpers import AppTest, assert_path_els_equal
+from ..helpers import AppTest, assert_path_els_equal, render_scene
 
 
 class TestSystemLine(AppTest):
@@ -37,3 +37,15 @@ class TestSystemLine(AppTest):
         assert_path_els_equal(
             line.elements, [MoveTo(ORIGIN, line), LineTo(Point(ZERO, Mm(27)), line)]
         )
+
+    def test_setting_staves_rerenders(self):
+        line = SystemLine(self.staves)
+        render_scene()
+        rendered_interfaces = list(line.interfaces)
+        line.staves = [self.top_staff]
+        assert line.staves == [self.top_staff]
+        assert line._dirty
+        render_scene()
+        assert not line._dirty
+        assert line.interfaces
+        assert line.interfaces[0] is not rendered_interfaces[0]